@@ -0,0 +1,204 @@
+"""
+End-to-end cycle benchmark: run_once against local stand-ins for ntfy,
+Google News RSS (with news.google.com redirect links) and the Yahoo chart API.
+
+For every size in --sizes a fresh child process
+  - routes all outbound calls to the stand-ins (see standins.py),
+  - runs one warm-up cycle (yfinance timezone cache, imports),
+  - runs up to --repeats measured cycles (stops early after --time-limit s),
+    each with a fresh state file and empty news caches, so every cycle does
+    the full work: quotes, news + link resolution for ~alert-rate of the
+    tickers, ntfy POST(s),
+and reports p50/p95 cycle latency, requests per cycle (by service) and the
+child's peak RSS.
+
+Results are compared with benchmarks/fixtures/cycle_baseline.json; the run
+fails (exit code 1) if latency, requests or RSS regress beyond the
+tolerances. Baselines are machine-specific: refresh them on the reference
+machine with --update-baseline.
+
+Start:
+    python benchmarks/bench_cycle.py                          # 10, 100, 1000, 10000 tickers
+    python benchmarks/bench_cycle.py --sizes 10,100 --repeats 3
+    python benchmarks/bench_cycle.py --update-baseline
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from standins import StandIns, fetch_stats, route_app  # noqa: E402
+
+BASELINE = ROOT / "benchmarks" / "fixtures" / "cycle_baseline.json"
+TOPIC = "bench-topic"
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    s = sorted(values)
+    if not s:
+        return 0.0
+    k = max(0, min(len(s) - 1, int(round(q / 100.0 * len(s) + 0.5)) - 1))
+    return s[k]
+
+
+def child(args: argparse.Namespace) -> int:
+    """Measure one size inside this process; prints one JSON line."""
+    logging.basicConfig(level=getattr(logging, args.log_level), format="%(levelname)s %(message)s")
+
+    import yfinance as yf
+    from src.app import company
+    from src.app.cache import configure_feed_cache, configure_link_cache
+    from src.app.config import DEFAULTS
+    from src.app.core import run_once
+    from src.app.market_data import configure_market_data
+
+    work = Path(tempfile.mkdtemp(prefix="bench-cycle-"))
+    route_app(args.url, DEFAULTS["http"])
+    yf.set_tz_cache_location(str(work / "yf-tz"))
+    configure_market_data({"provider": "yfinance"})
+
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    # Firmennamen sind im Betrieb 30 Tage gecacht → vorbelegen statt Yahoo-quoteSummary nachzubauen
+    company.CACHE_FILE = work / "company_cache.json"
+    company.CACHE_FILE.write_text(json.dumps({
+        tk: {"ticker": tk, "name": f"Company {tk}", "raw_name": f"Company {tk} Inc.",
+             "source": "info.longName", "base_ticker": tk, "fetched_at": time.time()}
+        for tk in tickers
+    }), encoding="utf-8")
+    company.configure_company_cache(DEFAULTS["company"])
+
+    news_cfg = {**DEFAULTS["news"], "enabled": True, "limit": 2, "lookback_hours": 12}
+
+    def cycle(i: int) -> float:
+        d = work / f"cycle-{i}"
+        d.mkdir()
+        configure_feed_cache({**DEFAULTS["news"]["cache"], "path": str(d / "news.sqlite")})
+        configure_link_cache({**DEFAULTS["news"]["link_cache"], "path": str(d / "news.sqlite")})
+        t0 = time.perf_counter()
+        run_once(
+            tickers, args.threshold, args.url, TOPIC, d / "state.json",
+            {"enabled": False, "tz": "UTC"}, {}, news_cfg,
+            max_workers=args.max_workers, ntfy_cfg=DEFAULTS["ntfy"],
+        )
+        return time.perf_counter() - t0
+
+    cycle(0)  # Warm-up (nicht gemessen)
+    before = fetch_stats(args.url)
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for i in range(1, args.repeats + 1):
+        latencies.append(cycle(i))
+        if time.perf_counter() - started > args.time_limit:
+            break
+    after = fetch_stats(args.url)
+
+    n = len(latencies)
+    per_route = {k: round((after.get(k, 0) - before.get(k, 0)) / n, 1) for k in after}
+    print(json.dumps({
+        "tickers": args.tickers,
+        "cycles": n,
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "requests": round(sum(per_route.values()), 1),
+        "requests_by_service": per_route,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 1),
+    }))
+    return 0
+
+
+def run_size(args: argparse.Namespace, url: str, n: int) -> Dict[str, Any]:
+    cmd = [sys.executable, __file__, "--child", "--url", url, "--tickers", str(n),
+           "--repeats", str(args.repeats), "--time-limit", str(args.time_limit),
+           "--threshold", str(args.threshold), "--max-workers", str(args.max_workers),
+           "--log-level", args.log_level]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"child for {n} tickers failed:\n{proc.stderr[-3000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(result: Dict[str, Any], base: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Return human-readable regressions of `result` against `base`."""
+    out = []
+    checks = (("p50_s", args.latency_tol), ("p95_s", args.latency_tol),
+              ("requests", args.requests_tol), ("peak_rss_mb", args.rss_tol))
+    for key, tol in checks:
+        if key in base and result[key] > base[key] * (1.0 + tol) + 1e-9:
+            out.append(f"{result['tickers']} tickers: {key} {result[key]} > baseline {base[key]} (+{tol:.0%})")
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="10,100,1000,10000", help="Comma-separated ticker counts")
+    ap.add_argument("--repeats", type=int, default=5, help="Measured cycles per size (after one warm-up)")
+    ap.add_argument("--time-limit", type=float, default=60.0, help="Stop repeating a size after this many seconds")
+    ap.add_argument("--threshold", type=float, default=3.0, help="threshold_pct passed to run_once")
+    ap.add_argument("--alert-rate", type=float, default=0.05, help="Share of tickers that move past the threshold")
+    ap.add_argument("--max-workers", type=int, default=8)
+    ap.add_argument("--log-level", default="WARNING")
+    ap.add_argument("--latency-tol", type=float, default=0.25, help="Allowed p50/p95 regression (fraction)")
+    ap.add_argument("--requests-tol", type=float, default=0.05, help="Allowed request-count regression")
+    ap.add_argument("--rss-tol", type=float, default=0.20, help="Allowed peak-RSS regression")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--update-baseline", action="store_true", help="Store the results as new baseline")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--url", help=argparse.SUPPRESS)
+    ap.add_argument("--tickers", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        return child(args)
+
+    standins = StandIns(alert_rate=args.alert_rate).start()
+    results: List[Dict[str, Any]] = []
+    try:
+        print(f"{'tickers':>8} {'cycles':>6} {'p50':>9} {'p95':>9} {'requests':>9} {'rss':>8}  by service")
+        for n in (int(x) for x in args.sizes.split(",") if x.strip()):
+            r = run_size(args, standins.url, n)
+            results.append(r)
+            print(f"{r['tickers']:>8} {r['cycles']:>6} {r['p50_s']:>8.3f}s {r['p95_s']:>8.3f}s "
+                  f"{r['requests']:>9.0f} {r['peak_rss_mb']:>6.0f}MB  {r['requests_by_service']}")
+    finally:
+        standins.stop()
+
+    if args.update_baseline:
+        stored = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        sizes = stored.get("sizes", {})
+        sizes.update({str(r["tickers"]): r for r in results})
+        args.baseline.write_text(json.dumps({
+            "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                        "processor": platform.processor() or platform.machine()},
+            "settings": {"threshold": args.threshold, "alert_rate": args.alert_rate,
+                         "max_workers": args.max_workers, "log_level": args.log_level},
+            "sizes": sizes,
+        }, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline updated → {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+    base = json.loads(args.baseline.read_text(encoding="utf-8")).get("sizes", {})
+    regressions = [msg for r in results if str(r["tickers"]) in base
+                   for msg in compare(r, base[str(r["tickers"])], args)]
+    for msg in regressions:
+        print(f"REGRESSION: {msg}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Cycle-budget benchmark: run_once with cycle.budget_sec against a slow
+Yahoo stand-in (every request waits --latency seconds).
+
+The watchlist is too large to finish within --budget seconds. Before the
+first cycle, --held tickers at the end of the list are put into an "up"
+state, as if a previous cycle had alerted them. Cycles run until every
+ticker has been checked once, and the benchmark verifies that
+  1. every budgeted cycle ends within the budget (+ --slack), also on the
+     first cycle (batches are sized to the remaining time, the first one
+     from the previous cycle's cost or as a small probe),
+  2. the first cycle handles the held tickers before any other (priority
+     order), although they sit at the end of the list,
+  3. deferred tickers are untouched (no result, state unchanged) and are
+     recorded as resume cursor in the state meta,
+  4. after the hot tickers (alert state or previous move near the
+     threshold) the next cycle continues with the deferred ones, so the
+     whole list is covered after ceil(cold / (checked - hot)) + 1 cycles,
+  5. every alerting ticker gets exactly one ntfy message.
+
+Start:
+    python benchmarks/bench_cycle_budget.py --tickers 600 --budget 8
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import math
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Set
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from standins import StandIns, move_pct, route_app  # noqa: E402
+
+TOPIC = "bench-cycle-budget"
+TICKER = re.compile(r"T\d{5}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tickers", type=int, default=600)
+    ap.add_argument("--budget", type=float, default=8.0, help="cycle.budget_sec")
+    ap.add_argument("--reserve", type=float, default=1.0, help="cycle.reserve_sec")
+    ap.add_argument("--batch-size", type=int, default=50)
+    ap.add_argument("--held", type=int, default=20, help="Tickers at the list end in state 'up'")
+    ap.add_argument("--threshold", type=float, default=3.0)
+    ap.add_argument("--alert-rate", type=float, default=0.05)
+    ap.add_argument("--latency", type=float, default=0.05, help="Stand-in delay per request (s)")
+    ap.add_argument("--slack", type=float, default=0.5, help="Allowed overrun of the budget (s)")
+    ap.add_argument("--log-level", default="ERROR")
+    args = ap.parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level), format="%(levelname)s %(message)s")
+
+    import yfinance as yf
+    from src.app.budget import RESUME_META_KEY
+    from src.app.config import DEFAULTS
+    from src.app.core import run_once
+    from src.app.market_data import configure_market_data
+    from src.app.state import StateStore
+
+    standins = StandIns(alert_rate=args.alert_rate, latency=args.latency).start()
+    work = Path(tempfile.mkdtemp(prefix="bench-cycle-budget-"))
+    route_app(standins.url, DEFAULTS["http"])
+    yf.set_tz_cache_location(str(work / "yf-tz"))
+    configure_market_data({"provider": "yfinance"})
+
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    held = tickers[-args.held:] if args.held else []
+    alerting = {tk for tk in tickers if abs(move_pct(tk, args.alert_rate)) >= args.threshold}
+    hot = {tk for tk in tickers if abs(move_pct(tk, args.alert_rate)) >= 0.5 * args.threshold}
+    state_file = work / "alert_state.json"
+    store = StateStore(state_file)
+    for tk in held:
+        store.set(tk, direction="up", last_pct=5.0)
+    store.commit()
+    kwargs = dict(
+        tickers=tickers, threshold_pct=args.threshold, ntfy_server=standins.url, ntfy_topic=TOPIC,
+        state_file=state_file, market_hours_cfg={"enabled": False, "tz": "UTC"}, test_cfg={},
+        news_cfg={"enabled": False}, max_workers=4,
+        ntfy_cfg={**DEFAULTS["ntfy"], "digest_threshold": 0, "burst": 100_000, "rate_per_sec": 10_000.0},
+        cycle_cfg={"budget_sec": args.budget, "reserve_sec": args.reserve, "batch_size": args.batch_size},
+    )
+    yf.download(tickers[:1], period="1d", interval="1m", auto_adjust=False, progress=False)  # Warm-up
+
+    failures: List[str] = []
+    checked: Set[str] = set()
+    deferred_before: List[str] = []
+    bound = 0
+    cycles = 0
+    print(f"tickers={args.tickers} budget={args.budget:.0f}s batch={args.batch_size} "
+          f"latency={args.latency * 1000:.0f} ms/request held={len(held)} alerting={len(alerting)}")
+    print(f"{'cycle':>5} {'wall':>7} {'checked':>8} {'deferred':>9} {'covered':>8}")
+    try:
+        while len(checked) < len(tickers) and cycles < 2 * args.tickers:
+            before = json.loads(state_file.read_text(encoding="utf-8"))["tickers"]
+            t0 = time.monotonic()
+            results = run_once(**kwargs)
+            wall = time.monotonic() - t0
+            cycles += 1
+            after = json.loads(state_file.read_text(encoding="utf-8"))
+            deferred = list(after["meta"].get(RESUME_META_KEY) or [])
+            checked |= set(results)
+            print(f"{cycles:>5} {wall:>6.2f}s {len(results):>8} {len(deferred):>9} {len(checked):>8}")
+
+            if wall > args.budget + args.slack:
+                failures.append(f"cycle {cycles}: {wall:.2f}s > budget {args.budget}s")
+            if not results:
+                failures.append(f"cycle {cycles}: no ticker checked")
+                break
+            if cycles == 1 and len(set(held) & set(results)) < min(len(held), len(results)):
+                failures.append(f"cycle 1 skipped {len(set(held) - set(results))} held ticker(s)")
+            if set(deferred) & set(results) or set(deferred) | set(results) != set(tickers):
+                failures.append(f"cycle {cycles}: resume cursor does not match the unchecked tickers")
+            touched = [tk for tk in deferred if after["tickers"].get(tk) != before.get(tk)]
+            if touched:
+                failures.append(f"cycle {cycles}: {len(touched)} deferred ticker(s) changed in state")
+            cold = [tk for tk in results if tk not in hot and tk not in held]
+            first = [tk for tk in deferred_before if tk not in hot][:len(cold)]
+            if not set(first) <= set(results):
+                failures.append(f"cycle {cycles}: {len(set(first) - set(results))} resumed ticker(s) not checked")
+            deferred_before = deferred
+            if cycles == 1:
+                per_cycle = len(results)
+                bound = math.ceil((args.tickers - len(hot)) / max(per_cycle - len(hot) - len(held), 1)) + 1
+    finally:
+        standins.stop()
+
+    print(f"covered all {args.tickers} tickers in {cycles} cycle(s) (bound {bound})")
+    if cycles > bound:
+        failures.append(f"coverage took {cycles} cycles > {bound}")
+    with standins._lock:
+        sent = [m for _, t, _ in standins.ntfy_messages for m in TICKER.findall(t or "")]
+    dupes = sorted({tk for tk in sent if sent.count(tk) > 1})
+    if set(sent) != alerting - set(held) or dupes:
+        failures.append(f"{len(set(sent))}/{len(alerting - set(held))} alert(s) sent, duplicates={dupes[:5]}")
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
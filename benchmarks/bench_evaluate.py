@@ -0,0 +1,99 @@
+"""
+Microbenchmark: scalar per-ticker threshold loop (as run_once did it before)
+vs. the vectorized evaluation in src/app/evaluate.py.
+
+Measured on a synthetic universe (random open/last, ~1/3 previously
+alerted, 10% per-ticker thresholds), best of --runs:
+  - scalar:           Python loop computing pct/direction/alert/reset per ticker
+  - evaluate_arrays:  the NumPy pass alone (arrays already built)
+  - evaluate_watchlist: dict → arrays + NumPy pass (what run_once calls)
+
+Both paths must yield identical decisions; otherwise the run fails.
+
+Start:
+    python benchmarks/bench_evaluate.py --tickers 50000
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from src.app.evaluate import CODES, NAMES, evaluate_arrays, evaluate_watchlist
+
+
+def scalar(tickers: List[str], prices: Dict[str, Tuple[float, float]], prev: Dict[str, str],
+           threshold_pct: float, thresholds: Dict[str, float]) -> Dict[str, Tuple[str, bool, bool]]:
+    """The former per-ticker logic of run_once (decision part only)."""
+    out = {}
+    for tk in tickers:
+        q = prices.get(tk)
+        if q is None or q[0] == 0:
+            continue
+        open_px, last_px = q
+        pct = (last_px - open_px) / open_px * 100.0
+        th = thresholds.get(tk, threshold_pct)
+        direction = "up" if pct >= th else "down" if pct <= -th else "none"
+        p = prev.get(tk, "none")
+        out[tk] = (direction, direction != "none" and direction != p, direction == "none" and p != "none")
+    return out
+
+
+def best_of(fn: Callable[[], object], runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tickers", type=int, default=50_000)
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--threshold", type=float, default=3.0)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    tickers = [f"T{i:06d}" for i in range(args.tickers)]
+    prices = {tk: (o, o * (1 + rnd.uniform(-0.08, 0.08))) for tk in tickers for o in [rnd.uniform(1, 500)]}
+    prev = {tk: rnd.choice(("up", "down", "none", "none", "none", "none")) for tk in tickers}
+    thresholds = {tk: rnd.choice((2.0, 5.0)) for tk in tickers if rnd.random() < 0.1}
+
+    open_px = np.array([prices[tk][0] for tk in tickers])
+    last_px = np.array([prices[tk][1] for tk in tickers])
+    prev_codes = np.array([CODES[prev[tk]] for tk in tickers], dtype=np.int8)
+    th = np.array([thresholds.get(tk, args.threshold) for tk in tickers])
+
+    t_scalar = best_of(lambda: scalar(tickers, prices, prev, args.threshold, thresholds), args.runs)
+    t_arrays = best_of(lambda: evaluate_arrays(open_px, last_px, prev_codes, th), args.runs)
+    t_watch = best_of(lambda: evaluate_watchlist(tickers, prices, prev, args.threshold, thresholds), args.runs)
+
+    ref = scalar(tickers, prices, prev, args.threshold, thresholds)
+    ev = evaluate_watchlist(tickers, prices, prev, args.threshold, thresholds)
+    mismatches = [
+        tk for i, tk in enumerate(tickers)
+        if ref[tk] != (NAMES[int(ev.direction[i])], bool(ev.alert[i]), bool(ev.reset[i]))
+    ]
+
+    print(f"tickers={args.tickers} alerts={int(ev.alert.sum())} resets={int(ev.reset.sum())} runs={args.runs}")
+    print(f"scalar loop:        {t_scalar * 1000:9.2f} ms")
+    print(f"evaluate_arrays:    {t_arrays * 1000:9.2f} ms  speed-up={t_scalar / max(t_arrays, 1e-9):6.1f}x")
+    print(f"evaluate_watchlist: {t_watch * 1000:9.2f} ms  speed-up={t_scalar / max(t_watch, 1e-9):6.1f}x")
+    if mismatches:
+        print(f"MISMATCH for {len(mismatches)} ticker(s): {', '.join(mismatches[:10])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
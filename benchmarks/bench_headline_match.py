@@ -0,0 +1,150 @@
+"""
+Headline-matcher benchmark: token-index matcher (src/app/matcher.py) vs. the
+former substring scan of filter_titles on a synthetic corpus.
+
+Builds --companies keyword sets shaped like company.auto_keywords (display
+name, its words, base ticker, symbol) including short symbols (O, F, T, GE)
+and companies sharing a word (Deutsche Bank / Deutsche Telekom), and
+--titles headlines of which ~60% mention one company by name or symbol.
+The substring scan routes every title to the tickers of the best matching
+tier (full name/symbol before a single word of a name, the former
+route_items); the matcher routes on full name/symbol hits only, as
+news.route_items does now. Reported are the time for the whole corpus and
+precision/recall against the mentioned company.
+
+Fails (exit code 1) if the matcher is less than --min-speedup times faster,
+misses a mention, or lets a short symbol match a title that does not
+mention it.
+
+Start:
+    python benchmarks/bench_headline_match.py --titles 10000 --companies 300
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.app.matcher import KeywordMatcher  # noqa: E402
+
+FIXED = [
+    ("Realty Income", "O"), ("Ford Motor", "F"), ("AT&T", "T"), ("General Electric", "GE"),
+    ("Apple", "AAPL"), ("Deutsche Bank", "DBK.DE"), ("Deutsche Telekom", "DTE.DE"), ("SAP", "SAP.DE"),
+    ("Meta Platforms", "META"), ("Alphabet", "GOOGL"), ("Siemens Energy", "ENR.DE"), ("Nvidia", "NVDA"),
+]
+SHORT = {"O", "F", "T", "GE"}
+FILLER = ("oil forecast target change gets shares of outlook after futures trade rate cut fears over "
+          "profit warning to beat for earnings on top dividend report analysts say stock rallies as "
+          "market gains fall into focus guidance europe banks tech chip demand").split()
+SYLLABLES = ["lor", "vex", "tan", "qui", "mar", "dor", "sen", "kal", "rin", "bro", "zel", "pha"]
+
+
+def keywords(name: str, symbol: str) -> List[str]:
+    """Keyword list like company.auto_keywords (display, words, base ticker, symbol)."""
+    base = symbol.split(".")[0]
+    out: List[str] = []
+    for k in [name, *name.split(), base, symbol]:
+        if k and k not in out:
+            out.append(k)
+    return out
+
+
+def corpus(n_companies: int, n_titles: int, seed: int):
+    rng = random.Random(seed)
+    companies = list(FIXED)
+    while len(companies) < n_companies:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(3)).capitalize() + rng.choice(["", " Holdings", " Systems"])
+        sym = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.choice([3, 4])))
+        if all(sym != s and name != n for n, s in companies):
+            companies.append((name, sym))
+    titles: List[Tuple[str, Set[str]]] = []
+    for _ in range(n_titles):
+        words = rng.sample(FILLER, 7)
+        mention: Set[str] = set()
+        if rng.random() < 0.6:
+            name, sym = rng.choice(companies)
+            ref = rng.choice([name, sym.split(".")[0], f"{name}'s", f"{name} ({sym})"])
+            words.insert(rng.randrange(len(words)), ref)
+            mention.add(sym)
+        title = " ".join(words)
+        titles.append((title[0].upper() + title[1:], mention))
+    return {sym: (name, keywords(name, sym)) for name, sym in companies}, titles
+
+
+def substring_scan(companies: Dict[str, Tuple[str, List[str]]], titles: List[str]) -> List[Set[str]]:
+    """The former matching: any(k in title) on lowercased strings, per ticker and tier."""
+    tiers = {}
+    for tk, (name, kws) in companies.items():
+        words = {w.lower() for w in name.split()}
+        low = [k.strip().lower() for k in kws if k.strip()]
+        strong = [k for k in low if k == name.lower() or k not in words]
+        tiers[tk] = (strong, [k for k in low if k not in strong])
+    out = []
+    for title in titles:
+        t = title.lower()
+        hits: Set[str] = set()
+        for level in (0, 1):
+            hits = {tk for tk, tier in tiers.items() if any(k in t for k in tier[level])}
+            if hits:
+                break
+        out.append(hits)
+    return out
+
+
+def indexed(companies: Dict[str, Tuple[str, List[str]]], titles: List[str]) -> List[Set[str]]:
+    matcher = KeywordMatcher(companies)  # einmal pro Zyklus
+    return [set(matcher.assign(t)) for t in titles]
+
+
+def score(found: List[Set[str]], truth: List[Set[str]]):
+    tp = sum(len(f & t) for f, t in zip(found, truth))
+    fp = sum(len(f - t) for f, t in zip(found, truth))
+    fn = sum(len(t - f) for f, t in zip(found, truth))
+    short_fp = sum(len((f - t) & SHORT) for f, t in zip(found, truth))
+    return tp, fp, fn, short_fp
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--titles", type=int, default=10_000)
+    ap.add_argument("--companies", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=11)
+    ap.add_argument("--min-speedup", type=float, default=5.0)
+    args = ap.parse_args()
+
+    companies, data = corpus(args.companies, args.titles, args.seed)
+    titles, truth = [t for t, _ in data], [m for _, m in data]
+    print(f"titles={len(titles)} companies={len(companies)} "
+          f"keywords={sum(len(k) for _, k in companies.values())}")
+    print(f"{'method':<12}{'time':>10}{'µs/title':>10}{'precision':>11}{'recall':>8}{'short FP':>10}")
+    results = {}
+    for name, fn in (("substring", substring_scan), ("token index", indexed)):
+        t0 = time.perf_counter()
+        found = fn(companies, titles)
+        dt = time.perf_counter() - t0
+        tp, fp, fn_, short_fp = score(found, truth)
+        results[name] = (dt, fn_, short_fp)
+        print(f"{name:<12}{dt * 1000:>8.0f}ms{dt / len(titles) * 1e6:>10.1f}{tp / max(tp + fp, 1):>11.3f}"
+              f"{tp / max(tp + fn_, 1):>8.3f}{short_fp:>10}")
+
+    speedup = results["substring"][0] / results["token index"][0]
+    print(f"speed-up: {speedup:.1f}x")
+    failures = []
+    if speedup < args.min_speedup:
+        failures.append(f"speed-up {speedup:.1f}x < {args.min_speedup}x")
+    if results["token index"][1]:
+        failures.append(f"token index missed {results['token index'][1]} mention(s)")
+    if results["token index"][2]:
+        failures.append(f"short symbols matched {results['token index'][2]} unrelated title(s)")
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Startup benchmark: cold import time of src.app.core via `python -X importtime`.
+
+Fails (exit code 1) if
+  - the cumulative import time of the module exceeds the budget, or
+  - importing it pulls in heavy dependencies (yfinance, pandas, numpy,
+    feedparser, requests) that must only be loaded on first use.
+
+Start:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget-ms 80 --runs 10
+"""
+from __future__ import annotations
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY = ("yfinance", "pandas", "numpy", "feedparser", "requests")
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)\s*$")
+
+
+def cold_import_us(module: str) -> Optional[int]:
+    """Import `module` in a fresh interpreter and return its cumulative time in µs."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m and m.group(3) == module:
+            return int(m.group(2))
+    return None
+
+
+def heavy_modules_loaded(module: str) -> List[str]:
+    """Return the heavy dependencies that are imported as a side effect of `module`."""
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return [m for m in proc.stdout.strip().split(",") if m]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--module", default="src.app.core")
+    ap.add_argument("--budget-ms", type=float, default=150.0)
+    ap.add_argument("--runs", type=int, default=5, help="Best-of-N to smooth out disk/CPU noise")
+    args = ap.parse_args()
+
+    samples = [cold_import_us(args.module) for _ in range(max(1, args.runs))]
+    if any(s is None for s in samples):
+        print(f"FAIL: {args.module} not found in -X importtime output")
+        return 1
+    best_ms = min(samples) / 1000.0
+    heavy = heavy_modules_loaded(args.module)
+
+    print(f"{args.module}: best={best_ms:.1f}ms median={sorted(samples)[len(samples) // 2] / 1000.0:.1f}ms "
+          f"budget={args.budget_ms:.0f}ms runs={len(samples)}")
+    ok = True
+    if best_ms > args.budget_ms:
+        print(f"FAIL: cold import exceeds budget by {best_ms - args.budget_ms:.1f}ms")
+        ok = False
+    if heavy:
+        print(f"FAIL: heavy dependencies imported eagerly: {', '.join(heavy)}")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Benchmark: N sequential get_open_and_last() calls vs. one batched
+get_open_and_last_many() call, served from a recorded fixture.
+
+Yahoo is replaced by a fake that answers from benchmarks/fixtures/market_1m.json
+and sleeps a fixed round-trip latency per request, so the numbers show how
+many requests each path issues and what that costs in wall-clock time.
+Like yfinance, the fake's download() issues one chart request per symbol,
+on as many threads as yf.download(threads=True) uses (min(symbols,
+2 × CPU cores)); the batched path therefore saves round trips only through
+that concurrency, not through fewer requests.
+
+Start:
+    python benchmarks/bench_market_batch.py --tickers 400 --latency 0.05
+    python benchmarks/bench_market_batch.py --record   # Fixture neu von Yahoo aufnehmen
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+import yfinance as yf
+
+from src.app import market
+
+FIXTURE = ROOT / "benchmarks" / "fixtures" / "market_1m.json"
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def record(symbols: List[str]) -> None:
+    """Record today's 1m bars from Yahoo into the fixture file."""
+    df = yf.download(symbols, period="1d", interval="1m", group_by="ticker",
+                     auto_adjust=False, progress=False)
+    bars: Dict[str, list] = {}
+    for sym in symbols:
+        sub = df[sym].dropna(subset=["Open", "Close"])
+        bars[sym] = [
+            [int(ts.timestamp()), *(round(float(r[f]), 4) for f in FIELDS[:4]), int(r["Volume"])]
+            for ts, r in sub.iterrows()
+        ]
+    out = {"interval": "1m", "fields": ["ts", "open", "high", "low", "close", "volume"], "bars": bars}
+    FIXTURE.write_text(json.dumps(out, separators=(",", ":")), encoding="utf-8")
+    print(f"Recorded {sum(len(b) for b in bars.values())} bars for {len(bars)} symbols → {FIXTURE}")
+
+
+def _frame(rows: list) -> pd.DataFrame:
+    idx = pd.to_datetime([r[0] for r in rows], unit="s", utc=True)
+    return pd.DataFrame([r[1:] for r in rows], index=idx, columns=FIELDS)
+
+
+class FakeYahoo:
+    """Serves fixture bars for synthetic symbols and counts simulated requests."""
+
+    def __init__(self, n: int, latency: float, missing_intraday: int = 0, cores: int = 0):
+        fixture = json.loads(FIXTURE.read_text(encoding="utf-8"))
+        base = list(fixture["bars"].items())
+        self.latency = latency
+        self.cores = cores or os.cpu_count() or 1
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.no_intraday = set()
+        for i in range(n):
+            name, rows = base[i % len(base)]
+            sym = f"{name.split('.')[0]}{i}"
+            self.frames[sym] = _frame(rows)
+            if i < missing_intraday:
+                self.no_intraday.add(sym)
+        self.symbols = list(self.frames)
+
+    def _bars(self, sym: str, interval: str) -> pd.DataFrame:
+        df = self.frames.get(sym)
+        if df is None or (sym in self.no_intraday and interval != "1d"):
+            return pd.DataFrame(columns=FIELDS)
+        if interval == "1d":
+            return pd.DataFrame([[df["Open"].iloc[0], df["High"].max(), df["Low"].min(),
+                                  df["Close"].iloc[-1], df["Volume"].sum()]],
+                                index=df.index[:1], columns=FIELDS)
+        return df
+
+    def history(self, sym: str, interval: str) -> pd.DataFrame:
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        return self._bars(sym, interval)
+
+    def threads(self, n_symbols: int, threads=True) -> int:
+        """Worker threads of yf.download (yfinance: threads=True → min(symbols, 2 × cores))."""
+        if threads is True:
+            return max(1, min(n_symbols, self.cores * 2))
+        return max(1, int(threads or 1))
+
+    def download(self, symbols, interval: str = "1d", threads=True, **_kw) -> pd.DataFrame:
+        # yfinance fragt die Chart-API einmal pro Symbol ab, parallel auf `threads` Threads
+        symbols = list(symbols)
+        with ThreadPoolExecutor(max_workers=self.threads(len(symbols), threads)) as pool:
+            frames = list(pool.map(lambda s: self.history(s, interval), symbols))
+        return pd.concat(dict(zip(symbols, frames)), axis=1)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tickers", type=int, default=400)
+    ap.add_argument("--latency", type=float, default=0.05, help="Simulated round-trip per request (s)")
+    ap.add_argument("--missing-intraday", type=int, default=2, help="Symbols that only have daily data")
+    ap.add_argument("--chunk-size", type=int, default=100)
+    ap.add_argument("--cores", type=int, default=0,
+                    help="CPU cores assumed for yfinance's thread count (0 = this machine)")
+    ap.add_argument("--record", action="store_true", help="Re-record the fixture from Yahoo and exit")
+    args = ap.parse_args()
+
+    if args.record:
+        record(["AAPL", "O", "WPY.F", "QDVX.DE"])
+        return 0
+
+    fake = FakeYahoo(args.tickers, args.latency, args.missing_intraday, args.cores)
+
+    class _Ticker:
+        def __init__(self, sym: str):
+            self.sym = sym
+
+        def history(self, period: str = "1d", interval: str = "1d", auto_adjust: bool = False):
+            return fake.history(self.sym, interval)
+
+    # market importiert yfinance lazy → das Modul selbst patchen
+    yf.Ticker = _Ticker
+    yf.download = fake.download
+
+    fake.requests = 0
+    t0 = time.perf_counter()
+    seq = {s: market.get_open_and_last(s) for s in fake.symbols}
+    t_seq, r_seq = time.perf_counter() - t0, fake.requests
+
+    fake.requests = 0
+    t0 = time.perf_counter()
+    bulk = market.get_open_and_last_many(fake.symbols, chunk_size=args.chunk_size)
+    t_bulk, r_bulk = time.perf_counter() - t0, fake.requests
+
+    mismatches = [s for s in fake.symbols if bulk.get(s.upper()) != seq[s]]
+    print(f"tickers={args.tickers} latency={args.latency * 1000:.0f}ms chunk_size={args.chunk_size} "
+          f"yf threads={fake.threads(min(args.tickers, args.chunk_size))}")
+    print(f"sequential: {t_seq:8.3f}s  requests={r_seq}")
+    print(f"batched:    {t_bulk:8.3f}s  requests={r_bulk}  speed-up={t_seq / max(t_bulk, 1e-9):.1f}x")
+    if mismatches:
+        print(f"MISMATCH for {len(mismatches)} symbol(s): {', '.join(mismatches[:10])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
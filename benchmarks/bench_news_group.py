@@ -0,0 +1,121 @@
+"""
+Grouped-news benchmark: Google News RSS requests per cycle with and without
+news.group, and per-ticker equality of the sent alerts.
+
+Runs run_once twice on the same watchlist against the local stand-ins
+(standins.py answers grouped OR-queries with the same entries as the
+per-company queries), each time with a fresh state file and empty news
+caches:
+  1. news.group disabled (one RSS request per alerting ticker),
+  2. news.group enabled with --group-size.
+Fails (exit code 1) if the grouped run needs more than
+ceil(alerting / group size) + --slack RSS requests or any alert message
+differs from the per-ticker run.
+
+Start:
+    python benchmarks/bench_news_group.py --tickers 400 --alert-rate 0.1
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from standins import StandIns, fetch_stats, route_app  # noqa: E402
+
+TOPIC = "bench-news-group"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tickers", type=int, default=400)
+    ap.add_argument("--alert-rate", type=float, default=0.1)
+    ap.add_argument("--threshold", type=float, default=3.0)
+    ap.add_argument("--group-size", type=int, default=8)
+    ap.add_argument("--latency", type=float, default=0.02, help="Stand-in delay per request (s)")
+    ap.add_argument("--slack", type=int, default=1, help="Extra RSS requests allowed (fallback queries)")
+    ap.add_argument("--log-level", default="WARNING")
+    args = ap.parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level), format="%(levelname)s %(message)s")
+
+    import yfinance as yf
+    from src.app import company
+    from src.app.cache import configure_feed_cache, configure_link_cache
+    from src.app.config import DEFAULTS
+    from src.app.core import run_once
+    from src.app.market_data import configure_market_data
+
+    standins = StandIns(alert_rate=args.alert_rate, latency=args.latency).start()
+    work = Path(tempfile.mkdtemp(prefix="bench-news-group-"))
+    route_app(standins.url, DEFAULTS["http"])
+    yf.set_tz_cache_location(str(work / "yf-tz"))
+    configure_market_data({"provider": "yfinance"})
+
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    company.CACHE_FILE = work / "company_cache.json"
+    company.CACHE_FILE.write_text(json.dumps({
+        tk: {"ticker": tk, "name": f"Company {tk}", "raw_name": f"Company {tk} Inc.",
+             "source": "info.longName", "base_ticker": tk, "fetched_at": time.time()}
+        for tk in tickers
+    }), encoding="utf-8")
+    company.configure_company_cache(DEFAULTS["company"])
+
+    def cycle(name: str, group: bool):
+        d = work / name
+        d.mkdir()
+        configure_feed_cache({**DEFAULTS["news"]["cache"], "path": str(d / "news.sqlite")})
+        configure_link_cache({**DEFAULTS["news"]["link_cache"], "path": str(d / "news.sqlite")})
+        news_cfg = {**DEFAULTS["news"], "enabled": True, "limit": 2,
+                    "group": {**DEFAULTS["news"]["group"], "enabled": group, "max_size": args.group_size}}
+        with standins._lock:
+            sent_before = len(standins.ntfy_messages)
+        before = fetch_stats(standins.url)
+        t0 = time.perf_counter()
+        run_once(
+            tickers, args.threshold, standins.url, TOPIC, d / "state.json",
+            {"enabled": False, "tz": "UTC"}, {}, news_cfg, max_workers=8,
+            ntfy_cfg={**DEFAULTS["ntfy"], "digest_threshold": 0, "burst": 100_000, "rate_per_sec": 10_000.0},
+        )
+        wall = time.perf_counter() - t0
+        after = fetch_stats(standins.url)
+        with standins._lock:
+            msgs: Dict[str, str] = {t: b for _, t, b in standins.ntfy_messages[sent_before:]}
+        return wall, after.get("news_rss", 0) - before.get("news_rss", 0), msgs
+
+    try:
+        cycle("warm-up", False)
+        w1, rss1, per_ticker = cycle("per-ticker", False)
+        w2, rss2, grouped = cycle("grouped", True)
+    finally:
+        standins.stop()
+
+    alerting = len(per_ticker)
+    bound = math.ceil(alerting / args.group_size) + args.slack
+    print(f"tickers={args.tickers} alerting={alerting} group_size={args.group_size}")
+    print(f"{'mode':<12}{'rss requests':>14}{'cycle':>10}")
+    print(f"{'per-ticker':<12}{rss1:>14}{w1:>9.2f}s")
+    print(f"{'grouped':<12}{rss2:>14}{w2:>9.2f}s")
+    print(f"reduction: {rss1 / max(rss2, 1):.1f}x")
+
+    failures = []
+    if rss2 > bound:
+        failures.append(f"grouped run used {rss2} RSS requests > {bound}")
+    diff = sorted(t for t in set(per_ticker) | set(grouped) if per_ticker.get(t) != grouped.get(t))
+    if diff:
+        failures.append(f"{len(diff)} alert(s) differ from the per-ticker path, e.g. {diff[:3]}")
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+RSS parse benchmark: streaming parser (news._parse_rss) vs. feedparser on a
+Google News-shaped feed.
+
+Builds one feed with --items entries (title, link, guid, pubDate, the
+escaped HTML description Google sends, source) whose ages are spread over
+two days, so the lookback filter drops some of them. Measured per parse
+(median of --repeat runs) and as tracemalloc peak:
+  1. feedparser on the whole body (the former fetch_headlines path),
+  2. streaming with --limit (stops after `limit` fresh items),
+  3. streaming without limit (whole feed, as grouped queries use it).
+For 2. the share of the body read in FEED_CHUNK_SIZE chunks is reported.
+
+Fails (exit code 1) if a streaming result differs from feedparser's, the
+limited parse is less than --min-speedup times faster or needs more memory
+than feedparser, or a malformed feed (bare "&" in a title) does not fall
+back to feedparser with the same result.
+
+Start:
+    python benchmarks/bench_rss_parse.py --items 100 --limit 2
+"""
+from __future__ import annotations
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from email.utils import formatdate
+from pathlib import Path
+from typing import Callable, List
+from xml.sax.saxutils import escape
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.app.news import (  # noqa: E402
+    FEED_CHUNK_SIZE, _FeedBody, _parse_feed, _parse_feedparser, _parse_rss,
+)
+
+GOOGLE_NEWS = "https://news.google.com"
+
+
+def feed(items: int, seed: int, lookback_hours: int, bare_amp: bool = False) -> bytes:
+    """Google News-like RSS 2.0 body; every 4th item is older than lookback_hours."""
+    rng = random.Random(seed)
+    now = time.time()
+    out = ['<?xml version="1.0" encoding="UTF-8"?>',
+           '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>',
+           "<generator>NFE/5.0</generator>",
+           "<title>\"Microsoft MSFT (stock OR shares) when:12h\" - Google News</title>",
+           f"<link>{GOOGLE_NEWS}/search?q=Microsoft</link>",
+           "<language>de</language><webMaster>news-webmaster@google.com</webMaster>",
+           "<copyright>Copyright © 2025 Google. All rights reserved.</copyright>"]
+    for i in range(items):
+        aid = "CBMi" + "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
+                               for _ in range(180))
+        link = f"{GOOGLE_NEWS}/rss/articles/{aid}?oc=5"
+        source = rng.choice(["Traders Union", "Reuters", "finanzen.net", "Handelsblatt", "MarketWatch"])
+        title = f"Microsoft-Aktie: Analysten heben Kursziel an ({i}) - {source}"
+        if bare_amp and i == 0:
+            title = f"AT&T und Microsoft schließen KI-Partnerschaft - {source}"
+        age = (lookback_hours + 1 + rng.random() * 24) * 3600 if i % 4 == 1 else rng.random() * lookback_hours * 3000
+        description = escape(f'<a href="{link}" target="_blank">{escape(title)}</a>'
+                             f'&nbsp;&nbsp;<font color="#6f6f6f">{source}</font>')
+        out.append(
+            f"<item><title>{title if bare_amp and i == 0 else escape(title)}</title><link>{link}</link>"
+            f'<guid isPermaLink="false">{aid}</guid>'
+            f"<pubDate>{formatdate(now - age, usegmt=True)}</pubDate>"
+            f"<description>{description}</description>"
+            f'<source url="https://example.com">{escape(source)}</source></item>'
+        )
+    out.append("</channel></rss>")
+    return "\n".join(out).encode("utf-8")
+
+
+def chunked(body: bytes) -> _FeedBody:
+    return _FeedBody(body[i:i + FEED_CHUNK_SIZE] for i in range(0, len(body), FEED_CHUNK_SIZE))
+
+
+def measure(fn: Callable[[], List], repeat: int):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--items", type=int, default=100, help="Entries per feed (Google News returns up to 100)")
+    ap.add_argument("--limit", type=int, default=2)
+    ap.add_argument("--lookback-hours", type=int, default=12)
+    ap.add_argument("--repeat", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=5)
+    ap.add_argument("--min-speedup", type=float, default=5.0)
+    args = ap.parse_args()
+
+    body = feed(args.items, args.seed, args.lookback_hours)
+    lb, limit = args.lookback_hours, args.limit
+    _parse_feedparser(body, lb, limit)  # Warm-up (Imports)
+
+    runs = {
+        "feedparser": lambda: _parse_feedparser(body, lb, limit),
+        f"stream limit={limit}": lambda: _parse_rss(chunked(body).chunks(), lb, limit),
+        "stream all": lambda: _parse_rss(chunked(body).chunks(), lb, None),
+    }
+    print(f"items={args.items} body={len(body) / 1024:.0f} KiB limit={limit} lookback={lb}h")
+    print(f"{'method':<18}{'time':>10}{'peak mem':>11}")
+    stats = {}
+    for name, fn in runs.items():
+        stats[name] = measure(fn, args.repeat)
+        dt, peak = stats[name]
+        print(f"{name:<18}{dt * 1000:>8.2f}ms{peak / 1024:>8.0f} KiB")
+
+    limited = chunked(body)
+    _parse_rss(limited.chunks(), lb, limit)
+    print(f"read with limit={limit}: {limited.bytes_read / 1024:.0f} of {len(body) / 1024:.0f} KiB")
+    speedup = stats["feedparser"][0] / stats[f"stream limit={limit}"][0]
+    print(f"speed-up (limit={limit}): {speedup:.1f}x, "
+          f"whole feed: {stats['feedparser'][0] / stats['stream all'][0]:.1f}x")
+
+    failures = []
+    for lim in (limit, None):
+        if _parse_rss(chunked(body).chunks(), lb, lim) != _parse_feedparser(body, lb, lim):
+            failures.append(f"streaming result (limit={lim}) differs from feedparser")
+    if speedup < args.min_speedup:
+        failures.append(f"speed-up {speedup:.1f}x < {args.min_speedup}x")
+    if stats[f"stream limit={limit}"][1] > stats["feedparser"][1]:
+        failures.append("streaming parse needs more memory than feedparser")
+
+    broken = feed(args.items, args.seed, lb, bare_amp=True)
+    fallback = _parse_feed(chunked(broken), lb, None)
+    expected = _parse_feedparser(broken, lb, None)
+    print(f"malformed feed: {len(fallback)} item(s) via fallback, first title {fallback[0]['title'][:30]!r}"
+          if fallback else "malformed feed: no items")
+    if not fallback or fallback != expected:
+        failures.append("malformed feed did not fall back to feedparser")
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
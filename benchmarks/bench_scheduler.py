@@ -0,0 +1,146 @@
+"""
+Adaptive-polling benchmark: Yahoo requests vs. detection latency over a
+simulated trading day.
+
+Simulates --tickers random walks of Δ% (per-minute steps; most tickers quiet,
+some volatile, a few drifting towards the threshold) over --minutes and
+compares three daemon strategies:
+  - fixed 1 min    every ticker every minute (daemon without scheduler)
+  - fixed N min    every ticker every --coarse minutes (cron-like)
+  - adaptive       PollScheduler (src/app/scheduler.py), ticked every minute
+
+A detection is the first poll that sees |Δ%| ≥ threshold after a crossing;
+latency is counted from the minute of the crossing. Crossings that end
+before any poll sees them are missed.
+
+Fails (exit code 1) if the adaptive strategy needs more than --max-share of
+the 1-min requests or its p95 latency exceeds --max-p95 minutes.
+
+Start:
+    python benchmarks/bench_scheduler.py --tickers 500
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.app.scheduler import PollScheduler  # noqa: E402
+
+
+def simulate(n: int, minutes: int, seed: int) -> Dict[str, List[float]]:
+    """Δ% path per ticker (one value per minute)."""
+    rng = random.Random(seed)
+    paths: Dict[str, List[float]] = {}
+    for i in range(n):
+        sigma = rng.lognormvariate(-3.0, 0.7)            # typ. 0.05 %-Punkte/Minute
+        drift = rng.choice([0.0] * 9 + [rng.uniform(-0.02, 0.02)])
+        pct, path = rng.gauss(0.0, 0.5), []
+        for _ in range(minutes):
+            pct += drift + rng.gauss(0.0, sigma)
+            path.append(pct)
+        paths[f"T{i:05d}"] = path
+    return paths
+
+
+def crossings(path: List[float], threshold: float) -> List[Tuple[int, int]]:
+    """[(first minute ≥ threshold, first minute back inside)] per breakout episode."""
+    out, start = [], None
+    for m, pct in enumerate(path):
+        if abs(pct) >= threshold and start is None:
+            start = m
+        elif abs(pct) < threshold and start is not None:
+            out.append((start, m))
+            start = None
+    if start is not None:
+        out.append((start, len(path)))
+    return out
+
+
+def score(polls: Dict[str, List[int]], paths: Dict[str, List[float]], threshold: float):
+    """(requests, latencies in minutes, missed crossings)."""
+    requests, latencies, missed = 0, [], 0
+    for tk, minutes in polls.items():
+        requests += len(minutes)
+        seen = sorted(minutes)
+        for start, end in crossings(paths[tk], threshold):
+            hit = next((m for m in seen if start <= m < end), None)
+            if hit is None:
+                missed += 1
+            else:
+                latencies.append(hit - start)
+    return requests, latencies, missed
+
+
+def fixed(paths: Dict[str, List[float]], minutes: int, every: int) -> Dict[str, List[int]]:
+    return {tk: list(range(0, minutes, every)) for tk in paths}
+
+
+def adaptive(paths: Dict[str, List[float]], minutes: int, threshold: float, cfg: dict) -> Dict[str, List[int]]:
+    sched = PollScheduler(list(paths), threshold, cfg=cfg)
+    t0 = time.time()
+    polls: Dict[str, List[int]] = {tk: [] for tk in paths}
+    for m in range(minutes):
+        now = t0 + m * 60.0
+        due = sched.due(now)
+        for tk in due:
+            polls[tk].append(m)
+        sched.record({tk: paths[tk][m] for tk in due}, now)
+    return polls
+
+
+def percentile(values: List[float], q: float) -> float:
+    s = sorted(values)
+    return s[max(0, min(len(s) - 1, int(round(q / 100.0 * len(s) + 0.5)) - 1))] if s else 0.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tickers", type=int, default=500)
+    ap.add_argument("--minutes", type=int, default=390, help="Simulated session length")
+    ap.add_argument("--threshold", type=float, default=3.0)
+    ap.add_argument("--coarse", type=int, default=15, help="Interval of the coarse fixed strategy (min)")
+    ap.add_argument("--budget", type=int, default=0, help="budget_per_min (default: 30%% of --tickers)")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--max-share", type=float, default=0.35, help="Allowed adaptive/1-min request ratio")
+    ap.add_argument("--max-p95", type=float, default=3.0, help="Allowed adaptive p95 latency (min)")
+    args = ap.parse_args()
+
+    paths = simulate(args.tickers, args.minutes, args.seed)
+    cfg = {"budget_per_min": args.budget or max(1, int(args.tickers * 0.3))}
+    strategies: List[Tuple[str, Callable[[], Dict[str, List[int]]]]] = [
+        ("fixed 1 min", lambda: fixed(paths, args.minutes, 1)),
+        (f"fixed {args.coarse} min", lambda: fixed(paths, args.minutes, args.coarse)),
+        ("adaptive", lambda: adaptive(paths, args.minutes, args.threshold, cfg)),
+    ]
+
+    rows = {}
+    print(f"tickers={args.tickers} minutes={args.minutes} threshold=±{args.threshold}% "
+          f"budget={cfg['budget_per_min']}/min")
+    print(f"{'strategy':<14}{'requests':>10}{'share':>8}{'detected':>10}{'missed':>8}"
+          f"{'p50':>7}{'p95':>7}{'max':>7}")
+    for name, run in strategies:
+        req, lat, missed = score(run(), paths, args.threshold)
+        rows[name] = (req, lat, missed)
+        base = rows["fixed 1 min"][0]
+        print(f"{name:<14}{req:>10}{req / base:>8.1%}{len(lat):>10}{missed:>8}"
+              f"{percentile(lat, 50):>7.0f}{percentile(lat, 95):>7.0f}{max(lat, default=0):>7.0f}")
+
+    req, lat, _ = rows["adaptive"]
+    failures = []
+    if req / rows["fixed 1 min"][0] > args.max_share:
+        failures.append(f"adaptive uses {req / rows['fixed 1 min'][0]:.1%} of the 1-min requests > {args.max_share:.0%}")
+    if percentile(lat, 95) > args.max_p95:
+        failures.append(f"adaptive p95 latency {percentile(lat, 95):.0f} min > {args.max_p95:.0f} min")
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
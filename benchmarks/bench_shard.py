@@ -0,0 +1,179 @@
+"""
+Sharding benchmark: speed-up of `--shard i/N` processes and exactly-once
+alerts across shards.
+
+For every N in --shards, N child processes run one run_once each for their
+shard of the same watchlist against local stand-ins (standins.py; every
+request waits --latency seconds like a real round trip) and share one
+state file. Children warm up (imports, yfinance timezone cache) first and
+start the measured cycle together. Then
+  1. wall time from start to the last shard's finish → speed-up vs. N=1,
+  2. every alerting ticker got exactly one ntfy message (none lost/duplicated),
+  3. the merged state (all segments) holds every alert,
+  4. a second round with the same N sends nothing (de-bounce across shards),
+  5. after the largest N, a round with N-1 shards (re-sharding) sends nothing.
+
+The speed-up is linear while the cycle waits on the network; once the
+shards saturate the CPU cores (yfinance parses every symbol in Python) it
+cannot exceed wall(1) × cores / cpu(1). Fails (exit code 1) if a check
+fails or speed-up(N) < --min-efficiency × min(N, that bound).
+
+Start:
+    python benchmarks/bench_shard.py --tickers 200 --shards 1,2,4
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from standins import StandIns, move_pct, route_app  # noqa: E402
+
+TOPIC = "bench-shard"
+TICKER = re.compile(r"T\d{5}")
+
+
+def child(args: argparse.Namespace) -> int:
+    """Run the cycle of one shard after "go" arrives on stdin; prints one JSON line."""
+    logging.basicConfig(level=getattr(logging, args.log_level), format="%(levelname)s %(message)s")
+    import yfinance as yf
+    from src.app.config import DEFAULTS
+    from src.app.core import run_once
+    from src.app.market_data import configure_market_data
+    from src.app.shard import parse_shard, shard_tickers
+
+    work = Path(args.work)
+    shard = parse_shard(args.shard)
+    route_app(args.url, DEFAULTS["http"])
+    yf.set_tz_cache_location(str(work / f"yf-tz-{shard[0]}"))
+    configure_market_data({"provider": "yfinance"})
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    yf.download(shard_tickers(tickers, shard)[:1], period="1d", interval="1m",
+                auto_adjust=False, progress=False)  # Warm-up
+
+    print("ready", flush=True)
+    sys.stdin.readline()
+    t0, c0 = time.time(), time.process_time()
+    run_once(
+        tickers, args.threshold, args.url, TOPIC, work / "alert_state.json",
+        {"enabled": False, "tz": "UTC"}, {}, {"enabled": False},
+        max_workers=4, shard=shard,
+        ntfy_cfg={**DEFAULTS["ntfy"], "digest_threshold": 0, "burst": 100_000, "rate_per_sec": 10_000.0},
+    )
+    print(json.dumps({"shard": args.shard, "start": t0, "end": time.time(),
+                      "cpu": time.process_time() - c0}), flush=True)
+    return 0
+
+
+def run_round(args: argparse.Namespace, url: str, work: Path, n: int) -> Tuple[float, float]:
+    """Start n shard processes together; returns (wall time, CPU seconds) of the measured cycles."""
+    procs = [subprocess.Popen(
+        [sys.executable, __file__, "--child", "--url", url, "--work", str(work), "--shard", f"{i}/{n}",
+         "--tickers", str(args.tickers), "--threshold", str(args.threshold), "--log-level", args.log_level],
+        cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    ) for i in range(n)]
+    for p in procs:
+        if p.stdout.readline().strip() != "ready":
+            raise RuntimeError("shard child failed to start")
+    for p in procs:
+        p.stdin.write("go\n")
+        p.stdin.flush()
+    spans = []
+    for p in procs:
+        out, _ = p.communicate(timeout=600)
+        if p.returncode != 0:
+            raise RuntimeError(f"shard child exited with {p.returncode}")
+        spans.append(json.loads(out.strip().splitlines()[-1]))
+    return max(s["end"] for s in spans) - min(s["start"] for s in spans), sum(s["cpu"] for s in spans)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tickers", type=int, default=200)
+    ap.add_argument("--shards", default="1,2,4", help="Comma-separated shard counts (first one is the reference)")
+    ap.add_argument("--threshold", type=float, default=3.0)
+    ap.add_argument("--alert-rate", type=float, default=0.05)
+    ap.add_argument("--latency", type=float, default=0.05, help="Stand-in delay per request (s)")
+    ap.add_argument("--min-efficiency", type=float, default=0.7, help="Required speed-up / N")
+    ap.add_argument("--log-level", default="WARNING")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--url", help=argparse.SUPPRESS)
+    ap.add_argument("--work", help=argparse.SUPPRESS)
+    ap.add_argument("--shard", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        return child(args)
+
+    from src.app.shard import ShardStateStore
+
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    alerting: Set[str] = {tk for tk in tickers if abs(move_pct(tk, args.alert_rate)) >= args.threshold}
+    standins = StandIns(alert_rate=args.alert_rate, latency=args.latency).start()
+    counts = [int(x) for x in args.shards.split(",") if x.strip()]
+    failures: List[str] = []
+    walls: Dict[int, float] = {}
+    cores = os.cpu_count() or 1
+
+    def sent() -> List[str]:
+        with standins._lock:
+            return [m for _, t, _ in standins.ntfy_messages for m in TICKER.findall(t or "")]
+
+    try:
+        print(f"tickers={args.tickers} alerting={len(alerting)} latency={args.latency * 1000:.0f} ms/request "
+              f"cores={cores}")
+        print(f"{'shards':>6} {'wall':>8} {'cpu':>7} {'speed-up':>9} {'ideal':>6} {'alerts':>7} {'repeat':>7}")
+        for n in counts:
+            work = Path(tempfile.mkdtemp(prefix=f"bench-shard-{n}-"))
+            before = len(sent())
+            walls[n], cpu = run_round(args, standins.url, work, n)
+            if n == counts[0]:
+                cpu_bound = walls[n] * cores / max(cpu, 1e-6) * n
+            got = sent()[before:]
+            dupes = sorted({tk for tk in got if got.count(tk) > 1})
+            if set(got) != alerting or dupes:
+                failures.append(f"N={n}: {len(set(got))}/{len(alerting)} alerted, duplicates={dupes[:5]}")
+            store = ShardStateStore(work / "alert_state.json")
+            in_state = {tk for tk, d in store.directions().items() if d != "none"}
+            if in_state != alerting:
+                failures.append(f"N={n}: merged state holds {len(in_state)}/{len(alerting)} alert(s)")
+
+            before = len(sent())
+            run_round(args, standins.url, work, n)
+            repeat = len(sent()) - before
+            if repeat:
+                failures.append(f"N={n}: second round re-sent {repeat} alert(s)")
+            speedup = walls[counts[0]] / walls[n] * counts[0]
+            ideal = min(float(n), cpu_bound)
+            print(f"{n:>6} {walls[n]:>7.2f}s {cpu:>6.2f}s {speedup:>8.2f}x {ideal:>5.1f}x {len(got):>7} {repeat:>7}")
+            if speedup < args.min_efficiency * ideal:
+                failures.append(f"N={n}: speed-up {speedup:.2f}x < {args.min_efficiency:.0%} of {ideal:.1f}x")
+
+        if counts[-1] > 1:
+            before = len(sent())
+            run_round(args, standins.url, work, counts[-1] - 1)
+            moved = len(sent()) - before
+            print(f"re-shard {counts[-1]} → {counts[-1] - 1}: {moved} alert(s) re-sent")
+            if moved:
+                failures.append(f"re-sharding re-sent {moved} alert(s)")
+    finally:
+        standins.stop()
+
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Streaming-mode benchmark: tick-to-alert latency and gap back-fill.
+
+Runs StreamMonitor (src/app/stream.py) against local stand-ins:
+ws_standin.py for the price streamer, standins.py for ntfy and the Yahoo
+chart API (back-fill). Then
+  1. pushes --alerts threshold-crossing ticks (one ticker each, after a few
+     in-corridor ticks) and measures push → ntfy POST received,
+  2. closes the stream, lets every ticker move past the threshold while
+     disconnected and checks that the reconnect back-fill alerts on them.
+
+Fails (exit code 1) if p95 latency exceeds --max-latency or the back-fill
+misses the gap.
+
+Start:
+    python benchmarks/bench_stream.py --tickers 200 --alerts 20
+"""
+from __future__ import annotations
+import argparse
+import logging
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from standins import StandIns, open_price, route_app  # noqa: E402
+from ws_standin import WsStandIn  # noqa: E402
+
+TOPIC = "bench-stream"
+
+
+def wait_for(cond, timeout: float) -> bool:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond():
+            return True
+        time.sleep(0.002)
+    return False
+
+
+def percentile(values: List[float], q: float) -> float:
+    s = sorted(values)
+    return s[max(0, min(len(s) - 1, int(round(q / 100.0 * len(s) + 0.5)) - 1))] if s else 0.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tickers", type=int, default=200)
+    ap.add_argument("--alerts", type=int, default=20, help="Threshold crossings to measure")
+    ap.add_argument("--threshold", type=float, default=3.0)
+    ap.add_argument("--max-latency", type=float, default=1.0, help="Allowed p95 tick → ntfy latency (s)")
+    ap.add_argument("--log-level", default="WARNING")
+    args = ap.parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level), format="%(levelname)s %(message)s")
+
+    import yfinance as yf
+    from src.app.config import DEFAULTS
+    from src.app.market_data import configure_market_data
+    from src.app.stream import StreamMonitor
+
+    standins = StandIns(alert_rate=0.0).start()   # Back-fill beim Start: alle Ticker im Korridor
+    ws = WsStandIn().start()
+    work = Path(tempfile.mkdtemp(prefix="bench-stream-"))
+    route_app(standins.url, DEFAULTS["http"])
+    yf.set_tz_cache_location(str(work / "yf-tz"))
+    configure_market_data({"provider": "yfinance"})
+
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+    run_kwargs = dict(
+        tickers=tickers, threshold_pct=args.threshold, ntfy_server=standins.url, ntfy_topic=TOPIC,
+        state_file=work / "state.json", market_hours_cfg={"enabled": False, "tz": "UTC"},
+        test_cfg={}, news_cfg={"enabled": False}, max_workers=4,
+        # Kein Digest/Rate-Limit: jede Nachricht einzeln messen
+        ntfy_cfg={**DEFAULTS["ntfy"], "digest_threshold": 0, "burst": 10_000, "rate_per_sec": 1000.0},
+    )
+    stop = threading.Event()
+    monitor = StreamMonitor(run_kwargs, {"url": ws.url, "reconnect_min_sec": 0.2, "heartbeat_sec": 5}, stop=stop)
+    runner = threading.Thread(target=monitor.run, name="stream", daemon=True)
+    runner.start()
+    failures: List[str] = []
+    try:
+        if not wait_for(lambda: monitor.stats["backfills"] >= 1 and ws.subscribed(tickers[0]), 60):
+            print("Stream did not start (no subscription/back-fill).")
+            return 1
+
+        def titles() -> List[str]:
+            with standins._lock:
+                return [t for _, t, _ in standins.ntfy_messages]
+
+        # 1) Tick → Alert-Latenz
+        latencies: List[float] = []
+        for tk in tickers[:args.alerts]:
+            o = open_price(tk)
+            ws.push(tk, round(o * 1.01, 4))
+            n = len(titles())
+            t0 = time.perf_counter()
+            ws.push(tk, round(o * (1 + (args.threshold + 1.5) / 100.0), 4))
+            if wait_for(lambda: any(tk in (t or "") for t in titles()[n:]), 5.0):
+                latencies.append(time.perf_counter() - t0)
+            else:
+                failures.append(f"no alert for {tk}")
+
+        # 2) Trennung: alle übrigen Ticker brechen aus, während kein Tick ankommt
+        backfills = monitor.stats["backfills"]
+        sent_before = len(titles())
+        standins.alert_rate = 1.0
+        ws.drop()
+        expected = len(tickers) - args.alerts
+        t_gap = time.perf_counter()
+        ok = wait_for(lambda: monitor.stats["backfills"] > backfills and len(titles()) - sent_before >= expected, 30)
+        gap_s = time.perf_counter() - t_gap
+        gap_alerts = len(titles()) - sent_before
+        if not ok:
+            failures.append(f"back-fill after reconnect sent {gap_alerts}/{expected} alert(s)")
+    finally:
+        stop.set()
+        runner.join(timeout=10)
+        ws.stop()
+        standins.stop()
+
+    p50, p95 = percentile(latencies, 50), percentile(latencies, 95)
+    print(f"tickers={args.tickers} alerts={len(latencies)}/{args.alerts} connects={monitor.stats['connects']}")
+    print(f"tick → ntfy latency: p50={p50 * 1000:.1f} ms  p95={p95 * 1000:.1f} ms  "
+          f"max={max(latencies, default=0) * 1000:.1f} ms")
+    print(f"reconnect back-fill: {gap_alerts}/{expected} alert(s) within {gap_s:.2f} s")
+    if latencies and p95 > args.max_latency:
+        failures.append(f"p95 latency {p95:.3f}s > {args.max_latency}s")
+    for f in failures:
+        print(f"FAIL: {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+Local HTTP stand-ins for the services a cycle talks to, on one port:
+
+    POST /<topic>                    ntfy (accepts what notify_ntfy sends)
+    GET  /rss/search?q=...           Google News RSS (items link to news.google.com/rss/articles/<id>)
+    HEAD/GET /rss/articles/<id>      Google News redirect → /article/<id>
+    GET  /article/<id>               Original article
+    GET  /v8/finance/chart/<symbol>  Yahoo chart API (deterministic synthetic bars)
+    GET  /__stats                    Request counters per route (JSON)
+
+route_app() points the package at the stand-ins: the shared HTTP client
+rewrites https://news.google.com to the local server and yfinance's chart
+endpoint is redirected to it (no cookie/crumb handshake).
+
+Start standalone (for manual testing):
+    python benchmarks/standins.py --port 8765
+"""
+from __future__ import annotations
+import argparse
+import json
+import re
+import socket
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+GOOGLE_NEWS = "https://news.google.com"
+BARS = 30  # 1m-Bars pro Symbol und Tag
+
+
+def _seed(symbol: str) -> int:
+    return zlib.crc32(symbol.encode("utf-8"))
+
+
+def move_pct(symbol: str, alert_rate: float) -> float:
+    """Deterministic Δ% of a symbol: ~alert_rate of all symbols move ±4–6%, the rest within ±1.5%."""
+    s = _seed(symbol)
+    sign = 1.0 if s & 1 else -1.0
+    if (s % 10_000) / 10_000.0 < alert_rate:
+        return sign * (4.0 + (s >> 8) % 200 / 100.0)
+    return sign * ((s >> 8) % 150 / 100.0)
+
+
+def open_price(symbol: str) -> float:
+    """Deterministic open of a symbol in the chart stand-in."""
+    return 20.0 + _seed(symbol) % 48_000 / 100.0
+
+
+def chart_payload(symbol: str, interval: str, alert_rate: float, now: Optional[float] = None,
+                  since: Optional[int] = None) -> Dict[str, Any]:
+    """Yahoo /v8/finance/chart response with BARS synthetic bars ending at `now` (only ts >= since)."""
+    now = int(now or time.time()) // 60 * 60
+    open_px = open_price(symbol)
+    last_px = open_px * (1.0 + move_pct(symbol, alert_rate) / 100.0)
+    n = 1 if interval == "1d" else BARS
+    step = 86_400 if interval == "1d" else 60
+    ts = [now - (n - 1 - i) * step for i in range(n)]
+    closes = [round(open_px + (last_px - open_px) * (i + 1) / n, 4) for i in range(n)]
+    opens = [round(open_px, 4)] + closes[:-1]
+    if since is not None:  # period1 (inkrementeller Abruf): nur neuere Bars ausliefern
+        keep = [i for i, t in enumerate(ts) if t >= since] or [n - 1]
+        ts, closes, opens = [ts[i] for i in keep], [closes[i] for i in keep], [opens[i] for i in keep]
+    quote = {
+        "open": opens,
+        "high": [round(max(o, c) * 1.001, 4) for o, c in zip(opens, closes)],
+        "low": [round(min(o, c) * 0.999, 4) for o, c in zip(opens, closes)],
+        "close": closes,
+        "volume": [1000 + (_seed(symbol) + i) % 5000 for i in range(len(ts))],
+    }
+    period = {"timezone": "UTC", "start": ts[0], "end": ts[-1] + step, "gmtoffset": 0}
+    indicators: Dict[str, Any] = {"quote": [quote]}
+    if interval == "1d":
+        indicators["adjclose"] = [{"adjclose": closes}]
+    return {"chart": {"result": [{
+        "meta": {
+            "currency": "USD", "symbol": symbol, "exchangeName": "NMS", "fullExchangeName": "NasdaqGS",
+            "instrumentType": "EQUITY", "firstTradeDate": 345479400, "regularMarketTime": ts[-1],
+            "hasPrePostMarketData": False, "gmtoffset": 0, "timezone": "UTC",
+            "exchangeTimezoneName": "UTC", "regularMarketPrice": closes[-1],
+            "chartPreviousClose": opens[0], "previousClose": opens[0], "scale": 3, "priceHint": 2,
+            "currentTradingPeriod": {"pre": period, "regular": period, "post": period},
+            "tradingPeriods": [[period]], "dataGranularity": interval, "range": "1d",
+            "validRanges": ["1d", "5d", "1mo"],
+        },
+        "timestamp": ts,
+        "indicators": indicators,
+    }], "error": None}}
+
+
+def _subqueries(query: str) -> List[str]:
+    """Split a grouped query "(A a) OR (B b) (kw)" into the per-company queries "A a (kw)"."""
+    head, sep, kw = query.rpartition(" (")
+    if not sep or not head.startswith("("):
+        return [query]
+    return [f"{part} ({kw}" for part in re.findall(r"\(([^()]*)\)", head)]
+
+
+def rss_payload(query: str, items: int) -> bytes:
+    """
+    Google News-shaped RSS 2.0 feed with `items` entries published just now
+    (per company for grouped OR-queries; same entries as the per-company query).
+    """
+    now = time.time()
+    out = ['<?xml version="1.0" encoding="UTF-8"?>',
+           '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>',
+           "<generator>NFE/5.0</generator>",
+           f"<title>{escape(query)} - Google News</title>",
+           f"<link>{GOOGLE_NEWS}/search?q={escape(query)}</link>",
+           "<language>de</language>"]
+    for sub, i in ((sub, i) for sub in _subqueries(query) for i in range(items)):
+        aid = f"CBMi{zlib.crc32(f'{sub}|{i}'.encode()):08x}{i}"
+        link = f"{GOOGLE_NEWS}/rss/articles/{aid}?oc=5"
+        title = f"{sub.split(' (')[0]} news item {i} - Example Source"
+        out.append(
+            f"<item><title>{escape(title)}</title><link>{link}</link>"
+            f'<guid isPermaLink="false">{aid}</guid>'
+            f"<pubDate>{formatdate(now - 60 * (i + 1), usegmt=True)}</pubDate>"
+            f"<description>{escape(title)}</description>"
+            f'<source url="https://example.com">Example Source</source></item>'
+        )
+    out.append("</channel></rss>")
+    return "\n".join(out).encode("utf-8")
+
+
+class StandIns:
+    """Threaded local server with all stand-ins; counters are per route."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, alert_rate: float = 0.05,
+                 news_items: int = 3, latency: float = 0.0) -> None:
+        self.alert_rate = alert_rate
+        self.news_items = news_items
+        self.latency = latency
+        self.counts: Counter = Counter()
+        self.ntfy_messages: list = []
+        self._lock = threading.Lock()
+        standins = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-Alive wie bei den echten Diensten
+
+            def setup(self) -> None:
+                super().setup()
+                # Header und Body gehen in getrennten send()-Aufrufen raus → ohne NODELAY
+                # bremsen Nagle + Delayed ACK jede Antwort künstlich um ~40 ms
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *a: Any) -> None:
+                pass
+
+            def _reply(self, code: int, body: bytes = b"", ctype: str = "text/plain",
+                       headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _route(self) -> Tuple[str, Any]:
+                u = urlsplit(self.path)
+                return u.path, parse_qs(u.query)
+
+            def _count(self, route: str) -> None:
+                with standins._lock:
+                    standins.counts[route] += 1
+                if standins.latency:
+                    time.sleep(standins.latency)
+
+            def do_GET(self) -> None:
+                path, qs = self._route()
+                if path == "/__stats":
+                    with standins._lock:
+                        body = json.dumps(dict(standins.counts)).encode()
+                    return self._reply(200, body, "application/json")
+                if path.startswith("/v8/finance/chart/"):
+                    self._count("yahoo")
+                    sym = path.rsplit("/", 1)[-1]
+                    interval = (qs.get("interval") or ["1d"])[0]
+                    since = int((qs.get("period1") or ["0"])[0]) if "range" not in qs else None
+                    body = json.dumps(chart_payload(sym, interval, standins.alert_rate, since=since)).encode()
+                    return self._reply(200, body, "application/json")
+                if path == "/rss/search":
+                    self._count("news_rss")
+                    q = (qs.get("q") or [""])[0]
+                    return self._reply(200, rss_payload(q, standins.news_items),
+                                       "application/xml; charset=utf-8")
+                if path.startswith("/rss/articles/"):
+                    self._count("news_redirect")
+                    host = self.headers.get("Host", "")
+                    target = f"http://{host}/article/{path.rsplit('/', 1)[-1]}"
+                    return self._reply(302, b"", headers={"Location": target})
+                if path.startswith("/article/"):
+                    self._count("article")
+                    return self._reply(200, b"<html><body>article</body></html>", "text/html")
+                self._reply(404, b"not found")
+
+            do_HEAD = do_GET
+
+            def do_POST(self) -> None:
+                n = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(n) if n else b""
+                self._count("ntfy")
+                with standins._lock:
+                    standins.ntfy_messages.append((self.path, self.headers.get("Title"), body))
+                self._reply(200, json.dumps({"id": "bench", "event": "message"}).encode(), "application/json")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="standins", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandIns":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def fetch_stats(url: str) -> Dict[str, int]:
+    """Read the request counters of a (possibly remote-process) stand-in server."""
+    from urllib.request import urlopen
+    with urlopen(f"{url}/__stats", timeout=5) as r:
+        return json.loads(r.read())
+
+
+def route_app(url: str, http_cfg: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Point the package's outbound calls at the stand-ins at `url`.
+
+    - Google News (feeds + redirect links): the shared HTTP client gets a
+      subclass that rewrites https://news.google.com → `url`.
+    - Yahoo: yfinance's chart endpoint is redirected to `url` and its
+      cookie/crumb handshake is skipped.
+    - ntfy: pass `url` as ntfy_server to run_once.
+    """
+    from src.app import http_client
+
+    class _RoutedHttpClient(http_client.HttpClient):
+        def request(self, method: str, u: str, **kwargs: Any):
+            if u.startswith(GOOGLE_NEWS):
+                u = url + u[len(GOOGLE_NEWS):]
+            return super().request(method, u, **kwargs)
+
+    with http_client._client_lock:
+        if http_client._client is not None:
+            http_client._client.close()
+        http_client._client = _RoutedHttpClient(http_cfg)
+
+    import yfinance.base
+    import yfinance.data
+    import yfinance.scrapers.history
+
+    yfinance.base._BASE_URL_ = url
+    yfinance.scrapers.history._BASE_URL_ = url
+    yfinance.data.YfData._get_cookie_and_crumb = lambda self, timeout=30: (None, "basic")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--alert-rate", type=float, default=0.05)
+    args = ap.parse_args()
+    s = StandIns(port=args.port, alert_rate=args.alert_rate).start()
+    print(f"Stand-ins listening on {s.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        s.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
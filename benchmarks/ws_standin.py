@@ -0,0 +1,142 @@
+"""
+Local stand-in for Yahoo's price streamer (wss://streamer.finance.yahoo.com).
+
+Speaks the same wire format as the real service: clients send
+{"subscribe": [...]} (repeated as heartbeat), the server pushes
+{"type": "pricing", "message": <base64 PricingData protobuf>} frames for
+subscribed symbols only.
+
+    ws = WsStandIn().start()
+    ws.push("AAPL", 231.5)     # one tick to every client subscribed to AAPL
+    ws.drop()                  # close all connections (reconnect testing)
+    ws.stop()
+
+Start standalone (random-walk ticks for manual testing):
+    python benchmarks/ws_standin.py --port 8766 --symbols AAPL,MSFT
+"""
+from __future__ import annotations
+import argparse
+import base64
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Set
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def pricing_frame(symbol: str, price: float, ts_ms: Optional[int] = None, open_price: float = 0.0) -> str:
+    """Encode one tick the way the Yahoo streamer does."""
+    from yfinance.pricing_pb2 import PricingData
+
+    msg = PricingData(id=symbol, price=price, time=ts_ms or int(time.time() * 1000),
+                      open_price=open_price, exchange="NMS", quote_type=8, market_hours=1)
+    return json.dumps({"type": "pricing", "message": base64.b64encode(msg.SerializeToString()).decode()})
+
+
+class WsStandIn:
+    """WebSocket server with per-connection subscriptions and push/drop controls."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        from websockets.sync.server import serve
+
+        self._clients: List[Any] = []
+        self._subs: dict = {}
+        self._lock = threading.Lock()
+        self.subscribe_msgs = 0
+        self.connections = 0
+        self.server = serve(self._handler, host, port)
+        self._thread = threading.Thread(target=self.server.serve_forever, name="ws-standin", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.socket.getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    def _handler(self, ws: Any) -> None:
+        with self._lock:
+            self._clients.append(ws)
+            self._subs[ws] = set()
+            self.connections += 1
+        try:
+            for raw in ws:
+                try:
+                    msg = json.loads(raw)
+                except ValueError:
+                    continue
+                with self._lock:
+                    subs: Set[str] = self._subs[ws]
+                    if "subscribe" in msg:
+                        self.subscribe_msgs += 1
+                        subs.update(s.upper() for s in msg["subscribe"])
+                    if "unsubscribe" in msg:
+                        subs.difference_update(s.upper() for s in msg["unsubscribe"])
+        finally:
+            with self._lock:
+                self._clients.remove(ws)
+                self._subs.pop(ws, None)
+
+    def subscribed(self, symbol: str) -> int:
+        """Number of connections currently subscribed to `symbol`."""
+        with self._lock:
+            return sum(symbol.upper() in s for s in self._subs.values())
+
+    def push(self, symbol: str, price: float, open_price: float = 0.0) -> int:
+        """Send one tick to all subscribers of `symbol`; returns the number of recipients."""
+        frame = pricing_frame(symbol.upper(), price, open_price=open_price)
+        with self._lock:
+            targets = [ws for ws in self._clients if symbol.upper() in self._subs.get(ws, ())]
+        sent = 0
+        for ws in targets:
+            try:
+                ws.send(frame)
+                sent += 1
+            except Exception:
+                pass
+        return sent
+
+    def drop(self) -> None:
+        """Close every client connection (simulates a streamer outage)."""
+        with self._lock:
+            targets = list(self._clients)
+        for ws in targets:
+            ws.close()
+
+    def start(self) -> "WsStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.drop()
+        self.server.shutdown()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--symbols", default="AAPL,MSFT")
+    ap.add_argument("--interval", type=float, default=1.0, help="Seconds between tick rounds")
+    args = ap.parse_args()
+    ws = WsStandIn(port=args.port).start()
+    prices = {s.upper(): 100.0 for s in args.symbols.split(",") if s.strip()}
+    print(f"Streamer stand-in on {ws.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            for sym in prices:
+                prices[sym] *= 1.0 + random.uniform(-0.01, 0.01)
+                ws.push(sym, round(prices[sym], 4), open_price=100.0)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ws.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
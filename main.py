@@ -1,20 +1,70 @@
+import argparse
 from pathlib import Path
 
 from src.app.config import load_config, deep_merge
 from src.app.logging_setup import setup_logging
 from src.app.core import run_once
+from src.app.daemon import run_daemon
+from src.app.cache import configure_feed_cache, configure_link_cache
+from src.app.company import configure_company_cache
+from src.app.http_client import configure_http
+from src.app.market_data import configure_market_data
+from src.app.metrics import configure_metrics
+from src.app.shard import parse_shard, shard_path, shard_tickers
 from src.app.utils import mask_secret
 
 #import für testing:
 from src.app.ntfy import notify_ntfy
 
 
+def _run_kwargs(cfg: dict, shard=None) -> dict:
+    """
+    Map the loaded configuration onto the keyword arguments of run_once
+    (only the tickers of `shard` if given).
+    """
+    return dict(
+        tickers=shard_tickers(cfg["tickers"], shard),
+        threshold_pct=float(cfg["threshold_pct"]),
+        ntfy_server=cfg["ntfy"]["server"],
+        ntfy_topic=cfg["ntfy"]["topic"],
+        state_file=Path(cfg["state_file"]),
+        market_hours_cfg=cfg["market_hours"],
+        test_cfg=cfg["test"],
+        news_cfg=cfg["news"],
+        max_workers=int(cfg["max_workers"]),
+        ntfy_cfg=cfg["ntfy"],
+        thresholds={tk: float(v) for tk, v in (cfg.get("thresholds") or {}).items()},
+        shard=shard,
+        cycle_cfg=cfg["cycle"],
+    )
+
+
 def main():
     """
     Entry point of the Stock Notifier application.
+
+    Usage:
+        python main.py            # one monitoring cycle (cron / GitHub Actions)
+        python main.py --daemon   # keep running, one cycle every daemon.interval_sec
+        python main.py --stream   # live prices over WebSocket, alerts on every tick
+        python main.py --shard 0/4   # only the tickers of shard 0 of 4 (combinable with the modes)
     """
+    parser = argparse.ArgumentParser(description="Stock Notifier")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run cycles in-process on the interval from config.daemon")
+    parser.add_argument("--stream", action="store_true",
+                        help="subscribe to live prices (config.stream) and alert on each tick")
+    parser.add_argument("--shard", type=parse_shard, metavar="i/N",
+                        help="handle only shard i of N (0-based; hash-partitioned tickers, own state segment)")
+    args = parser.parse_args()
+
     # Load configuration from "config.json"
     cfg = load_config("config.json")
+    if args.shard:
+        # Parallele Shards: eigene Log-/Metrik-Dateien statt gemeinsam geschriebener
+        cfg["log"]["file_path"] = str(shard_path(cfg["log"]["file_path"], args.shard))
+        for key in ("prom_file", "summary_file"):
+            cfg["metrics"][key] = str(shard_path(cfg["metrics"][key], args.shard))
 
     print(f"cfg[log]={cfg["log"]}")
     #=> "log": {
@@ -31,6 +81,15 @@ def main():
     print(f"logger={logger}")
     print(logger) # => {'log': {'level': 'DEBUG', 'to_file': False}, 'tickers': ['AAPL']}
 
+    # Shared HTTP client (pooled sessions), reused across all cycles in daemon mode
+    configure_http(cfg["http"])
+    configure_market_data(cfg["market_data"])
+    configure_metrics(cfg["metrics"])
+    if cfg["news"].get("enabled"):
+        configure_feed_cache(cfg["news"].get("cache"))
+        configure_link_cache(cfg["news"].get("link_cache"))
+        configure_company_cache(cfg["company"])
+
     # TODO: Log the loaded configuration, masking secrets with mask_secret
     # Log masked config
     logger.info(
@@ -40,18 +99,20 @@ def main():
         cfg["log"]["level"],
     )
 
+    if args.stream:
+        # Event-getrieben: Alerts innerhalb von ~1 s nach dem Durchbruch statt beim nächsten Poll
+        from src.app.stream import run_stream
+        run_stream(_run_kwargs(cfg, args.shard), cfg["stream"])
+        return
+
+    if args.daemon:
+        # Long-running mode: imports, config and logging are set up only once
+        run_daemon(_run_kwargs(cfg, args.shard), cfg["daemon"])
+        return
+
     # TODO: Run one monitoring cycle via run_once using settings from cfg
     # One monitoring cycle
-    run_once(
-        tickers=cfg["tickers"],
-        threshold_pct=float(cfg["threshold_pct"]),
-        ntfy_server=cfg["ntfy"]["server"],
-        ntfy_topic=cfg["ntfy"]["topic"],
-        state_file=Path(cfg["state_file"]),
-        market_hours_cfg=cfg["market_hours"],
-        test_cfg=cfg["test"],
-        news_cfg=cfg["news"],
-    )
+    run_once(**_run_kwargs(cfg, args.shard))
 
     
     from src.app.config import deep_merge
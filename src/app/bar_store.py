@@ -0,0 +1,182 @@
+#Lokaler Intraday-Bar-Speicher: pro Handelstag ein Ordner, pro Symbol eine
+#Append-only-Datei mit festen NumPy-Records (memory-mapped gelesen).
+#Spätere Zyklen laden nur noch Bars nach dem letzten gespeicherten Zeitstempel.
+
+from __future__ import annotations
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # nur für Typ-Hinweise; numpy wird lazy geladen
+    import numpy as np
+
+logger = logging.getLogger("stock-alerts")
+
+DEFAULT_BAR_STORE_CFG: Dict[str, Any] = {
+    "enabled": False,
+    "path": "bars",             # Root directory (one sub-directory per trading day)
+    "keep_days": 5,             # Older day directories are deleted
+}
+
+# Ein Record = ein Bar; Dateien sind rohe Arrays dieses Typs (little endian)
+BAR_FIELDS = ("ts", "open", "high", "low", "close", "volume")
+SUFFIX = ".bars"
+
+
+def bar_dtype() -> "np.dtype":
+    import numpy as np
+    return np.dtype([("ts", "<i8"), ("open", "<f8"), ("high", "<f8"),
+                     ("low", "<f8"), ("close", "<f8"), ("volume", "<f8")])
+
+
+class BarStore:
+    """
+    Columnar on-disk store for 1-minute bars.
+
+    Layout: <root>/<YYYY-MM-DD>/<SYMBOL>.bars, each file a raw array of
+    bar_dtype() records sorted by ts (Unix seconds). Appends only write the
+    new records; reads are memory-mapped, so asking for the open/last of a
+    day touches two records instead of parsing the whole history.
+
+    Example:
+        >>> store = BarStore("bars")
+        >>> store.append("AAPL", "2025-09-08", rows)   # rows: bar_dtype() array
+        >>> store.open_and_last("AAPL", "2025-09-08")
+        (229.8, 231.2)
+    """
+
+    def __init__(self, root: str | Path, keep_days: int = 5) -> None:
+        self.root = Path(root)
+        self.keep_days = int(keep_days)
+        self._lock = threading.Lock()
+        self._latest_day: Optional[str] = None
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _file(self, symbol: str, day: str) -> Path:
+        return self.root / day / (symbol.replace("/", "_") + SUFFIX)
+
+    def days(self) -> List[str]:
+        """Stored trading days, oldest first."""
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def read(self, symbol: str, day: str) -> "np.ndarray":
+        """Memory-mapped bars of one symbol and day (empty array if none)."""
+        import numpy as np
+
+        dt = bar_dtype()
+        f = self._file(symbol, day)
+        try:
+            n = f.stat().st_size // dt.itemsize  # halb geschriebenen Record am Ende ignorieren
+        except FileNotFoundError:
+            n = 0
+        if n == 0:
+            return np.empty(0, dtype=dt)
+        return np.memmap(f, dtype=dt, mode="r", shape=(n,))
+
+    def last_ts(self, symbol: str, day: str) -> Optional[int]:
+        bars = self.read(symbol, day)
+        return int(bars["ts"][-1]) if len(bars) else None
+
+    def latest(self, symbol: str) -> Tuple[Optional[str], Optional[int]]:
+        """(day, last ts) of the newest stored bar of a symbol, or (None, None)."""
+        for day in reversed(self.days()):
+            ts = self.last_ts(symbol, day)
+            if ts is not None:
+                return day, ts
+        return None, None
+
+    def append(self, symbol: str, day: str, rows: "np.ndarray") -> int:
+        """
+        Append bars newer than the last stored one (older/duplicate rows are dropped).
+
+        Returns:
+            Number of records written.
+        """
+        import numpy as np
+
+        dt = bar_dtype()
+        rows = np.asarray(rows, dtype=dt)
+        last = self.last_ts(symbol, day)
+        if last is not None:
+            rows = rows[rows["ts"] > last]
+        if len(rows) == 0:
+            return 0
+        rows = np.sort(rows, order="ts")
+        f = self._file(symbol, day)
+        with self._lock:
+            new_day = not f.parent.exists()
+            f.parent.mkdir(parents=True, exist_ok=True)
+            with open(f, "ab") as fh:
+                size = fh.tell()
+                if size % dt.itemsize:
+                    fh.truncate(size - size % dt.itemsize)  # Rest eines abgebrochenen Appends
+                fh.write(rows.tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+            if new_day and self._latest_day != day:
+                self._latest_day = day
+                self._prune()
+        return len(rows)
+
+    def open_and_last(self, symbol: str, day: str) -> Optional[Tuple[float, float]]:
+        """First Open and last Close of a stored day, or None."""
+        import numpy as np
+
+        bars = self.read(symbol, day)
+        if not len(bars):
+            return None
+        ok = np.isfinite(bars["open"]) & np.isfinite(bars["close"])
+        idx = np.flatnonzero(ok)
+        if not len(idx):
+            return None
+        return float(bars["open"][idx[0]]), float(bars["close"][idx[-1]])
+
+    def _prune(self) -> None:
+        days = self.days()
+        for old in days[:-self.keep_days] if self.keep_days > 0 else []:
+            shutil.rmtree(self.root / old, ignore_errors=True)
+            logger.debug("Bar store: removed %s", old)
+
+
+def session_day(df) -> str:
+    """Trading day key (YYYY-MM-DD) of a bar frame: date of its first bar in the index timezone."""
+    return str(df.index[0].date())
+
+
+def frame_to_bars(df) -> "np.ndarray":
+    """Convert a yfinance OHLCV DataFrame (DatetimeIndex) into bar_dtype() records."""
+    import numpy as np
+
+    dt = bar_dtype()
+    df = df.dropna(subset=["Open", "Close"])
+    out = np.empty(len(df), dtype=dt)
+    if not len(df):
+        return out
+    idx = df.index
+    out["ts"] = idx.as_unit("s").asi8 if hasattr(idx, "as_unit") else idx.asi8 // 1_000_000_000
+    for col, name in (("Open", "open"), ("High", "high"), ("Low", "low"), ("Close", "close"), ("Volume", "volume")):
+        out[name] = df[col].to_numpy(dtype=np.float64, na_value=np.nan) if col in df else np.nan
+    return out
+
+
+_store: Optional[BarStore] = None
+
+
+def configure_bar_store(cfg: Optional[Dict[str, Any]] = None) -> Optional[BarStore]:
+    """
+    (Re-)create the shared bar store from the "market_data.bar_store" section of config.json.
+
+    Returns None (store disabled) if cfg["enabled"] is false.
+    """
+    global _store
+    c = {**DEFAULT_BAR_STORE_CFG, **(cfg or {})}
+    _store = BarStore(c["path"], keep_days=c["keep_days"]) if c["enabled"] else None
+    return _store
+
+
+def get_bar_store() -> Optional[BarStore]:
+    """Return the shared bar store, or None if not configured."""
+    return _store
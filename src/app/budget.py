@@ -0,0 +1,132 @@
+#Zeitbudget pro Zyklus (cycle.budget_sec): run_once arbeitet die Ticker in Prioritätsreihenfolge
+#batchweise ab und hört vor der Deadline sauber auf (Alerts gesendet, State geschrieben), statt vom
+#Job-Timeout mitten im Zyklus abgeschossen zu werden. Übersprungene Ticker landen als Resume-Cursor
+#in den State-Metadaten und kommen im nächsten Zyklus zuerst dran.
+
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from .state import StateStore
+
+logger = logging.getLogger("stock-alerts")
+
+DEFAULT_CYCLE_CFG: Dict[str, Any] = {
+    "budget_sec": None,   # None = kein Zeitlimit (ein Durchlauf über alle Ticker)
+    "reserve_sec": 15.0,  # für Digest-Flush und State-Schreiben freihalten
+    "batch_size": 100,    # max. Ticker pro Batch (= market_data.chunk_size → keine Extra-Requests)
+    "hot_ratio": 0.5,     # |letztes Δ%| ab diesem Anteil der Schwelle → in jedem Zyklus zuerst
+}
+
+# Schlüssel in StateStore.meta: Ticker, die der letzte Zyklus aus Zeitgründen übersprungen hat,
+# und die zuletzt gemessenen Kosten pro Ticker (Sekunden) für die Größe des ersten Batches
+RESUME_META_KEY = "resume"
+COST_META_KEY = "cost_per_ticker"
+
+# Erster Batch ohne jede Messung: wenige Ticker, um die Kosten zu bestimmen
+PROBE_BATCH = 10
+
+
+def prioritize(tickers: Iterable[str], store: StateStore, threshold_pct: float,
+               thresholds: Optional[Mapping[str, float]] = None, hot_ratio: float = 0.5) -> List[str]:
+    """
+    Order tickers for a budgeted cycle:
+      1. "hot" tickers, biggest previous move first: non-"none" state (their
+         reset must not be missed) or |last_pct| >= hot_ratio × threshold,
+      2. tickers the previous cycle skipped, in cursor order (RESUME_META_KEY;
+         FIFO, so a list longer than one cycle's capacity is covered in turn),
+      3. everything else, biggest previous move first (ties keep list order).
+
+    thresholds are per-ticker overrides with case-insensitive keys (as in evaluate.py).
+    """
+    over = {k.upper(): float(v) for k, v in (thresholds or {}).items()}
+    resume = {tk: i for i, tk in enumerate(store.meta.get(RESUME_META_KEY) or ())}
+
+    def key(item):
+        i, tk = item
+        entry = store.get(tk)
+        try:
+            move = abs(float(entry.get("last_pct") or 0.0))
+        except (TypeError, ValueError):
+            move = 0.0
+        if math.isnan(move):
+            move = 0.0
+        limit = over.get(tk.upper(), float(threshold_pct))
+        if entry.get("direction", "none") != "none" or move >= hot_ratio * limit:
+            return (0, -move, i)
+        if tk in resume:
+            return (1, resume[tk], i)
+        return (2, -move, i)
+
+    return [tk for _, tk in sorted(enumerate(tickers), key=key)]
+
+
+class CycleBudget:
+    """
+    Deadline of one cycle and the size of the next batch.
+
+    The deadline is budget_sec - reserve_sec after construction. Batches are
+    sized so that they are expected to finish before it: size = remaining
+    time / cost per ticker, capped by batch_size. The cost per ticker is the
+    highest one measured in this cycle, or - before the first batch - the
+    one saved by the previous cycle (COST_META_KEY). With no measurement at
+    all, the first batch is a probe of PROBE_BATCH tickers.
+
+    What holds: no batch starts after the deadline, and every batch fits
+    before it at the highest per-ticker cost seen so far. A batch can still
+    overrun by its misestimate (a slower quote fetch than ever measured,
+    bounded by the HTTP timeouts); run_once sends alerts past the deadline
+    without news, so the enrichment does not add to it. Without budget_sec
+    a single batch holds all tickers.
+
+    Example:
+        >>> budget = CycleBudget(300, reserve_sec=15)
+        >>> budget.size(100)           # nothing measured yet → probe
+        10
+        >>> budget.record(10, 3.0)     # 0.3 s per ticker
+        >>> budget.size(100)           # 285 s left → at most 100
+        100
+    """
+
+    def __init__(self, budget_sec: Optional[float], reserve_sec: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.deadline = None if budget_sec is None else clock() + float(budget_sec) - float(reserve_sec or 0.0)
+        self.per_ticker: Optional[float] = None  # Schätzung für den nächsten Batch
+        self.measured: Optional[float] = None    # höchste in diesem Zyklus gemessene Kosten
+
+    @property
+    def enabled(self) -> bool:
+        return self.deadline is not None
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline (inf without budget)."""
+        return math.inf if self.deadline is None else self.deadline - self._clock()
+
+    def seed(self, per_ticker: Any) -> None:
+        """Start from the cost per ticker of a previous cycle (ignored if invalid)."""
+        try:
+            cost = float(per_ticker)
+        except (TypeError, ValueError):
+            return
+        if cost > 0 and not math.isnan(cost) and self.measured is None:
+            self.per_ticker = cost
+
+    def size(self, n_max: int) -> int:
+        """Number of tickers (0..n_max) the next batch may take to finish before the deadline."""
+        if self.deadline is None:
+            return n_max
+        left = self.remaining()
+        if left <= 0:
+            return 0
+        if self.per_ticker is None:
+            return min(n_max, PROBE_BATCH)
+        return min(n_max, int(left / self.per_ticker))
+
+    def record(self, n_tickers: int, seconds: float) -> None:
+        """Account for a finished batch (updates the per-ticker cost estimate)."""
+        if n_tickers > 0:
+            cost = seconds / n_tickers
+            self.measured = cost if self.measured is None else max(self.measured, cost)
+            self.per_ticker = self.measured
@@ -0,0 +1,267 @@
+#Persistente Caches (SQLite) für wiederholte Netzwerk-Abrufe:
+#  - FeedCache: Google-News-RSS-Antworten mit TTL, ETag/Last-Modified und LRU-Eviction
+#  - LinkCache: aufgelöste Google-News-Redirects (Artikel-ID → Original-URL)
+
+from __future__ import annotations
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger("stock-alerts")
+
+DEFAULT_FEED_CACHE_CFG: Dict[str, Any] = {
+    "enabled": True,
+    "path": "news_cache.sqlite",    # SQLite file (created on first use)
+    "ttl_sec": 600,                 # Serve locally without any request while fresh
+    "max_bytes": 20_000_000,        # Size cap; least recently used feeds are evicted
+}
+
+DEFAULT_LINK_CACHE_CFG: Dict[str, Any] = {
+    "enabled": True,
+    "path": "news_cache.sqlite",    # May share the file with the feed cache
+    "max_entries": 50_000,          # Least recently used links are evicted beyond this
+}
+
+
+@dataclass
+class CachedFeed:
+    """
+    A cached HTTP response body plus its validators.
+
+    Attributes:
+        body (bytes): Raw response body (RSS XML).
+        etag (Optional[str]): ETag header for If-None-Match.
+        last_modified (Optional[str]): Last-Modified header for If-Modified-Since.
+        fetched_at (float): Unix time of the last successful (re)validation.
+    """
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl_sec: float, now: Optional[float] = None) -> bool:
+        return ((now or time.time()) - self.fetched_at) < ttl_sec
+
+
+class FeedCache:
+    """
+    On-disk feed cache keyed by the full feed URL (query + lang + country).
+
+    Thread-safe: one SQLite connection guarded by a lock, so worker threads
+    of run_once can share it.
+    """
+
+    def __init__(self, path: str | Path, ttl_sec: float = 600, max_bytes: int = 20_000_000) -> None:
+        self.path = Path(path)
+        self.ttl_sec = float(ttl_sec)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS feeds (
+                   url TEXT PRIMARY KEY,
+                   body BLOB NOT NULL,
+                   etag TEXT,
+                   last_modified TEXT,
+                   fetched_at REAL NOT NULL,
+                   accessed_at REAL NOT NULL,
+                   size INTEGER NOT NULL
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS feeds_lru ON feeds(accessed_at)")
+
+    def get(self, url: str) -> Optional[CachedFeed]:
+        """Return the cached entry for `url` (fresh or stale) and mark it as recently used."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM feeds WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE feeds SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        return CachedFeed(body=row[0], etag=row[1], last_modified=row[2], fetched_at=row[3])
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a freshly downloaded body and evict LRU entries beyond max_bytes."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO feeds (url, body, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, len(body)),
+            )
+            self._evict()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as revalidated (HTTP 304): restart its TTL."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE feeds SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM feeds").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for url, size in self._db.execute("SELECT url, size FROM feeds ORDER BY accessed_at ASC"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((url,))
+            freed += size
+        self._db.executemany("DELETE FROM feeds WHERE url = ?", victims)
+        logger.debug("Feed cache: evicted %d entr(y/ies), %d bytes", len(victims), freed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def article_id(link: str) -> str:
+    """
+    Stable cache key for a Google News link.
+
+    "https://news.google.com/rss/articles/CBMi...?oc=5" -> "CBMi..."
+    Other links are returned unchanged (the full URL is the key).
+    """
+    p = urlparse(link)
+    parts = [x for x in p.path.split("/") if x]
+    if "articles" in parts:
+        i = parts.index("articles")
+        if i + 1 < len(parts):
+            return parts[i + 1]
+    return link
+
+
+class LinkCache:
+    """
+    Persistent map from Google News article ID to the resolved original URL.
+
+    Article IDs are stable, so a link only has to be resolved over the
+    network once; eviction is LRU by entry count.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 50_000) -> None:
+        self.path = Path(path)
+        self.max_entries = int(max_entries)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS links (
+                   article_id TEXT PRIMARY KEY,
+                   url TEXT NOT NULL,
+                   resolved_at REAL NOT NULL,
+                   accessed_at REAL NOT NULL
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS links_lru ON links(accessed_at)")
+
+    def get(self, link: str) -> Optional[str]:
+        key = article_id(link)
+        with self._lock:
+            row = self._db.execute("SELECT url FROM links WHERE article_id = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE links SET accessed_at = ? WHERE article_id = ?", (time.time(), key))
+        return row[0]
+
+    def get_many(self, links: Iterable[str]) -> Dict[str, str]:
+        """Return {link: url} for all cached links (one query for the whole batch)."""
+        keys = {article_id(l): l for l in links}
+        if not keys:
+            return {}
+        out: Dict[str, str] = {}
+        with self._lock:
+            marks = ",".join("?" * len(keys))
+            for key, url in self._db.execute(
+                f"SELECT article_id, url FROM links WHERE article_id IN ({marks})", list(keys)
+            ):
+                out[keys[key]] = url
+            if out:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE links SET accessed_at = ? WHERE article_id = ?",
+                    [(now, article_id(l)) for l in out],
+                )
+        return out
+
+    def put(self, link: str, url: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO links (article_id, url, resolved_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (article_id(link), url, now, now),
+            )
+            count = self._db.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+            if count > self.max_entries:
+                self._db.execute(
+                    "DELETE FROM links WHERE article_id IN "
+                    "(SELECT article_id FROM links ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_feed_cache: Optional[FeedCache] = None
+_feed_cache_lock = threading.Lock()
+_link_cache: Optional[LinkCache] = None
+
+
+def configure_feed_cache(cfg: Optional[Dict[str, Any]] = None) -> Optional[FeedCache]:
+    """
+    (Re-)create the shared feed cache from the "news.cache" section of config.json.
+
+    Returns None (and disables caching) if cfg["enabled"] is false.
+    """
+    global _feed_cache
+    c = {**DEFAULT_FEED_CACHE_CFG, **(cfg or {})}
+    with _feed_cache_lock:
+        if _feed_cache is not None:
+            _feed_cache.close()
+            _feed_cache = None
+        if c["enabled"]:
+            try:
+                _feed_cache = FeedCache(c["path"], ttl_sec=c["ttl_sec"], max_bytes=c["max_bytes"])
+            except sqlite3.Error as e:
+                logger.warning("Feed cache disabled (%s): %s", c["path"], e)
+        return _feed_cache
+
+
+def get_feed_cache() -> Optional[FeedCache]:
+    """Return the shared feed cache, or None if caching is not configured."""
+    return _feed_cache
+
+
+def configure_link_cache(cfg: Optional[Dict[str, Any]] = None) -> Optional[LinkCache]:
+    """
+    (Re-)create the shared link cache from the "news.link_cache" section of config.json.
+
+    Returns None (and disables caching) if cfg["enabled"] is false.
+    """
+    global _link_cache
+    c = {**DEFAULT_LINK_CACHE_CFG, **(cfg or {})}
+    with _feed_cache_lock:
+        if _link_cache is not None:
+            _link_cache.close()
+            _link_cache = None
+        if c["enabled"]:
+            try:
+                _link_cache = LinkCache(c["path"], max_entries=c["max_entries"])
+            except sqlite3.Error as e:
+                logger.warning("Link cache disabled (%s): %s", c["path"], e)
+        return _link_cache
+
+
+def get_link_cache() -> Optional[LinkCache]:
+    """Return the shared link cache, or None if caching is not configured."""
+    return _link_cache
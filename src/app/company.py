@@ -1,16 +1,29 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Iterable, Tuple, List
 import json
+import logging
+import threading
 import time
-import yfinance as yf
 from dataclasses import asdict
 
+from .utils import atomic_write_json
+
+logger = logging.getLogger("stock-alerts")
+
 # TODO Create with 'Path' class the 'CACHE_FILE' object which stores location to 'company_cache.json'
 # CACHE_FILE =
 CACHE_FILE: Path = Path(__file__).resolve().parent / "company_cache.json"
 
+# Firmennamen ändern sich selten → lange TTL; Fallback-Einträge (kein Name gefunden) früher erneut versuchen
+DEFAULT_COMPANY_CACHE_CFG: Dict[str, Any] = {
+    "ttl_sec": 30 * 86400,          # Refresh names older than this
+    "fallback_ttl_sec": 86400,      # Retry symbols without a Yahoo name after this
+    "max_workers": 8,               # Concurrent Yahoo lookups in get_company_meta_many
+}
+
 # TODO # Common legal suffixes often found in company names (ADD MORE),
 # which we remove to get a cleaner keyword (e.g., "Apple Inc." -> "Apple"). 
 # Häufige Rechtsformen/Suffixe (kannst du bei Bedarf erweitern)
@@ -58,9 +71,97 @@ def _load_cache() -> Dict[str, Any]:
         return {}
 
 def _save_cache(cache: Dict[str, Any]) -> None:
-    """Save company metadata to local cache file."""
-    # TODO What parameters are missing?
-    CACHE_FILE.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
+    """Save company metadata to local cache file (atomically, compact JSON)."""
+    atomic_write_json(CACHE_FILE, cache)
+
+
+class CompanyCache:
+    """
+    In-memory view of company_cache.json.
+
+    The file is parsed once per process (on first use); lookups and inserts
+    only touch the dict. flush() writes all changes back in one atomic write,
+    so a cycle with hundreds of lookups costs one parse and at most one write.
+
+    Entries carry a "fetched_at" timestamp; entries older than ttl_sec
+    (fallback_ttl_sec for symbols without a Yahoo name) count as stale and
+    are refreshed on the next lookup.
+    """
+
+    def __init__(self, ttl_sec: float = 30 * 86400, fallback_ttl_sec: float = 86400) -> None:
+        self.ttl_sec = float(ttl_sec)
+        self.fallback_ttl_sec = float(fallback_ttl_sec)
+        self._data: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _entries(self) -> Dict[str, Any]:
+        # Aufruf nur mit gehaltenem Lock
+        if self._data is None:
+            self._data = _load_cache()
+            # Alte Einträge ohne Zeitstempel gelten ab jetzt (kein Refresh-Sturm nach dem Update)
+            now = time.time()
+            for entry in self._data.values():
+                if isinstance(entry, dict) and "fetched_at" not in entry and entry.get("source") != "fallback":
+                    entry["fetched_at"] = now
+        return self._data
+
+    def is_fresh(self, entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        ttl = self.fallback_ttl_sec if entry.get("source") == "fallback" else self.ttl_sec
+        return ((now or time.time()) - float(entry.get("fetched_at") or 0)) < ttl
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for `symbol` (fresh or stale), or None."""
+        with self._lock:
+            entry = self._entries().get(symbol)
+            return dict(entry) if isinstance(entry, dict) else None
+
+    def put(self, symbol: str, entry: Dict[str, Any]) -> None:
+        """Insert/replace an entry in memory; written on the next flush()."""
+        with self._lock:
+            self._entries()[symbol] = dict(entry)
+            self._dirty = True
+
+    def flush(self) -> bool:
+        """
+        Write pending changes to company_cache.json (one atomic write).
+
+        Returns:
+            True if the file was written, False if nothing changed or writing failed.
+        """
+        with self._lock:
+            if not self._dirty or self._data is None:
+                return False
+            try:
+                _save_cache(self._data)
+            except Exception as e:
+                logger.warning("Failed to save company cache %s: %s", CACHE_FILE, e)
+                return False
+            self._dirty = False
+            return True
+
+
+_cache = CompanyCache()
+_max_workers = int(DEFAULT_COMPANY_CACHE_CFG["max_workers"])
+
+
+def configure_company_cache(cfg: Optional[Dict[str, Any]] = None) -> CompanyCache:
+    """
+    (Re-)create the shared metadata cache from the "company" section of config.json.
+
+    Pending changes of the previous cache are flushed first.
+    """
+    global _cache, _max_workers
+    c = {**DEFAULT_COMPANY_CACHE_CFG, **(cfg or {})}
+    _cache.flush()
+    _cache = CompanyCache(ttl_sec=c["ttl_sec"], fallback_ttl_sec=c["fallback_ttl_sec"])
+    _max_workers = max(1, int(c["max_workers"]))
+    return _cache
+
+
+def flush_company_cache() -> bool:
+    """Write pending metadata changes to disk (call once at the end of a cycle)."""
+    return _cache.flush()
 
 
 # TODO Finish the function logic    
@@ -113,6 +214,8 @@ def _fetch_yf_info(symbol: str, retries: int = 2, delay: float = 0.4) -> Dict[st
     Returns:
         dict: Yahoo Finance info dictionary (may be empty if lookup fails).
     """
+    import yfinance as yf  # lazy: yfinance/pandas erst beim ersten Abruf laden
+
     last_exc: Optional[Exception] = None
     for _ in range(retries + 1):
         try:
@@ -128,25 +231,18 @@ def _fetch_yf_info(symbol: str, retries: int = 2, delay: float = 0.4) -> Dict[st
     return {}
 
 
-def get_company_meta(symbol: str) -> CompanyMeta:
-    """
-    Retrieve company metadata (name, base ticker, etc.) with caching and fallbacks.
-    """
-    # TODO: Load the cache with _load_cache() and return early if the symbol exists
-    cache = _load_cache()
-    if symbol in cache:
-        c = cache[symbol]
-        return CompanyMeta(
-            ticker=c["ticker"],
-            name=c.get("name"),
-            raw_name=c.get("raw_name"),
-            source=c.get("source", "cache"),
-            base_ticker=c.get("base_ticker", _base_ticker(symbol)),
-        )
-
-    # TODO: Fetch raw company information via _fetch_yf_info
-    info = _fetch_yf_info(symbol)
+def _meta_from_entry(symbol: str, c: Dict[str, Any]) -> CompanyMeta:
+    return CompanyMeta(
+        ticker=c.get("ticker", symbol),
+        name=c.get("name"),
+        raw_name=c.get("raw_name"),
+        source=c.get("source", "cache"),
+        base_ticker=c.get("base_ticker", _base_ticker(symbol)),
+    )
 
+
+def _build_meta(symbol: str, info: Dict[str, Any]) -> CompanyMeta:
+    """Turn a Yahoo info dict into CompanyMeta (with base-ticker fallback)."""
     # TODO: Extract a potential company name from info ("longName", "shortName", "displayName")
     raw_name: Optional[str] = None
     source = "fallback"
@@ -161,8 +257,7 @@ def get_company_meta(symbol: str) -> CompanyMeta:
     if not cleaned:
         cleaned = _base_ticker(symbol)
 
-    # TODO: Create a CompanyMeta instance and cache the result using _save_cache
-    meta = CompanyMeta(
+    return CompanyMeta(
         ticker=symbol,
         name=cleaned,
         raw_name=raw_name,
@@ -170,14 +265,62 @@ def get_company_meta(symbol: str) -> CompanyMeta:
         base_ticker=_base_ticker(symbol),
     )
 
-    # TODO: Save the constructed metadata back into the cache
-    # In Cache speichern
-    cache[symbol] = asdict(meta)
-    _save_cache(cache)
 
+def _refresh(symbol: str, stale: Optional[Dict[str, Any]]) -> CompanyMeta:
+    """Fetch metadata for one symbol and store it in the in-memory cache."""
+    meta = _build_meta(symbol, _fetch_yf_info(symbol))
+    if meta.source == "fallback" and stale and stale.get("source") != "fallback":
+        # Yahoo gerade nicht erreichbar: alten Namen behalten statt durch den Ticker ersetzen
+        meta = _meta_from_entry(symbol, stale)
+    _cache.put(symbol, {**asdict(meta), "fetched_at": time.time()})
     return meta
 
-    
+
+def get_company_meta(symbol: str) -> CompanyMeta:
+    """
+    Retrieve company metadata (name, base ticker, etc.) with caching and fallbacks.
+
+    Fresh cache entries are served from memory; misses and stale entries are
+    fetched from Yahoo. Changes are written by flush_company_cache().
+    """
+    c = _cache.get(symbol)
+    if c is not None and _cache.is_fresh(c):
+        return _meta_from_entry(symbol, c)
+    return _refresh(symbol, c)
+
+
+def get_company_meta_many(symbols: Iterable[str]) -> Dict[str, CompanyMeta]:
+    """
+    Retrieve metadata for many symbols; only misses/stale entries hit Yahoo.
+
+    The remaining lookups run concurrently (max_workers from the "company"
+    config section).
+
+    Args:
+        symbols: Ticker symbols.
+
+    Returns:
+        Mapping {symbol: CompanyMeta} for all requested symbols.
+    """
+    out: Dict[str, CompanyMeta] = {}
+    todo: Dict[str, Optional[Dict[str, Any]]] = {}
+    now = time.time()
+    for sym in dict.fromkeys(symbols):
+        c = _cache.get(sym)
+        if c is not None and _cache.is_fresh(c, now):
+            out[sym] = _meta_from_entry(sym, c)
+        else:
+            todo[sym] = c
+
+    if len(todo) == 1 or (todo and _max_workers == 1):
+        for sym, stale in todo.items():
+            out[sym] = _refresh(sym, stale)
+    elif todo:
+        logger.debug("Company metadata: %d cached, fetching %d", len(out), len(todo))
+        with ThreadPoolExecutor(max_workers=min(_max_workers, len(todo)), thread_name_prefix="company") as pool:
+            for sym, meta in zip(todo, pool.map(lambda kv: _refresh(*kv), todo.items())):
+                out[sym] = meta
+    return out
 
 
 def auto_keywords(symbol: str) -> Tuple[str, list[str]]:
@@ -206,29 +349,24 @@ def auto_keywords(symbol: str) -> Tuple[str, list[str]]:
     # TODO: Return the cleaned name and the list of required keywords
     return display, req
 
-    ###########  Mini-Test (im REPL oder in einem kleinen Script)#######
-
-
-#from src.app.company import get_company_meta, auto_keywords
-
-print(f"AAPL={get_company_meta("AAPL")}")
-print(f"SAP.DE={auto_keywords("SAP.DE")}")
 
 
+###########  Mini-Test (im REPL oder in einem kleinen Script)#######
+if __name__ == "__main__":
+    print(f"AAPL={get_company_meta('AAPL')}")
+    print(f"SAP.DE={auto_keywords('SAP.DE')}")
+    print(f"many={get_company_meta_many(['AAPL', 'SAP.DE', 'O'])}")
+    flush_company_cache()
 
+    meta = CompanyMeta(
+        ticker="AAPL",
+        name="Apple",
+        raw_name="Apple Inc.",
+        source="info.longName",
+        base_ticker="AAPL",
+    )
+    print(f"meta={meta}")
+    # CompanyMeta(ticker='AAPL', name='Apple', raw_name='Apple Inc.', source='info.longName', base_ticker='AAPL')
 
-meta = CompanyMeta(
-    ticker="AAPL",
-    name="Apple",
-    raw_name="Apple Inc.",
-    source="info.longName",
-    base_ticker="AAPL",
-)
-
-
-print(f"meta={meta}")
-# CompanyMeta(ticker='AAPL', name='Apple', raw_name='Apple Inc.', source='info.longName', base_ticker='AAPL')
-
-
-print(f"asdict-meta={asdict(meta)}")
-# {'ticker': 'AAPL', 'name': 'Apple', 'raw_name': 'Apple Inc.', 'source': 'info.longName', 'base_
\ No newline at end of file
+    print(f"asdict-meta={asdict(meta)}")
+    # {'ticker': 'AAPL', 'name': 'Apple', 'raw_name': 'Apple Inc.', 'source': 'info.longName', 'base_ticker': 'AAPL'}
@@ -16,17 +16,107 @@ DEFAULTS: Dict[str, Any] = {
     },
     "ntfy": {
         "server": "https://ntfy.sh",   # Default ntfy server
-        "topic": "CHANGE-ME"           # Must be set in config.json or .env
+        "topic": "CHANGE-ME",          # Must be set in config.json or .env
+        "parallelism": 4,              # Concurrent POSTs when flushing a cycle's alerts
+        "rate_per_sec": 0.2,           # Token-bucket refill (ntfy.sh: 1 request / 5 s)
+        "burst": 60,                   # Token-bucket size (ntfy.sh: burst of 60)
+        "digest_threshold": 5          # More alerts per cycle → one digest message (0 = off)
     },
     "tickers": ["AAPL"],               # Default ticker(s) to monitor
     "threshold_pct": 3.0,              # Default % threshold for alerts
+    "thresholds": {},                  # Per-ticker overrides, e.g. {"TSLA": 5.0}
+    "max_workers": 1,                  # Parallel ticker workers in run_once (1 = sequential)
     "state_file": "alert_state.json",  # File to persist alert state (anti-spam)
+    "cycle": {                         # Time budget of one run_once cycle, see src/app/budget.py
+        "budget_sec": None,            # Stop cleanly after N seconds (None = no limit); skipped tickers go first next cycle
+        "reserve_sec": 15,             # Kept free for digest flush and state write
+        "batch_size": 100,             # Max. tickers per batch (batches are sized to the remaining time)
+        "hot_ratio": 0.5               # Previous |Δ%| >= this share of the threshold → checked first every cycle
+    },
+    "http": {                          # Shared HTTP client (pooled keep-alive sessions per host)
+        "timeout_sec": 10,             # Default timeout per request
+        "retries": 2,                  # Retries for GET/HEAD on connection errors, 429 and 5xx
+        "backoff_sec": 0.3,            # Exponential backoff factor between retries
+        "pool_maxsize": 10,            # Keep-alive connections per host
+        "hosts": {                     # Per-host overrides
+            "ntfy.sh": {"timeout_sec": 20},
+            "news.google.com": {"timeout_sec": 5}
+        }
+    },
+    "market_data": {                   # Quote source for run_once (see src/app/market_data.py)
+        "provider": "yfinance",        # "yfinance" (live) | "record" (live + cassette) | "replay" (offline)
+        "cassette": "market_cassette.jsonl",  # Recording target / replay source
+        "chunk_size": 100,             # Max. symbols per Yahoo request
+        "replay_loop": True,           # Replay: start over after the last recorded cycle
+        "bar_store": {                 # Local 1m bar store (yfinance/record): later cycles fetch only new bars
+            "enabled": False,
+            "path": "bars",            # One sub-directory per trading day, one file per symbol
+            "keep_days": 5             # Older day directories are deleted
+        }
+    },
     "market_hours": {                  # Market hours configuration
         "enabled": True,
         "tz": "Europe/Berlin",         # Default timezone
         "start_hour": 8,
         "end_hour": 22,
-        "days_mon_to_fri_only": True   # Only Monday–Friday
+        "days_mon_to_fri_only": True,  # Only Monday–Friday
+        "exchanges": True,             # Per-venue sessions + holidays by ticker suffix (see src/app/market_calendar.py);
+                                       # the window above then only applies to tickers with an unknown venue
+        "grace_min": 5,                # Keep polling a venue N minutes after its close (closing print)
+        "exchange_overrides": {}       # {ticker: exchange code}, e.g. {"^GDAXI": "XETRA"}
+    },
+    "daemon": {                        # Long-running mode (python main.py --daemon)
+        "interval_sec": 60,            # Pause between cycle starts
+        "jitter_sec": 5,               # Random extra delay per tick (0..jitter_sec)
+        "scheduler": {                 # Adaptive per-ticker polling, see src/app/scheduler.py
+            "enabled": False,
+            "min_interval_sec": 60,    # Tickers close to a threshold crossing
+            "max_interval_sec": 1800,  # Quiet tickers
+            "budget_per_min": 120,     # Max. ticker quotes per minute (all tickers together)
+            "sigmas": 3.0,             # Poll before a move of this many σ could reach the threshold
+            "vol_halflife_sec": 900,   # Half-life of the volatility estimate (EWMA)
+            "vol_floor_pct_per_min": 0.02  # Minimum assumed volatility (%-points per √minute)
+        }
+    },
+    "stream": {                        # Streaming mode (python main.py --stream), see src/app/stream.py
+        "url": "wss://streamer.finance.yahoo.com/?version=2",
+        "heartbeat_sec": 15,           # Re-send the subscription every N seconds
+        "reconnect_min_sec": 1,        # First reconnect delay (doubles per failed attempt)
+        "reconnect_max_sec": 60,       # Upper bound for the reconnect delay
+        "open_timeout_sec": 10         # WebSocket handshake timeout
+    },
+    "company": {                       # Company name cache (company_cache.json) for news queries
+        "ttl_sec": 2_592_000,          # Refresh cached names after 30 days
+        "fallback_ttl_sec": 86_400,    # Retry symbols without a Yahoo name after 1 day
+        "max_workers": 8               # Concurrent Yahoo lookups for cache misses
+    },
+    "news": {                          # News headlines attached to alerts
+        "enabled": False,
+        "cache": {                     # On-disk Google News feed cache (SQLite)
+            "enabled": True,
+            "path": "news_cache.sqlite",
+            "ttl_sec": 600,            # Serve repeated queries locally for 10 minutes
+            "max_bytes": 20_000_000    # LRU eviction above this size
+        },
+        "link_cache": {                # Resolved Google News redirects (article ID → URL)
+            "enabled": True,
+            "path": "news_cache.sqlite",
+            "max_entries": 50_000      # LRU eviction above this count
+        },
+        "followup": {                  # Send the price alert at once, news as a follow-up message
+            "enabled": False,
+            "deadline_sec": 20         # Drop the follow-up if the news are not ready by then
+        },
+        "group": {                     # One OR-combined RSS query for several alerting tickers
+            "enabled": False,
+            "max_size": 8,             # Companies per query
+            "max_url_len": 1800        # Upper bound for the RSS URL length
+        }
+    },
+    "metrics": {                       # Per-stage timings + HTTP counters per cycle (see src/app/metrics.py)
+        "enabled": False,
+        "prom_file": "metrics/stock_alerts.prom",  # Prometheus textfile (node_exporter textfile collector)
+        "summary_file": "metrics/last_run.json"    # JSON summary incl. per-ticker timings
     },
     "test": {                          # Test mode settings
         "enabled": False,
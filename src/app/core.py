@@ -5,18 +5,28 @@
 #                State speichern.
 
 import datetime as dt
+import time
+from dataclasses import dataclass, replace
 from zoneinfo import ZoneInfo
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
-import requests
 
-from .market import get_open_and_last
-from .ntfy import notify_ntfy
-from .state import load_state, save_state
-from .company import auto_keywords
-from .news import fetch_headlines, build_query, filter_titles
+from .cache import get_link_cache
+from .http_client import get_http
+from .market_calendar import open_tickers
+from .market_data import get_market_data
+from .metrics import get_metrics
+from .evaluate import TickerEval, evaluate_watchlist
+from .dispatch import Alert, NtfyDispatcher
+from .pipeline import run_pipeline
+from .shard import ShardStateStore, shard_tickers
+from .budget import COST_META_KEY, DEFAULT_CYCLE_CFG, RESUME_META_KEY, CycleBudget, prioritize
+from .company import auto_keywords, flush_company_cache, get_company_meta_many
+from .news import fetch_headlines, fetch_headlines_grouped, build_query, filter_titles
+from .matcher import KeywordMatcher
 
 from .utils import mask_secret
 
@@ -56,8 +66,10 @@ def _extract_original_url(link: str, *, resolve_redirects: bool = True, timeout:
 
     Strategy:
         1) If it's a news.google.com link and contains ?url=..., use that.
-        2) Optionally resolve redirects via HEAD (fallback GET) to obtain the final URL.
-        3) If all fails, return the input link.
+        2) Look up the article ID in the link cache (see cache.LinkCache).
+        3) Optionally resolve redirects via HEAD (fallback GET) to obtain the final URL
+           and store it in the link cache.
+        4) If all fails, return the input link.
 
     Args:
         link: Possibly a Google News RSS link.
@@ -75,23 +87,71 @@ def _extract_original_url(link: str, *, resolve_redirects: bool = True, timeout:
             if "url" in qs and qs["url"]:
                 return _ensure_https(qs["url"][0])
 
+            cache = get_link_cache()
+            if cache is not None:
+                hit = cache.get(link)
+                if hit:
+                    return hit
+
             if resolve_redirects:
+                import requests  # lazy: requests/urllib3 erst bei Bedarf laden
+
+                final = None
+                t0 = time.perf_counter()
                 try:
                     # HEAD first (cheap), some hosts require GET
-                    r = requests.head(link, allow_redirects=True, timeout=timeout)
+                    r = get_http().head(link, allow_redirects=True, timeout=timeout)
                     if r.url and r.url != link:
-                        return _ensure_https(r.url)
-                    if r.status_code in (403, 405):
-                        g = requests.get(link, allow_redirects=True, timeout=timeout, stream=True)
-                        if g.url and g.url != link:
-                            return _ensure_https(g.url)
+                        final = _ensure_https(r.url)
+                    elif r.status_code in (403, 405):
+                        with get_http().get(link, allow_redirects=True, timeout=timeout, stream=True) as g:
+                            if g.url and g.url != link:
+                                final = _ensure_https(g.url)
                 except requests.RequestException:
                     pass
+                get_metrics().observe("extract_original_url", time.perf_counter() - t0)
+                if final:
+                    # Nur erfolgreiche Auflösungen cachen; Fehlschläge beim nächsten Mal erneut versuchen
+                    if cache is not None:
+                        cache.put(link, final)
+                    return final
         return link
     except Exception:
         return link
 
 
+def resolve_links(links: List[str], *, max_workers: int = 8) -> Dict[str, str]:
+    """
+    Resolve many news links at once.
+
+    Cached links are answered with one batch lookup; only the remaining
+    Google News links are resolved over the network, concurrently.
+
+    Args:
+        links: Raw item links (duplicates allowed).
+        max_workers: Max. concurrent HEAD/GET requests.
+
+    Returns:
+        Mapping {link (as given): original URL}.
+    """
+    wanted = list(dict.fromkeys(l for l in links if l))
+    if not wanted:
+        return {}
+    norm = {l: _ensure_https(l) for l in wanted}
+
+    cache = get_link_cache()
+    hits = cache.get_many(norm.values()) if cache is not None else {}
+    out: Dict[str, str] = {l: hits[n] for l, n in norm.items() if n in hits}
+
+    todo = [l for l in wanted if l not in out]
+    if len(todo) == 1 or max_workers <= 1:
+        out.update((l, _extract_original_url(norm[l])) for l in todo)
+    elif todo:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(todo)), thread_name_prefix="links") as pool:
+            out.update(zip(todo, pool.map(lambda l: _extract_original_url(norm[l]), todo)))
+    return out
+
+
 def _domain(url: str) -> str:
     """
     Extract a pretty domain (strip leading 'www.') from a URL for compact display.
@@ -103,7 +163,7 @@ def _domain(url: str) -> str:
         return url
 
 
-def _format_headlines(items: List[Dict[str, Any]]) -> str:
+def _format_headlines(items: List[Dict[str, Any]], resolved: Optional[Dict[str, str]] = None) -> str:
     """
     Build a compact Markdown block for headlines.
 
@@ -111,6 +171,11 @@ def _format_headlines(items: List[Dict[str, Any]]) -> str:
     - Mobile (ntfy apps): Markdown shows as plain text, so we also include
       a short, real URL line that remains clickable on phones.
 
+    Args:
+        items: Headline dicts (title, link, source).
+        resolved: Optional {link: original URL} from resolve_links(); links
+                  found there are not resolved again.
+
     Returns:
         A multi-line string ready to embed into the notification body.
     """
@@ -120,9 +185,10 @@ def _format_headlines(items: List[Dict[str, Any]]) -> str:
     for it in items:
         title = (it.get("title") or "").strip()
         src   = f" — {it['source']}" if it.get("source") else ""
-        link  = _ensure_https((it.get("link") or "").strip())
+        raw   = (it.get("link") or "").strip()
+        link  = _ensure_https(raw)
         if link:
-            orig = _extract_original_url(link)
+            orig = (resolved or {}).get(raw) or _extract_original_url(link)
             dom  = _domain(orig)
             # Markdown title link for web, plus a short real URL for mobile
             lines.append(f"• [{title}]({orig}){src}\n   🔗 {orig if len(orig) <= 60 else 'https://' + dom}")
@@ -163,6 +229,309 @@ def is_market_hours(cfg_mh: dict) -> bool:
     return int(cfg_mh["start_hour"]) <= n.hour < int(cfg_mh["end_hour"])
 
 
+def active_tickers(tickers: List[str], cfg_mh: dict) -> List[str]:
+    """
+    Tickers to poll right now.
+
+    With market_hours.exchanges (default) every ticker is checked against the
+    calendar of its venue (see market_calendar.py: sessions + holidays);
+    tickers with an unknown venue fall back to the global window
+    (is_market_hours). Without it, the global window applies to all.
+
+    Returns:
+        Subset of `tickers` in their original order (empty = nothing open).
+    """
+    if not cfg_mh.get("enabled", True):
+        return list(tickers)
+    if not cfg_mh.get("exchanges", True):
+        return list(tickers) if is_market_hours(cfg_mh) else []
+    return open_tickers(
+        tickers,
+        overrides=cfg_mh.get("exchange_overrides"),
+        grace_min=float(cfg_mh.get("grace_min", 0)),
+        unknown_open=lambda: is_market_hours(cfg_mh),
+    )
+
+
+@dataclass
+class TickerResult:
+    """
+    Outcome of one ticker evaluation.
+
+    Attributes:
+        new_state (Optional[str]): New alert state if it changes, else None.
+        last_price (Optional[float]): Latest price (None if no data).
+        pct (Optional[float]): Δ% vs. open (None if no data).
+        alerted (bool): True if an alert was queued.
+    """
+    new_state: Optional[str] = None
+    last_price: Optional[float] = None
+    pct: Optional[float] = None
+    alerted: bool = False
+
+
+class _TickerLog:
+    """
+    Per-ticker log buffer.
+
+    Worker threads record their messages here; run_once replays them in
+    ticker order so the log reads the same as in a sequential run.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[Tuple[int, str, tuple]] = []
+
+    def info(self, msg: str, *args: Any) -> None:
+        self.records.append((logging.INFO, msg, args))
+
+    def error(self, msg: str, *args: Any) -> None:
+        self.records.append((logging.ERROR, msg, args))
+
+    def flush(self) -> None:
+        for level, msg, args in self.records:
+            logger.log(level, msg, *args)
+        self.records.clear()
+
+
+def _forced_pct(test_cfg: dict) -> Optional[float]:
+    """Test override test.force_delta_pct (only if test mode is enabled)."""
+    if test_cfg.get("enabled") and test_cfg.get("force_delta_pct") is not None:
+        return float(test_cfg["force_delta_pct"])
+    return None
+
+
+def _fetch_news(tk: str, news_cfg: dict, items: Optional[List[Dict[str, str]]] = None) -> Tuple[str, Optional[str]]:
+    """
+    Fetch, filter and format headlines for one ticker.
+
+    Args:
+        items: Already fetched and filtered headlines (see _prefetch_news);
+               None fetches them for this ticker alone.
+
+    Returns:
+        (Markdown news block from _format_headlines or "", first article URL or None)
+    """
+    metrics = get_metrics()
+    if items is None:
+        # Build a smarter query from company metadata and filter out false positives
+        with metrics.span("auto_keywords", tk):
+            company_name, req_kw = auto_keywords(tk)
+        q = build_query(company_name, tk)
+
+        with metrics.span("fetch_headlines", tk):
+            items = fetch_headlines(
+                query=q,
+                limit=int(news_cfg.get("limit", 2)),
+                lookback_hours=int(news_cfg.get("lookback_hours", 12)),
+                lang=news_cfg.get("lang", "de"),
+                country=news_cfg.get("country", "DE"),
+            )
+        items = filter_titles(items, required_keywords=req_kw)
+
+        if not items:
+            # Fallback: try en/US if DE results are weak or empty
+            with metrics.span("fetch_headlines_fallback", tk):
+                items = fetch_headlines(
+                    query=q,
+                    limit=int(news_cfg.get("limit", 2)),
+                    lookback_hours=max(12, int(news_cfg.get("lookback_hours", 12))),
+                    lang=news_cfg.get("fallback_lang", "en"),
+                    country=news_cfg.get("fallback_country", "US"),
+                )
+            items = filter_titles(items, required_keywords=req_kw)
+
+    # Resolve all links once (cache first, then concurrently over the network)
+    with metrics.span("resolve_links", tk):
+        resolved = resolve_links([it.get("link", "") for it in items])
+
+    # Prepare a click target (open first article when tapping the notification)
+    first_url = (resolved.get(items[0].get("link", "")) or None) if items else None
+    return _format_headlines(items, resolved), first_url
+
+
+def _prefetch_news(tickers: List[str], news_cfg: dict, workers: int = 1) -> Optional[Dict[str, List[Dict[str, str]]]]:
+    """
+    Fetch the headlines of several alerting tickers with grouped OR-queries
+    (news.group, see news.fetch_headlines_grouped): one RSS request per group
+    instead of one or two per ticker. Tickers without a hit get a grouped
+    en/US fallback, like the per-ticker path.
+
+    Returns:
+        {ticker: filtered items} for _fetch_news, or None if grouping is off,
+        there are fewer than two tickers or the prefetch failed (→ per-ticker path).
+    """
+    grp = news_cfg.get("group") or {}
+    if not grp.get("enabled", False) or len(tickers) < 2:
+        return None
+    opts = dict(limit=int(news_cfg.get("limit", 2)), max_size=int(grp.get("max_size", 8)),
+                max_url_len=int(grp.get("max_url_len", 1800)), workers=max(1, workers))
+    try:
+        companies = {tk: auto_keywords(tk) for tk in tickers}
+        # Ein Matcher für alle Ticker des Zyklus (Token-Index, siehe matcher.py)
+        opts["matcher"] = KeywordMatcher(companies)
+        out = fetch_headlines_grouped(
+            companies, lookback_hours=int(news_cfg.get("lookback_hours", 12)),
+            lang=news_cfg.get("lang", "de"), country=news_cfg.get("country", "DE"), **opts,
+        )
+        missing = {tk: companies[tk] for tk in tickers if not out.get(tk)}
+        if missing:
+            # Fallback: en/US für alle ohne Treffer, ebenfalls gruppiert
+            out.update(fetch_headlines_grouped(
+                missing, lookback_hours=max(12, int(news_cfg.get("lookback_hours", 12))),
+                lang=news_cfg.get("fallback_lang", "en"), country=news_cfg.get("fallback_country", "US"), **opts,
+            ))
+    except Exception as e:
+        logger.warning("Grouped news prefetch failed, falling back to per-ticker queries: %s", e)
+        return None
+    return {tk: out.get(tk, []) for tk in tickers}
+
+
+def _followup_cfg(news_cfg: dict) -> Optional[float]:
+    """Deadline in seconds if news follow-up mode is on (news.followup.enabled), else None."""
+    c = news_cfg.get("followup") or {}
+    if news_cfg.get("enabled", False) and c.get("enabled", False):
+        return float(c.get("deadline_sec", 20))
+    return None
+
+
+def _news_followup(
+    ev: TickerEval,
+    news_cfg: dict,
+    deadline: float,
+    log: _TickerLog,
+    news_items: Optional[List[Dict[str, str]]] = None,
+) -> Optional[Alert]:
+    """
+    Build the news follow-up for an already sent price alert.
+
+    Args:
+        ev: Evaluation row of the alerting ticker.
+        news_cfg: "news" section of config.json.
+        deadline: time.monotonic() after which the follow-up is dropped.
+        news_items: Prefetched headlines (see _prefetch_news), None to fetch them here.
+
+    Returns:
+        Alert with the news block (same topic, title "News: <ticker>"), or
+        None if there are no headlines or the deadline already passed.
+    """
+    tk = ev.ticker
+    try:
+        news_text, click = _fetch_news(tk, news_cfg, news_items)
+    except Exception as e:
+        log.error("News follow-up for %s failed: %s", tk, e)
+        return None
+    if not news_text:
+        return None
+    if time.monotonic() > deadline:
+        log.info("News follow-up for %s missed its deadline — dropped.", tk)
+        return None
+    arrow = "📈" if ev.direction == "up" else "📉"
+    first = news_text.splitlines()[0].lstrip("• ")
+    return Alert(
+        ticker=tk,
+        title=f"News: {tk}",
+        message=f"{arrow} {tk}: {ev.pct:+.2f}% vs. Open\n\n📰 News:\n{news_text}",
+        summary=f"📰 {tk}: {first[:120]}",
+        click_url=click,
+        markdown=True,
+        priority=abs(ev.pct),
+        deadline=deadline,
+    )
+
+
+def _process_ticker(
+    ev: TickerEval,
+    quote: Optional[Tuple[float, float]],
+    submit: Callable[[Alert], None],
+    forced_pct: Optional[float],
+    news_cfg: dict,
+    log: _TickerLog,
+    *,
+    with_news: bool = True,
+    news_items: Optional[List[Dict[str, str]]] = None,
+) -> TickerResult:
+    """
+    Act on the evaluation of one ticker: queue an alert on a new breakout
+    (optionally with news) and decide the new alert state.
+
+    with_news=False sends the bare price alert (news follow-up mode, see
+    _news_followup); news_items are prefetched headlines (see _prefetch_news).
+
+    Δ%, direction and the alert/reset decision come from the vectorized
+    evaluation (see evaluate.py); only alerting tickers do network work.
+    The finished alert is handed to `submit` (dispatcher queue or pipeline).
+
+    Returns:
+        TickerResult with the new state ("up"/"down"/"none") if it changes,
+        plus last price and Δ% for the state store. Errors are logged and
+        yield an empty result, so one bad ticker never breaks the run.
+    """
+    tk = ev.ticker
+    res = TickerResult()
+    try:
+        if quote is None:
+            raise RuntimeError(f"No data available for {tk}")
+        open_px = quote[0]
+        if open_px == 0:
+            raise RuntimeError(f"Open is 0 for {tk}; cannot compute Δ%.")
+
+        if forced_pct is not None:
+            # Test override: force a specific delta to simulate alerts
+            log.info("Test mode: forcing Δ%% (%.2f%%) for %s (was %.2f%%).",
+                     forced_pct, tk, (quote[1] - open_px) / open_px * 100.0)
+
+        pct, last_px, direction, prev = ev.pct, ev.last, ev.direction, ev.prev
+        log.info("%s | Last=%.4f Open=%.4f Δ=%+.2f%%", tk, last_px, open_px, pct)
+        res.last_price, res.pct = last_px, pct
+
+        if ev.alert:
+            # Crossing the threshold for the first time (since last reset) → send alert
+            arrow = "📈" if direction == "up" else "📉"
+            title = f"Stock Alert: {tk}"
+            body  = f"{arrow} {tk}: {pct:+.2f}% vs. Open\nAktuell: {last_px:.2f} | Open: {open_px:.2f}"
+
+            headlines_block = ""
+            first_url_for_click = None
+
+            if with_news and news_cfg.get("enabled", False):
+                news_text, first_url_for_click = _fetch_news(tk, news_cfg, news_items)
+                if news_text:
+                    headlines_block = "\n\n📰 News:\n" + news_text
+
+            msg = body + headlines_block
+
+            # Queue notification (Markdown on web; mobile gets real URLs + Click target)
+            submit(Alert(
+                ticker=tk,
+                title=title,
+                message=msg,
+                summary=body.splitlines()[0],
+                click_url=first_url_for_click,
+                markdown=True,
+                priority=abs(pct),
+            ))
+
+            # Persist state so we don't spam until price returns to corridor
+            res.new_state = direction
+            res.alerted = True
+
+        elif ev.reset:
+            # Back in corridor: reset state so we can alert again on next breakout
+            log.info("Back in corridor (%s): reset state %s → none", tk, prev)
+            res.new_state = "none"
+
+        elif direction == "none":
+            log.info("%s | No alert (< ±%.1f%%).", tk, ev.threshold)
+
+        else:
+            log.info("%s | Already alerted (%s). Waiting to re-enter corridor.", tk, prev)
+
+    except Exception as e:
+        # Catch-all to ensure a single bad ticker doesn't break the entire run
+        log.error("Error while processing %s: %s", tk, e)
+    return res
+
+
 def run_once(
     tickers: List[str],
     threshold_pct: float,
@@ -172,136 +541,256 @@ def run_once(
     market_hours_cfg: dict,
     test_cfg: dict,
     news_cfg: dict,
-) -> None:
+    max_workers: int = 1,
+    ntfy_cfg: Optional[dict] = None,
+    dispatcher: Optional[NtfyDispatcher] = None,
+    thresholds: Optional[Dict[str, float]] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    cycle_cfg: Optional[dict] = None,
+) -> Dict[str, TickerResult]:
     """
     Execute one monitoring cycle:
-      - Check market hours (with optional test bypass)
-      - For each ticker:
-          * Fetch open & last price (intraday preferred)
-          * Compute Δ% vs. open
-          * Trigger ntfy push if |Δ%| ≥ threshold (with de-bounce via state file)
-          * Optionally attach compact news headlines (with cleaned source URLs)
+      - With shard=(i, N) only the tickers owned by shard i are handled
+        (stable hash, see shard.py); their state goes to the shard's own
+        segment next to state_file
+      - Check market hours per venue (market_calendar.py; optional test bypass):
+        only tickers whose exchange is open are fetched, and the cycle ends
+        without any request if none is
+      - Fetch open & last price for all tickers in bulk from the configured
+        market-data provider (see market_data.py; yfinance, record or replay)
+      - Evaluate all tickers in one vectorized pass (evaluate.py): Δ% vs. open,
+        direction and alert/reset decision (thresholds: per-ticker overrides,
+        else threshold_pct)
+      - Non-alerting tickers are settled right away (no network work), so the
+        price check of the whole watchlist takes one bulk fetch
+      - Alerting tickers run through a staged pipeline (pipeline.py) in
+        |Δ%| order, biggest movers first: enrichment on max_workers threads
+        (company name, news, link resolution) → dispatch; each alert is sent
+        as soon as it is ready (de-bounce via state file)
+      - With news.group.enabled the headlines of all alerting tickers are
+        fetched up front with OR-combined queries (one RSS request per group
+        of companies instead of one or two per ticker)
+      - With news.followup.enabled the bare price alerts are sent first and
+        the news arrive as follow-up messages ("News: <ticker>"); follow-ups
+        that miss news.followup.deadline_sec are dropped; both take the same
+        digest decision
+      - If the cycle's alerts exceed ntfy.digest_threshold, they are collected
+        and sent as one digest at the end (see dispatch.NtfyDispatcher). The
+        decision is made once per cycle; with a time budget the total is only
+        known after the last batch, so alerts are queued until then unless
+        even an alert for every ticker would stay below the threshold
+      - With cycle_cfg["budget_sec"] the cycle has a time budget (see
+        budget.py): tickers are handled in priority order (non-"none" state
+        and previous moves near the threshold, then those skipped last cycle,
+        then the rest by previous move) in batches of at most
+        cycle_cfg["batch_size"], each sized to finish reserve_sec before the
+        budget ends at the highest measured cost per ticker (first batch: the
+        previous cycle's cost, else a small probe). Past that deadline alerts
+        of the running batch go out without news. The rest is left untouched
+        (no alert, no state change) and recorded as resume cursor in the
+        state meta, so the next cycle starts with it
+      - Logs are emitted per ticker in list order
 
     Side effects:
       - Sends an HTTP POST to ntfy (unless dry_run)
-      - Reads/writes the alert state JSON (anti-spam)
+      - Reads the alert state (anti-spam, see state.StateStore; merged over
+        all shard segments) once and commits all changes atomically in a
+        single write at the end
       - Writes logs according to logging setup
+      - Exports per-stage timings and HTTP counters if metrics are enabled
+        (see metrics.py; Prometheus textfile + JSON summary)
+
+    Returns:
+        TickerResult per fetched ticker (empty if every venue is closed;
+        without the tickers deferred by the time budget); the daemon's
+        adaptive scheduler feeds on the Δ% values.
     """
+    cycle = {**DEFAULT_CYCLE_CFG, **(cycle_cfg or {})}
+    budget = CycleBudget(cycle["budget_sec"], cycle["reserve_sec"])
+    tickers = shard_tickers(tickers, shard)
     start_ts = now_tz(market_hours_cfg["tz"]).strftime("%Y-%m-%d %H:%M:%S")
     logger.info("Job start (%s), Ticker=%s, Schwelle=±%.1f%%", start_ts, ",".join(tickers), threshold_pct)
 
-    within = is_market_hours(market_hours_cfg)
     if test_cfg.get("enabled") and test_cfg.get("bypass_market_hours"):
         logger.info("Test mode enabled: bypassing market-hours window.")
-        within = True
-    logger.info("Market hours? %s (effective=%s)", is_market_hours(market_hours_cfg), within)
-    if not within:
-        logger.info("Outside market hours — no push sent.")
-        return
-
-    state: Dict[str, str] = load_state(state_file)
-
+    else:
+        # Nur Ticker mit offener Börse abfragen; alle zu → Zyklus ohne Request beenden
+        open_now = active_tickers(tickers, market_hours_cfg)
+        logger.info("Market open for %d/%d ticker(s).", len(open_now), len(tickers))
+        if not open_now:
+            logger.info("Outside market hours — no push sent.")
+            return {}
+        tickers = open_now
+
+    metrics = get_metrics()
+    metrics.reset()
+    cycle_t0 = time.perf_counter()
+
+    with metrics.span("load_state"):
+        store = ShardStateStore(state_file, shard)
+
+    # Mit Zeitbudget: Prioritätsreihenfolge, Batches passend zur Restzeit
+    if budget.enabled:
+        queue = prioritize(tickers, store, threshold_pct, thresholds, cycle["hot_ratio"])
+        budget.seed(store.meta.get(COST_META_KEY))
+    else:
+        queue = list(tickers)
+
+    forced = _forced_pct(test_cfg)
+    if dispatcher is None:
+        dispatcher = NtfyDispatcher.from_config(
+            ntfy_server, ntfy_topic, ntfy_cfg, dry_run=test_cfg.get("dry_run", False),
+        )
+    results: Dict[str, TickerResult] = {}
+    logs = {tk: _TickerLog() for tk in tickers}
+    followup = _followup_cfg(news_cfg)
+    alerted = 0
+    # Digest einmal pro Zyklus entscheiden: ohne Budget (ein Batch) beim Batch, mit Budget erst am
+    # Zyklusende – bis dahin werden alle Alerts gequeuet. Kein Digest möglich → gleich sofort senden.
+    digest: Optional[bool] = None if dispatcher.wants_digest(len(queue)) else False
+    held_followups: List[Alert] = []  # News-Follow-ups, solange die Digest-Entscheidung offen ist
+
+    def _run_batch(batch: List[str]) -> int:
+        """Price check, decision and alerts for one batch; returns the number of alerting tickers."""
+        nonlocal digest
+        # Ein Bulk-Request (bzw. wenige Chunks) statt bis zu sechs Requests pro Ticker
+        with metrics.span("market"):
+            prices = get_market_data().get_open_and_last_many(batch)
+
+        with metrics.span("evaluate"):
+            ev = evaluate_watchlist(batch, prices, store.directions(), threshold_pct, thresholds, forced)
+        alerting = set(ev.alerting())
+
+        if news_cfg.get("enabled", False) and alerting:
+            # Firmennamen der alarmierenden Ticker gebündelt vorab holen (nur Cache-Misses gehen an Yahoo)
+            with metrics.span("company_prefetch"):
+                get_company_meta_many([tk for tk in batch if tk in alerting])
+
+        rows = {r.ticker: r for r in ev.rows()}
+
+        # Stufe 1+2: Kurs-Check und Entscheidung für alle nicht alarmierenden Ticker sofort abschließen
+        for tk in batch:
+            if tk not in alerting:
+                results[tk] = _process_ticker(rows[tk], prices.get(tk.upper()), dispatcher.submit,
+                                              forced, news_cfg, logs[tk])
+
+        # Stufe 3+4: größte Ausschläge zuerst anreichern; fertige Alerts sofort senden (außer Digest)
+        order = sorted(alerting, key=lambda t: abs(rows[t].pct), reverse=True)
+        if digest is None and not budget.enabled:
+            digest = dispatcher.wants_digest(len(order))
+
+        if followup is not None:
+            # Follow-up-Modus: reine Kurs-Alerts sofort raus, News danach als eigene Nachricht
+            # (Digest offen → beides bis zum Zyklusende halten, Kurs-Alerts zuerst)
+            for tk in order:
+                results[tk] = _process_ticker(rows[tk], prices.get(tk.upper()), dispatcher.submit,
+                                              forced, news_cfg, logs[tk], with_news=False)
+            if digest is not None:
+                with metrics.span("dispatch_price"):
+                    dispatcher.flush(digest=digest)
+            deadline = time.monotonic() + followup
+            if budget.enabled:
+                deadline = min(deadline, budget.deadline)
+
+        # News für alle alarmierenden Ticker gebündelt (OR-Queries), falls news.group aktiv
+        prefetched = None
+        if news_cfg.get("enabled", False) and order and budget.remaining() > 0:
+            with metrics.span("news_prefetch"):
+                prefetched = _prefetch_news(order, news_cfg, max_workers)
+        news_for = (lambda tk: prefetched.get(tk)) if prefetched is not None else (lambda tk: None)
+
+        if followup is not None:
+            def _enrich(tk: str, emit: Callable[[Alert], None]) -> None:
+                with metrics.span("ticker", tk):
+                    alert = _news_followup(rows[tk], news_cfg, deadline, logs[tk], news_for(tk))
+                if alert is not None:
+                    emit(alert)
+        else:
+            def _enrich(tk: str, emit: Callable[[Alert], None]) -> TickerResult:
+                # Budget aufgebraucht: Alert trotzdem senden, nur ohne News
+                late = budget.remaining() <= 0
+                if late and news_cfg.get("enabled", False):
+                    logs[tk].info("Cycle budget exhausted — sending %s without news.", tk)
+                with metrics.span("ticker", tk):
+                    return _process_ticker(rows[tk], prices.get(tk.upper()), emit, forced, news_cfg, logs[tk],
+                                           with_news=not late, news_items=news_for(tk))
+
+        if digest is False:
+            send = dispatcher.send
+        elif digest or followup is None:
+            send = dispatcher.submit
+        else:
+            # Kurs-Alert wartet selbst bis zum Zyklusende → News-Deadline gilt nur fürs Abrufen
+            send = lambda alert: held_followups.append(replace(alert, deadline=None))  # noqa: E731
+        with metrics.span("pipeline"):
+            outcome = run_pipeline(
+                order, _enrich, send,
+                workers=max(1, max_workers), senders=dispatcher.parallelism,
+            )
+        for tk, (res, err) in zip(order, outcome):
+            if err is not None:
+                logs[tk].error("Error while processing %s: %s", tk, err)
+            if followup is None:
+                results[tk] = res or TickerResult()
+        return len(order)
+
+    skipped: List[str] = []
+    pos = 0
+    max_batch = int(cycle["batch_size"] or 0) if budget.enabled else 0
+    while pos < len(queue):
+        rest = len(queue) - pos
+        n = budget.size(min(rest, max_batch) if max_batch > 0 else rest)
+        if n <= 0:
+            # Sauber aufhören: Rest bleibt unangetastet und kommt im nächsten Zyklus zuerst
+            skipped = queue[pos:]
+            logger.warning("Cycle budget: %.0fs left, %d ticker(s) deferred to the next cycle: %s",
+                           max(0.0, budget.remaining()), len(skipped), ",".join(skipped))
+            break
+        batch, pos = queue[pos:pos + n], pos + n
+        batch_t0 = time.monotonic()
+        alerted += _run_batch(batch)
+        budget.record(len(batch), time.monotonic() - batch_t0)
+
+    # Digest (bzw. noch Gequeuetes) am Zyklusende senden
+    if digest is None:
+        digest = dispatcher.wants_digest(alerted)
+    with metrics.span("dispatch"):
+        dispatcher.flush(digest=digest)
+        if held_followups:
+            # News-Follow-ups nach den Kurs-Alerts, mit derselben Digest-Entscheidung
+            for alert in held_followups:
+                dispatcher.submit(alert)
+            dispatcher.flush(digest=digest)
     for tk in tickers:
-        try:
-            open_px, last_px = get_open_and_last(tk)
-            if open_px == 0:
-                raise RuntimeError(f"Open is 0 for {tk}; cannot compute Δ%.")
+        if tk in results:
+            logs[tk].flush()
 
-            pct = (last_px - open_px) / open_px * 100.0
+    # State-Änderungen im Speicher sammeln und einmal atomar schreiben
+    now = time.time()
+    for tk, r in results.items():
+        fields: Dict[str, Any] = {}
+        if r.last_price is not None:
+            fields["last_price"] = round(r.last_price, 6)
+            fields["last_pct"] = round(r.pct, 4)
+        if r.alerted:
+            fields["last_alert_ts"] = now
+        if r.new_state is not None or fields:
+            store.set(tk, direction=r.new_state, **fields)
+    if budget.enabled or store.meta.get(RESUME_META_KEY):
+        store.set_meta(RESUME_META_KEY, skipped)
+    if budget.measured is not None:
+        store.set_meta(COST_META_KEY, round(budget.measured, 4))
+    with metrics.span("save_state"):
+        store.commit()
+        flush_company_cache()
 
-            # Test override: force a specific delta to simulate alerts
-            if test_cfg.get("enabled") and test_cfg.get("force_delta_pct") is not None:
-                forced = float(test_cfg["force_delta_pct"])
-                logger.info("Test mode: forcing Δ%% (%.2f%%) for %s (was %.2f%%).", forced, tk, pct)
-                pct = forced
-                last_px = open_px * (1.0 + pct / 100.0)
-
-            logger.info("%s | Last=%.4f Open=%.4f Δ=%+.2f%%", tk, last_px, open_px, pct)
-
-            prev = state.get(tk, "none")
-            direction = "up" if pct >= threshold_pct else "down" if pct <= -threshold_pct else "none"
-
-            if direction != "none" and direction != prev:
-                # Crossing the threshold for the first time (since last reset) → send alert
-                arrow = "📈" if direction == "up" else "📉"
-                title = f"Stock Alert: {tk}"
-                body  = f"{arrow} {tk}: {pct:+.2f}% vs. Open\nAktuell: {last_px:.2f} | Open: {open_px:.2f}"
-
-                headlines_block = ""
-                first_url_for_click = None
-
-                if news_cfg.get("enabled", False):
-                    # Build a smarter query from company metadata and filter out false positives
-                    company_name, req_kw = auto_keywords(tk)
-                    q = build_query(company_name, tk)
-
-                    items = fetch_headlines(
-                        query=q,
-                        limit=int(news_cfg.get("limit", 2)),
-                        lookback_hours=int(news_cfg.get("lookback_hours", 12)),
-                        lang=news_cfg.get("lang", "de"),
-                        country=news_cfg.get("country", "DE"),
-                    )
-                    items = filter_titles(items, required_keywords=req_kw)
-
-                    # Prepare a click target (open first article when tapping the notification)
-                    if items:
-                        cand = _ensure_https(items[0].get("link", ""))
-                        first_url_for_click = _extract_original_url(cand)
-
-                    news_text = _format_headlines(items)
-                    if not news_text:
-                        # Fallback: try en/US if DE results are weak or empty
-                        items = fetch_headlines(
-                            query=q,
-                            limit=int(news_cfg.get("limit", 2)),
-                            lookback_hours=max(12, int(news_cfg.get("lookback_hours", 12))),
-                            lang=news_cfg.get("fallback_lang", "en"),
-                            country=news_cfg.get("fallback_country", "US"),
-                        )
-                        items = filter_titles(items, required_keywords=req_kw)
-
-                        if items and not first_url_for_click:
-                            cand = _ensure_https(items[0].get("link", ""))
-                            first_url_for_click = _extract_original_url(cand)
-
-                        news_text = _format_headlines(items)
-
-                    if news_text:
-                        headlines_block = "\n\n📰 News:\n" + news_text
-
-                msg = body + headlines_block
-
-                # Send notification (Markdown on web; mobile gets real URLs + Click target)
-                notify_ntfy(
-                    ntfy_server,
-                    ntfy_topic,
-                    title,
-                    msg,
-                    dry_run=test_cfg.get("dry_run", False),
-                    markdown=True,
-                    click_url=first_url_for_click,
-                )
-
-                # Persist state so we don't spam until price returns to corridor
-                state[tk] = direction
-                save_state(state_file, state)
-
-            elif direction == "none":
-                # Back in corridor: reset state so we can alert again on next breakout
-                if prev != "none":
-                    logger.info("Back in corridor (%s): reset state %s → none", tk, prev)
-                    state[tk] = "none"
-                    save_state(state_file, state)
-                else:
-                    logger.info("%s | No alert (< ±%.1f%%).", tk, threshold_pct)
+    for host, st in get_http().stats().items():
+        logger.debug("HTTP pool %s: requests=%d connections=%d reused=%d",
+                     host, st["requests"], st["connections"], st["reused"])
 
-            else:
-                logger.info("%s | Already alerted (%s). Waiting to re-enter corridor.", tk, prev)
-
-        except Exception as e:
-            # Catch-all to ensure a single bad ticker doesn't break the entire run
-            logger.error("Error while processing %s: %s", tk, e)
+    metrics.observe("cycle", time.perf_counter() - cycle_t0)
+    metrics.export()
+    return results
 
 
 
@@ -310,6 +799,8 @@ def run_once(
 ################## TEST ###########################
 
 def main():
+    from .logging_setup import setup_logging
+
     # Logger initialisieren
     logger = setup_logging({
         "level": "DEBUG",
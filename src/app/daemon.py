@@ -0,0 +1,113 @@
+#Daemon-Modus: Konfiguration, Logging und Imports einmal laden,
+#              dann run_once in einem festen Intervall (mit Jitter) wiederholen.
+#              Optional fragt jeder Tick nur die fälligen Ticker ab (scheduler.py).
+
+import logging
+import random
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from .core import active_tickers, run_once
+from .dispatch import NtfyDispatcher
+from .scheduler import PollScheduler
+
+logger = logging.getLogger("stock-alerts")
+
+
+def _install_stop_handlers(stop: threading.Event) -> None:
+    """Stop the loop cleanly on SIGINT/SIGTERM (e.g. `kill`, systemd, Ctrl+C)."""
+    def _handler(signum, _frame):
+        logger.info("Signal %s received — stopping daemon after current cycle.", signum)
+        stop.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            signal.signal(sig, _handler)
+        except (ValueError, OSError):
+            # Nicht im Main-Thread (z. B. in Tests) → ohne Signal-Handler weiterlaufen
+            pass
+
+
+def run_daemon(
+    run_kwargs: Dict[str, Any],
+    daemon_cfg: Dict[str, Any],
+    *,
+    stop: threading.Event | None = None,
+    cycle: Callable[..., Any] = run_once,
+) -> None:
+    """
+    Run monitoring cycles in-process until stopped.
+
+    Args:
+        run_kwargs: Keyword arguments passed unchanged to run_once each cycle.
+        daemon_cfg: Daemon configuration with keys:
+            - interval_sec (float): Pause between cycle starts (default 60)
+            - jitter_sec (float): Random extra delay 0..jitter_sec per tick (default 5)
+            - max_cycles (int | None): Stop after N ticks (for testing), default endless
+            - scheduler (dict): Adaptive per-ticker polling (see scheduler.DEFAULT_SCHEDULER_CFG);
+              if enabled, each tick fetches only the tickers that are due
+        stop: Optional event to stop the loop from outside.
+        cycle: Callable executed per tick (default run_once).
+
+    Ticks while no ticker's exchange is open (see core.active_tickers) are
+    skipped without any network traffic, unless the test config bypasses market hours.
+    With the scheduler, ticks without due tickers are skipped the same way.
+    """
+    interval = max(1.0, float(daemon_cfg.get("interval_sec", 60)))
+    jitter = max(0.0, float(daemon_cfg.get("jitter_sec", 5)))
+    max_cycles = daemon_cfg.get("max_cycles")
+
+    stop = stop or threading.Event()
+    _install_stop_handlers(stop)
+
+    market_hours_cfg = run_kwargs["market_hours_cfg"]
+    test_cfg = run_kwargs.get("test_cfg", {})
+    bypass = bool(test_cfg.get("enabled") and test_cfg.get("bypass_market_hours"))
+
+    # Ein Dispatcher für alle Zyklen, damit das ntfy-Rate-Limit zyklusübergreifend gilt
+    if cycle is run_once and run_kwargs.get("dispatcher") is None:
+        run_kwargs = {**run_kwargs, "dispatcher": NtfyDispatcher.from_config(
+            run_kwargs["ntfy_server"], run_kwargs["ntfy_topic"], run_kwargs.get("ntfy_cfg"),
+            dry_run=test_cfg.get("dry_run", False),
+        )}
+
+    sched_cfg = daemon_cfg.get("scheduler") or {}
+    scheduler = PollScheduler(
+        run_kwargs["tickers"], run_kwargs["threshold_pct"], run_kwargs.get("thresholds"), sched_cfg,
+    ) if sched_cfg.get("enabled") else None
+
+    logger.info("Daemon started: interval=%.0fs jitter=%.1fs adaptive=%s", interval, jitter, scheduler is not None)
+    ticks = 0
+    while not stop.is_set():
+        started = time.monotonic()
+        active = list(run_kwargs["tickers"]) if bypass else active_tickers(run_kwargs["tickers"], market_hours_cfg)
+        due = scheduler.due(candidates=active) if scheduler is not None and active else active
+        if due:
+            try:
+                results = cycle(**(run_kwargs if scheduler is None else {**run_kwargs, "tickers": due}))
+                if scheduler is not None:
+                    results = results or {}
+                    # vom Zeitbudget zurückgestellte Ticker bleiben fällig
+                    scheduler.record({tk: results[tk].pct for tk in due if tk in results})
+                    logger.debug("Polled %d/%d ticker(s); next due in %.0fs.", len(due), len(active),
+                                 max(0.0, scheduler.next_wake() - time.time()))
+            except Exception as e:
+                # Ein fehlerhafter Zyklus darf den Daemon nicht beenden
+                logger.error("Cycle failed: %s", e)
+        elif active:
+            logger.debug("No ticker due — tick skipped.")
+        else:
+            logger.debug("Outside market hours — tick skipped.")
+
+        ticks += 1
+        if max_cycles is not None and ticks >= int(max_cycles):
+            break
+
+        # Intervall ab Zyklusstart messen, damit lange Zyklen nicht driften
+        elapsed = time.monotonic() - started
+        delay = max(0.0, interval - elapsed) + random.uniform(0.0, jitter)
+        stop.wait(delay)
+
+    logger.info("Daemon stopped after %d tick(s).", ticks)
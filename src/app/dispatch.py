@@ -0,0 +1,200 @@
+#Benachrichtigungs-Dispatcher: sammelt alle Alerts eines Zyklus,
+#sendet sie parallel (Token-Bucket gegen ntfy-Rate-Limits)
+#und fasst sie bei vielen Alerts optional zu einer Digest-Nachricht zusammen.
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .metrics import get_metrics
+from .ntfy import notify_ntfy
+
+logger = logging.getLogger("stock-alerts")
+
+# ntfy.sh: Burst von 60 Requests, danach 1 Request alle 5 s pro Besucher
+DEFAULT_DISPATCH_CFG: Dict[str, Any] = {
+    "parallelism": 4,           # Concurrent POSTs per flush
+    "rate_per_sec": 0.2,        # Token refill rate (ntfy.sh: 1 request / 5 s)
+    "burst": 60,                # Bucket size (ntfy.sh: 60 requests burst)
+    "digest_threshold": 5,      # > N alerts in one cycle → one digest message (0 = off)
+}
+
+
+@dataclass
+class Alert:
+    """
+    One pending notification.
+
+    Attributes:
+        ticker (str): Ticker symbol the alert belongs to.
+        title (str): Notification title.
+        message (str): Full notification body (price line + optional news block).
+        summary (str): One-line version used in digest messages.
+        click_url (Optional[str]): URL opened when tapping the notification.
+        markdown (bool): Enable Markdown rendering (ntfy web app).
+        priority (float): Sort key for sending order; higher goes first.
+        deadline (Optional[float]): time.monotonic() after which the alert is
+            dropped instead of sent (news follow-ups).
+    """
+    ticker: str
+    title: str
+    message: str
+    summary: str = ""
+    click_url: Optional[str] = None
+    markdown: bool = True
+    priority: float = 0.0
+    deadline: Optional[float] = None
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `burst` tokens, refilled at `rate_per_sec`.
+
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int) -> None:
+        self.rate = max(1e-6, float(rate_per_sec))
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token; returns the time waited in seconds."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class NtfyDispatcher:
+    """
+    Queue alerts during a cycle and send them in one go with flush().
+
+    Example:
+        >>> d = NtfyDispatcher("https://ntfy.sh", "my-topic", parallelism=4)
+        >>> d.submit(Alert("AAPL", "Stock Alert: AAPL", "📈 AAPL: +4.1% vs. Open"))
+        >>> d.flush()
+        1
+    """
+
+    def __init__(
+        self,
+        server: str,
+        topic: str,
+        *,
+        dry_run: bool = False,
+        parallelism: int = 4,
+        rate_per_sec: float = 0.2,
+        burst: int = 60,
+        digest_threshold: int = 5,
+    ) -> None:
+        self.server = server
+        self.topic = topic
+        self.dry_run = dry_run
+        self.parallelism = max(1, int(parallelism))
+        self.digest_threshold = max(0, int(digest_threshold))
+        # Bucket lebt so lange wie der Dispatcher (Daemon: über Zyklen hinweg)
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self._queue: List[Alert] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, server: str, topic: str, cfg: Optional[Dict[str, Any]], *, dry_run: bool = False) -> "NtfyDispatcher":
+        """Create a dispatcher from the "ntfy" section of config.json."""
+        c = {**DEFAULT_DISPATCH_CFG, **(cfg or {})}
+        return cls(
+            server, topic, dry_run=dry_run,
+            parallelism=c["parallelism"], rate_per_sec=c["rate_per_sec"],
+            burst=c["burst"], digest_threshold=c["digest_threshold"],
+        )
+
+    def submit(self, alert: Alert) -> None:
+        """Queue an alert (thread-safe); nothing is sent before flush()."""
+        with self._lock:
+            self._queue.append(alert)
+
+    def _send(self, title: str, message: str, click_url: Optional[str], markdown: bool) -> None:
+        self.bucket.acquire()
+        with get_metrics().span("notify_ntfy"):
+            notify_ntfy(
+                self.server, self.topic, title, message,
+                dry_run=self.dry_run, markdown=markdown, click_url=click_url,
+            )
+
+    def send(self, alert: Alert) -> None:
+        """Send one alert right away (token bucket applies; no queue, no digest)."""
+        if alert.expired():
+            logger.info("%s for %s missed its deadline — dropped.", alert.title, alert.ticker)
+            return
+        self._send(alert.title, alert.message, alert.click_url, alert.markdown)
+
+    def wants_digest(self, n_alerts: int) -> bool:
+        """True if `n_alerts` alerts in one cycle would be merged into a digest by flush()."""
+        return bool(self.digest_threshold) and n_alerts > self.digest_threshold
+
+    def _digest(self, alerts: List[Alert]) -> Alert:
+        lines = [a.summary or a.message.splitlines()[0] for a in alerts]
+        return Alert(
+            ticker=",".join(a.ticker for a in alerts),
+            title=f"Stock Alerts: {len(alerts)} Ticker",
+            message="\n".join(lines),
+            click_url=next((a.click_url for a in alerts if a.click_url), None),
+            markdown=True,
+        )
+
+    def flush(self, digest: Optional[bool] = None) -> int:
+        """
+        Send all queued alerts.
+
+        Alerts are sent in priority order with up to `parallelism` concurrent
+        POSTs, each gated by the token bucket. If more than `digest_threshold`
+        alerts are queued, a single digest message is sent instead.
+
+        Args:
+            digest: Decision made by the caller for the whole cycle (e.g.
+                run_once, whose alerts may span several flushes); None decides
+                from the number of queued alerts.
+
+        Returns:
+            Number of ntfy messages sent (or logged in dry-run).
+        """
+        with self._lock:
+            alerts, self._queue = self._queue, []
+        live = [a for a in alerts if not a.expired()]
+        if len(live) < len(alerts):
+            logger.info("%d alert(s) missed their deadline — dropped.", len(alerts) - len(live))
+        alerts = live
+        if not alerts:
+            return 0
+        alerts.sort(key=lambda a: a.priority, reverse=True)
+
+        if digest is None:
+            digest = self.wants_digest(len(alerts))
+        if digest and len(alerts) > 1:
+            logger.info("%d alerts in this cycle → sending one digest message.", len(alerts))
+            alerts = [self._digest(alerts)]
+
+        if self.parallelism == 1 or len(alerts) == 1:
+            for a in alerts:
+                self._send(a.title, a.message, a.click_url, a.markdown)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.parallelism, len(alerts)),
+                                    thread_name_prefix="ntfy") as pool:
+                list(pool.map(lambda a: self._send(a.title, a.message, a.click_url, a.markdown), alerts))
+        return len(alerts)
@@ -0,0 +1,170 @@
+#Vektorisierte Alert-Auswertung: Δ%, Richtung und "Alert nötig"/"Reset nötig"
+#für die ganze Watchlist in einem NumPy-Durchlauf (optional mit Schwellen pro Ticker).
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:  # nur für Typ-Hinweise; numpy wird lazy geladen
+    import numpy as np
+
+# Richtungs-Codes (int8) ↔ State-Strings
+NONE, UP, DOWN = 0, 1, -1
+CODES: Dict[str, int] = {"none": NONE, "up": UP, "down": DOWN}
+NAMES: Dict[int, str] = {NONE: "none", UP: "up", DOWN: "down"}
+
+
+@dataclass
+class TickerEval:
+    """
+    Evaluation result of one ticker (a row of Evaluation).
+
+    Attributes:
+        ticker (str): Ticker symbol as configured.
+        open (float): Today's open (NaN if no data).
+        last (float): Latest price (forced in test mode).
+        pct (float): Δ% vs. open (NaN if invalid).
+        direction (str): "up" / "down" / "none".
+        prev (str): Previously alerted direction.
+        threshold (float): Threshold used for this ticker (in %).
+        valid (bool): Quote present and open != 0.
+        alert (bool): New breakout → send an alert.
+        reset (bool): Back in corridor after an alert → reset state.
+    """
+    ticker: str
+    open: float
+    last: float
+    pct: float
+    direction: str
+    prev: str
+    threshold: float
+    valid: bool
+    alert: bool
+    reset: bool
+
+
+@dataclass
+class Evaluation:
+    """Column arrays for the whole watchlist (index i ↔ tickers[i])."""
+    tickers: List[str]
+    open: "np.ndarray"
+    last: "np.ndarray"
+    pct: "np.ndarray"
+    direction: "np.ndarray"
+    prev: "np.ndarray"
+    threshold: "np.ndarray"
+    valid: "np.ndarray"
+    alert: "np.ndarray"
+    reset: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def row(self, i: int) -> TickerEval:
+        return TickerEval(
+            ticker=self.tickers[i],
+            open=float(self.open[i]),
+            last=float(self.last[i]),
+            pct=float(self.pct[i]),
+            direction=NAMES[int(self.direction[i])],
+            prev=NAMES[int(self.prev[i])],
+            threshold=float(self.threshold[i]),
+            valid=bool(self.valid[i]),
+            alert=bool(self.alert[i]),
+            reset=bool(self.reset[i]),
+        )
+
+    def rows(self) -> Iterator[TickerEval]:
+        for i in range(len(self.tickers)):
+            yield self.row(i)
+
+    def alerting(self) -> List[str]:
+        """Tickers that need an alert in this cycle."""
+        return [self.tickers[i] for i in self.alert.nonzero()[0]]
+
+
+def evaluate_arrays(
+    open_px: "np.ndarray",
+    last_px: "np.ndarray",
+    prev: "np.ndarray",
+    threshold: "np.ndarray",
+    forced_pct: Optional[float] = None,
+) -> Tuple["np.ndarray", ...]:
+    """
+    Core vectorized pass (no Python loop over tickers).
+
+    Args:
+        open_px: Opening prices (NaN = no data).
+        last_px: Latest prices.
+        prev: Previous direction codes (int8: 0 none, 1 up, -1 down).
+        threshold: Thresholds in % (scalar-broadcastable or one per ticker).
+        forced_pct: Test override: use this Δ% for all valid tickers.
+
+    Returns:
+        (last, pct, direction, valid, alert, reset)
+    """
+    import numpy as np
+
+    open_px = np.asarray(open_px, dtype=np.float64)
+    last_px = np.asarray(last_px, dtype=np.float64)
+    prev = np.asarray(prev, dtype=np.int8)
+    threshold = np.broadcast_to(np.asarray(threshold, dtype=np.float64), open_px.shape)
+
+    valid = np.isfinite(open_px) & np.isfinite(last_px) & (open_px != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(valid, (last_px - open_px) / open_px * 100.0, np.nan)
+    if forced_pct is not None:
+        pct = np.where(valid, float(forced_pct), np.nan)
+        last_px = np.where(valid, open_px * (1.0 + float(forced_pct) / 100.0), last_px)
+
+    direction = np.zeros(open_px.shape, dtype=np.int8)
+    direction[valid & (pct >= threshold)] = UP
+    direction[valid & (pct <= -threshold)] = DOWN
+
+    alert = (direction != NONE) & (direction != prev)
+    reset = valid & (direction == NONE) & (prev != NONE)
+    return last_px, pct, direction, valid, alert, reset
+
+
+def evaluate_watchlist(
+    tickers: List[str],
+    prices: Mapping[str, Tuple[float, float]],
+    prev_directions: Mapping[str, str],
+    threshold_pct: float,
+    thresholds: Optional[Mapping[str, float]] = None,
+    forced_pct: Optional[float] = None,
+) -> Evaluation:
+    """
+    Evaluate all tickers of a cycle at once.
+
+    Args:
+        tickers: Tickers in configured order.
+        prices: {TICKER (upper-case): (open, last)} from the market-data provider.
+        prev_directions: {ticker: "up"/"down"/"none"}; missing = "none".
+        threshold_pct: Default threshold in %.
+        thresholds: Optional per-ticker overrides {ticker: pct} (case-insensitive keys).
+        forced_pct: Test override for Δ% (test.force_delta_pct).
+
+    Returns:
+        Evaluation with one row per ticker.
+    """
+    import numpy as np
+
+    n = len(tickers)
+    keys = list(map(str.upper, tickers))
+    missing = (float("nan"), float("nan"))
+    # Bulk-Konvertierung (np.array/np.fromiter + map) statt Zuweisung Element für Element
+    get_quote = prices.get
+    quotes = np.array([get_quote(k, missing) for k in keys], dtype=np.float64).reshape(n, 2)
+    open_px, last_px = quotes[:, 0], quotes[:, 1]
+    get_prev = prev_directions.get
+    prev = np.fromiter(map(CODES.get, map(get_prev, tickers, ("none",) * n), (NONE,) * n), dtype=np.int8, count=n)
+    over = {k.upper(): float(v) for k, v in (thresholds or {}).items()}
+    if over:
+        default = float(threshold_pct)
+        threshold = np.fromiter(map(over.get, keys, (default,) * n), dtype=np.float64, count=n)
+    else:
+        threshold = np.full(n, float(threshold_pct))
+
+    last, pct, direction, valid, alert, reset = evaluate_arrays(open_px, last_px, prev, threshold, forced_pct)
+    return Evaluation(list(tickers), open_px, last, pct, direction, prev, threshold, valid, alert, reset)
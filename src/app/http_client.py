@@ -0,0 +1,168 @@
+#Gemeinsamer HTTP-Client: eine Session pro Host (Connection-Pool + Keep-Alive),
+#Retries mit Backoff und Timeouts pro Host aus config.json ("http").
+
+from __future__ import annotations
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from .metrics import get_metrics
+
+if TYPE_CHECKING:  # nur für Typ-Hinweise; requests wird lazy geladen
+    import requests
+
+logger = logging.getLogger("stock-alerts")
+
+# Fallback-Werte, falls config.json keinen "http"-Abschnitt hat
+DEFAULT_HTTP_CFG: Dict[str, Any] = {
+    "timeout_sec": 10.0,        # Default timeout per request
+    "retries": 2,               # Retries for connection errors / 429 / 5xx
+    "backoff_sec": 0.3,         # Exponential backoff factor between retries
+    "pool_maxsize": 10,         # Keep-alive connections per host
+    "hosts": {},                # Per-host overrides, e.g. {"ntfy.sh": {"timeout_sec": 20}}
+}
+
+# POST wird bewusst nicht wiederholt (keine doppelten Push-Nachrichten)
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """
+    Shared HTTP client with one pooled `requests.Session` per host.
+
+    Every outbound call of the package (ntfy, Google News RSS, redirect
+    resolution) goes through this client, so repeated calls to the same host
+    reuse TLS connections instead of paying a new handshake each time.
+    """
+
+    def __init__(self, cfg: Optional[Dict[str, Any]] = None) -> None:
+        self.cfg: Dict[str, Any] = {**DEFAULT_HTTP_CFG, **(cfg or {})}
+        self._sessions: Dict[str, "requests.Session"] = {}
+        self._lock = threading.Lock()
+
+    def host_cfg(self, host: str) -> Dict[str, Any]:
+        """Return the effective settings for a host (global values + host overrides)."""
+        out = {k: v for k, v in self.cfg.items() if k != "hosts"}
+        out.update((self.cfg.get("hosts") or {}).get(host, {}))
+        return out
+
+    def _session(self, host: str) -> "requests.Session":
+        with self._lock:
+            sess = self._sessions.get(host)
+            if sess is not None:
+                return sess
+
+            import requests  # lazy: requests/urllib3 erst beim ersten Request laden
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            hc = self.host_cfg(host)
+            retry = Retry(
+                total=int(hc["retries"]),
+                backoff_factor=float(hc["backoff_sec"]),
+                status_forcelist=RETRY_STATUS,
+                allowed_methods=RETRY_METHODS,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=int(hc["pool_maxsize"]), max_retries=retry)
+            sess = requests.Session()
+            sess.mount("http://", adapter)
+            sess.mount("https://", adapter)
+            self._sessions[host] = sess
+            return sess
+
+    def request(self, method: str, url: str, **kwargs: Any) -> "requests.Response":
+        """
+        Perform an HTTP request through the pooled session for the URL's host.
+
+        Args:
+            method: HTTP method ("GET", "HEAD", "POST", ...).
+            url: Absolute URL.
+            **kwargs: Passed to `requests.Session.request`; `timeout` defaults
+                      to the host's configured timeout_sec.
+
+        Returns:
+            requests.Response (raises requests.RequestException on failure).
+        """
+        host = urlsplit(url).hostname or ""
+        kwargs.setdefault("timeout", float(self.host_cfg(host)["timeout_sec"]))
+        metrics = get_metrics()
+        if not metrics.enabled:
+            return self._session(host).request(method, url, **kwargs)
+        try:
+            resp = self._session(host).request(method, url, **kwargs)
+        except Exception:
+            metrics.count_http(host, error=True)
+            raise
+        # urllib3 protokolliert jeden Retry in Retry.history der (letzten) Antwort
+        retry = getattr(resp.raw, "retries", None)
+        metrics.count_http(host, retries=len(getattr(retry, "history", ()) or ()))
+        return resp
+
+    def get(self, url: str, **kwargs: Any) -> "requests.Response":
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs: Any) -> "requests.Response":
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> "requests.Response":
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Connection-reuse counters per host.
+
+        Returns:
+            {host: {"requests": n, "connections": c, "reused": n - c}}
+            where "connections" counts newly opened TCP/TLS connections.
+        """
+        out: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            sessions = dict(self._sessions)
+        for host, sess in sessions.items():
+            req = conn = 0
+            # http:// und https:// teilen sich denselben Adapter → nur einmal zählen
+            adapters = {id(a): a for a in sess.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is not None:
+                        req += pool.num_requests
+                        conn += pool.num_connections
+            out[host] = {"requests": req, "connections": conn, "reused": max(0, req - conn)}
+        return out
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            for sess in self._sessions.values():
+                sess.close()
+            self._sessions.clear()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def configure_http(cfg: Optional[Dict[str, Any]] = None) -> HttpClient:
+    """
+    (Re-)create the shared client from the "http" section of config.json.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(cfg)
+        return _client
+
+
+def get_http() -> HttpClient:
+    """Return the shared client (created with defaults on first use)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -87,11 +87,12 @@ def setup_logging(cfg_log: Dict[str, Any]) -> logging.Logger:
 #from .logging_setup import setup_logging
 #from .utils import mask_secret
 
-logger = setup_logging({
-    "level": "DEBUG",
-    "to_file": True,
-    "file_path": "alerts.log",
-    "file_max_bytes": 2_000_000,
-    "file_backup_count": 5,
-})
-print(f"logger={logger}")
+if __name__ == "__main__":
+    logger = setup_logging({
+        "level": "DEBUG",
+        "to_file": True,
+        "file_path": "alerts.log",
+        "file_max_bytes": 2_000_000,
+        "file_backup_count": 5,
+    })
+    print(f"logger={logger}")
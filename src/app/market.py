@@ -1,7 +1,9 @@
 import time
-import yfinance as yf
 import logging
-from typing import Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .bar_store import BarStore
 
 logger = logging.getLogger("stock-alerts")
 
@@ -18,6 +20,8 @@ def get_open_and_last(ticker: str) -> Tuple[float, float]:
       2. If no intraday data is available (e.g., market closed),
          fall back to daily interval ("1d"). Fallback: Tagesdaten ("1d"). Wenn auch leer -> RuntimeError.
     """
+    import yfinance as yf  # lazy: yfinance/pandas erst beim ersten Abruf laden
+
     ticker = ticker.upper()
     intervals = ("1m", "5m", "15m")
 
@@ -64,10 +68,190 @@ def get_open_and_last(ticker: str) -> Tuple[float, float]:
     )
     return open_today, last_price
 
+
+# Gröbere Intervalle werden nur noch für Symbole ohne Daten abgefragt
+BATCH_INTERVALS = ("1m", "5m", "15m", "1d")
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    """Yield consecutive slices of at most `size` elements."""
+    size = max(1, int(size))
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _download_batch(symbols: List[str], interval: str, **window: Any):
+    """
+    Download today's bars for several symbols with a single Yahoo request.
+
+    Args:
+        symbols: Ticker symbols.
+        interval: Bar interval ("1m", "5m", ...).
+        **window: Time window for yf.download; default period="1d",
+                  or start=<unix ts> for an incremental fetch.
+
+    Returns:
+        DataFrame with (ticker, field) MultiIndex columns, or None on failure.
+    """
+    import yfinance as yf  # lazy: yfinance/pandas erst beim ersten Abruf laden
+    from .metrics import get_metrics
+
+    # yfinance fragt die Chart-API intern einmal pro Symbol ab
+    get_metrics().count_http("yahoo", calls=len(symbols))
+    window = window or {"period": "1d"}
+    try:
+        return yf.download(
+            symbols,
+            **window,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=False,
+            progress=False,
+            threads=True,
+        )
+    except Exception as e:
+        logger.warning("Batch download failed (%d symbols, %s): %s", len(symbols), interval, e)
+        return None
+
+
+def _symbol_frames(df, symbols: List[str]) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (symbol, frame) per symbol of a multi-symbol download.
+
+    Rows are aligned across all symbols of the batch, so NaN rows from other
+    venues are dropped per symbol; empty frames are skipped.
+    """
+    if df is None or df.empty:
+        return
+    multi = getattr(df.columns, "nlevels", 1) > 1
+    for sym in symbols:
+        if multi:
+            if sym not in df.columns.get_level_values(0):
+                continue
+            sub = df[sym]
+        elif len(symbols) == 1:
+            sub = df
+        else:
+            continue
+        sub = sub.dropna(subset=["Open", "Close"])
+        if not sub.empty:
+            yield sym, sub
+
+
+def _split_batch(df, symbols: List[str], interval: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Extract (open, last) per symbol from a multi-symbol download.
+    """
+    out: Dict[str, Tuple[float, float]] = {}
+    for sym, sub in _symbol_frames(df, symbols):
+        # Intraday: erstes Open des Tages; Tagesdaten: Open/Close der letzten Zeile
+        first = sub.iloc[-1] if interval == "1d" else sub.iloc[0]
+        out[sym] = (float(first["Open"]), float(sub.iloc[-1]["Close"]))
+    return out
+
+
+# Größere Lücke zum letzten gespeicherten Bar = neue Handelssitzung → vollen Tag laden
+SESSION_GAP_SEC = 8 * 3600
+
+
+def _update_bar_store(symbols: List[str], store: "BarStore", chunk_size: int) -> Dict[str, Tuple[float, float]]:
+    """
+    Bring the local 1m bar store up to date and read (open, last) from it.
+
+    Symbols with bars from the running session are fetched incrementally
+    (start = last stored bar + 1 min); all others get the full day. Only the
+    new bars are appended; open/last come from the memory-mapped day file.
+    """
+    from .bar_store import frame_to_bars, session_day
+
+    now = time.time()
+    latest = {s: store.latest(s) for s in symbols}
+    running = [s for s in symbols if latest[s][1] is not None and now - latest[s][1] < SESSION_GAP_SEC]
+    running_set = set(running)
+    groups: List[Tuple[List[str], Dict[str, Any]]] = [
+        (chunk, {}) for chunk in _chunks([s for s in symbols if s not in running_set], chunk_size)
+    ]
+    # Nach letztem Zeitstempel sortiert → ähnliche Startzeiten landen im selben Request
+    running.sort(key=lambda s: latest[s][1])
+    for chunk in _chunks(running, chunk_size):
+        groups.append((chunk, {"start": min(latest[s][1] for s in chunk) + 60}))
+
+    appended = 0
+    for chunk, window in groups:
+        df = _download_batch(chunk, "1m", **window)
+        for sym, sub in _symbol_frames(df, chunk):
+            bars = frame_to_bars(sub)
+            if not len(bars):
+                continue
+            day, last = latest[sym]
+            if day is None or int(bars["ts"][0]) - last >= SESSION_GAP_SEC:
+                day = session_day(sub)
+            appended += store.append(sym, day, bars)
+    logger.debug("Bar store: %d incremental / %d full symbol(s), %d new bar(s)",
+                 len(running), len(symbols) - len(running), appended)
+
+    out: Dict[str, Tuple[float, float]] = {}
+    for sym in symbols:
+        day, _ = store.latest(sym)
+        q = store.open_and_last(sym, day) if day else None
+        if q is not None:
+            out[sym] = q
+    return out
+
+
+def get_open_and_last_many(
+    tickers: Iterable[str],
+    *,
+    chunk_size: int = 100,
+    store: Optional["BarStore"] = None,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Retrieve today's open and latest price for many tickers at once.
+
+    Strategy:
+      1. One multi-symbol download per chunk of `chunk_size` tickers with "1m" bars.
+         With a bar store, 1m bars are persisted and later cycles only fetch
+         bars newer than the last stored timestamp.
+      2. Only symbols still without data are retried with "5m", "15m" and finally "1d".
+      3. Symbols without any data are missing from the result (logged as warning).
+
+    Args:
+        tickers: Ticker symbols (case-insensitive).
+        chunk_size: Max. symbols per Yahoo request.
+        store: Optional local bar store (see bar_store.BarStore).
+
+    Returns:
+        Mapping {TICKER (upper-case): (open, last)}.
+    """
+    symbols = list(dict.fromkeys(t.upper() for t in tickers))
+    result: Dict[str, Tuple[float, float]] = {}
+    missing = symbols
+    intervals = BATCH_INTERVALS
+
+    if store is not None and symbols:
+        result.update(_update_bar_store(symbols, store, chunk_size))
+        missing = [s for s in symbols if s not in result]
+        intervals = BATCH_INTERVALS[1:]
+
+    for interval in intervals:
+        if not missing:
+            break
+        for chunk in _chunks(missing, chunk_size):
+            df = _download_batch(chunk, interval)
+            result.update(_split_batch(df, chunk, interval))
+        missing = [s for s in missing if s not in result]
+        if missing:
+            logger.debug("No %s data for %d symbol(s): %s", interval, len(missing), ",".join(missing))
+
+    if missing:
+        logger.warning("No data available for %s", ",".join(missing))
+    return result
+
 #Mini-Beispiel
-#if __name__ == "__main__":
-logging.basicConfig(level=logging.DEBUG)
-o, last = get_open_and_last("AAPL")
-print("Open:", o, "Last:", last)
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    o, last = get_open_and_last("AAPL")
+    print("Open:", o, "Last:", last)
+    print("Batch:", get_open_and_last_many(["AAPL", "O", "WPY.F", "QDVX.DE"]))
 
   
@@ -0,0 +1,274 @@
+#Börsenkalender: Ticker-Suffix → Handelsplatz (Zeitzone, Handelszeiten, Feiertage).
+#run_once holt nur Kurse für Ticker, deren Börse gerade offen ist; sind alle zu,
+#entfällt der Zyklus ohne einen einzigen Request.
+#Feiertage werden pro Jahr einmal aus Regeln (fest, Ostern-relativ, n-ter Wochentag)
+#berechnet und zwischengespeichert.
+
+import datetime as dt
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# Handelszeiten als (Start, Ende) in lokaler Börsenzeit; mehrere Blöcke = Mittagspause
+Session = Tuple[dt.time, dt.time]
+
+
+def _t(s: str) -> dt.time:
+    h, m = s.split(":")
+    return dt.time(int(h), int(m))
+
+
+def easter(year: int) -> dt.date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return dt.date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> dt.date:
+    """n-th (1-based; -1 = last) weekday (Mon=0) of a month."""
+    if n > 0:
+        d = dt.date(year, month, 1)
+        d += dt.timedelta(days=(weekday - d.weekday()) % 7)
+        return d + dt.timedelta(weeks=n - 1)
+    nxt = dt.date(year + (month == 12), month % 12 + 1, 1)
+    d = nxt - dt.timedelta(days=1)
+    return d - dt.timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def _observed(d: dt.date) -> dt.date:
+    """US/UK style: Saturday → Friday before, Sunday → Monday after."""
+    if d.weekday() == 5:
+        return d - dt.timedelta(days=1)
+    if d.weekday() == 6:
+        return d + dt.timedelta(days=1)
+    return d
+
+
+def _us_holidays(y: int) -> List[dt.date]:
+    e = easter(y)
+    out = [
+        _nth_weekday(y, 1, 0, 3),            # Martin Luther King Jr. Day
+        _nth_weekday(y, 2, 0, 3),            # Washington's Birthday
+        e - dt.timedelta(days=2),            # Good Friday
+        _nth_weekday(y, 5, 0, -1),           # Memorial Day
+        _observed(dt.date(y, 7, 4)),         # Independence Day
+        _nth_weekday(y, 9, 0, 1),            # Labor Day
+        _nth_weekday(y, 11, 3, 4),           # Thanksgiving
+        _observed(dt.date(y, 12, 25)),       # Christmas
+    ]
+    if y >= 2022:
+        out.append(_observed(dt.date(y, 6, 19)))  # Juneteenth
+    ny = dt.date(y, 1, 1)
+    if ny.weekday() != 5:                    # NYSE: Neujahr auf Samstag wird nicht nachgeholt
+        out.append(_observed(ny))
+    return out
+
+
+def _de_holidays(y: int) -> List[dt.date]:
+    e = easter(y)
+    return [dt.date(y, 1, 1), e - dt.timedelta(days=2), e + dt.timedelta(days=1), dt.date(y, 5, 1),
+            dt.date(y, 12, 24), dt.date(y, 12, 25), dt.date(y, 12, 26), dt.date(y, 12, 31)]
+
+
+def _euronext_holidays(y: int) -> List[dt.date]:
+    e = easter(y)
+    return [dt.date(y, 1, 1), e - dt.timedelta(days=2), e + dt.timedelta(days=1), dt.date(y, 5, 1),
+            dt.date(y, 12, 25), dt.date(y, 12, 26)]
+
+
+def _uk_holidays(y: int) -> List[dt.date]:
+    e = easter(y)
+    xmas = dt.date(y, 12, 25)
+    boxing = dt.date(y, 12, 26)
+    if xmas.weekday() >= 5:                  # Ersatztage: beide auf Mo/Di
+        xmas, boxing = xmas + dt.timedelta(days=7 - xmas.weekday()), xmas + dt.timedelta(days=8 - xmas.weekday())
+    elif boxing.weekday() >= 5:
+        boxing += dt.timedelta(days=7 - boxing.weekday())
+    ny = dt.date(y, 1, 1)
+    if ny.weekday() >= 5:
+        ny += dt.timedelta(days=7 - ny.weekday())
+    return [ny, e - dt.timedelta(days=2), e + dt.timedelta(days=1), _nth_weekday(y, 5, 0, 1),
+            _nth_weekday(y, 5, 0, -1), _nth_weekday(y, 8, 0, -1), xmas, boxing]
+
+
+def _ch_holidays(y: int) -> List[dt.date]:
+    e = easter(y)
+    return [dt.date(y, 1, 1), dt.date(y, 1, 2), e - dt.timedelta(days=2), e + dt.timedelta(days=1),
+            e + dt.timedelta(days=39), e + dt.timedelta(days=50), dt.date(y, 5, 1), dt.date(y, 8, 1),
+            dt.date(y, 12, 24), dt.date(y, 12, 25), dt.date(y, 12, 26), dt.date(y, 12, 31)]
+
+
+def _it_holidays(y: int) -> List[dt.date]:
+    e = easter(y)
+    return [dt.date(y, 1, 1), e - dt.timedelta(days=2), e + dt.timedelta(days=1), dt.date(y, 5, 1),
+            dt.date(y, 8, 15), dt.date(y, 12, 24), dt.date(y, 12, 25), dt.date(y, 12, 26), dt.date(y, 12, 31)]
+
+
+def _ca_holidays(y: int) -> List[dt.date]:
+    e = easter(y)
+    may24 = dt.date(y, 5, 24)
+    return [_observed(dt.date(y, 1, 1)), _nth_weekday(y, 2, 0, 3), e - dt.timedelta(days=2),
+            may24 - dt.timedelta(days=may24.weekday()),  # Victoria Day: Montag vor dem 25. Mai
+            _observed(dt.date(y, 7, 1)), _nth_weekday(y, 8, 0, 1), _nth_weekday(y, 9, 0, 1),
+            _nth_weekday(y, 10, 0, 2), *_uk_holidays(y)[-2:]]  # Weihnachten/Boxing Day wie UK verschoben
+
+
+def _jp_holidays(y: int) -> List[dt.date]:
+    # Nur die festen Schließtage der JPX (Jahreswechsel); bewegliche Feiertage fehlen
+    return [dt.date(y, 1, 1), dt.date(y, 1, 2), dt.date(y, 1, 3), dt.date(y, 12, 31)]
+
+
+def _hk_holidays(y: int) -> List[dt.date]:
+    # Feste/Ostern-relative Feiertage; Mondkalender-Feiertage fehlen
+    e = easter(y)
+    return [dt.date(y, 1, 1), e - dt.timedelta(days=2), e - dt.timedelta(days=1), e + dt.timedelta(days=1),
+            dt.date(y, 5, 1), dt.date(y, 7, 1), dt.date(y, 10, 1), dt.date(y, 12, 25), dt.date(y, 12, 26)]
+
+
+@dataclass(frozen=True)
+class Exchange:
+    """
+    One trading venue.
+
+    Attributes:
+        code (str): Short name (e.g. "XETRA").
+        tz (str): IANA timezone of the venue.
+        sessions (Tuple[Session, ...]): Trading blocks in local time.
+        holidays (Optional[Callable]): year → list of closing days (None = no holidays).
+        weekdays (FrozenSet[int]): Trading weekdays (Mon=0).
+    """
+    code: str
+    tz: str
+    sessions: Tuple[Session, ...]
+    holidays: Optional[Callable[[int], List[dt.date]]] = None
+    weekdays: FrozenSet[int] = field(default=frozenset(range(5)))
+
+    def holiday_set(self, year: int) -> FrozenSet[dt.date]:
+        return _holiday_table(self.code, year)
+
+    def is_open(self, now: Optional[dt.datetime] = None, grace: dt.timedelta = dt.timedelta(0)) -> bool:
+        """
+        True if the venue trades at `now` (aware datetime; default: current time).
+
+        Args:
+            grace: Extra time after each session end (catch the closing print).
+        """
+        local = (now or dt.datetime.now(dt.timezone.utc)).astimezone(ZoneInfo(self.tz))
+        day = local.date()
+        if local.weekday() not in self.weekdays or day in self.holiday_set(day.year):
+            return False
+        t = local.replace(tzinfo=None)
+        for start, end in self.sessions:
+            if dt.datetime.combine(day, start) <= t < dt.datetime.combine(day, end) + grace:
+                return True
+        return False
+
+
+EXCHANGES: Dict[str, Exchange] = {
+    "US": Exchange("US", "America/New_York", ((_t("09:30"), _t("16:00")),), _us_holidays),
+    "XETRA": Exchange("XETRA", "Europe/Berlin", ((_t("09:00"), _t("17:30")),), _de_holidays),
+    # Börse Frankfurt / Stuttgart / Tradegate: Parketthandel bis 22:00
+    "FRA": Exchange("FRA", "Europe/Berlin", ((_t("08:00"), _t("22:00")),), _de_holidays),
+    "LSE": Exchange("LSE", "Europe/London", ((_t("08:00"), _t("16:30")),), _uk_holidays),
+    "EURONEXT": Exchange("EURONEXT", "Europe/Paris", ((_t("09:00"), _t("17:30")),), _euronext_holidays),
+    "SIX": Exchange("SIX", "Europe/Zurich", ((_t("09:00"), _t("17:30")),), _ch_holidays),
+    "MIL": Exchange("MIL", "Europe/Rome", ((_t("09:00"), _t("17:30")),), _it_holidays),
+    "TSX": Exchange("TSX", "America/Toronto", ((_t("09:30"), _t("16:00")),), _ca_holidays),
+    "JPX": Exchange("JPX", "Asia/Tokyo", ((_t("09:00"), _t("11:30")), (_t("12:30"), _t("15:30"))), _jp_holidays),
+    "HKEX": Exchange("HKEX", "Asia/Hong_Kong", ((_t("09:30"), _t("12:00")), (_t("13:00"), _t("16:00"))), _hk_holidays),
+    # Devisen (=X) fast rund um die Uhr werktags, Krypto (-USD/-EUR) immer
+    "FX": Exchange("FX", "UTC", ((dt.time.min, dt.time.max),)),
+    "CRYPTO": Exchange("CRYPTO", "UTC", ((dt.time.min, dt.time.max),), weekdays=frozenset(range(7))),
+}
+
+# Yahoo-Suffix → Börse ("" = ohne Suffix → US)
+SUFFIXES: Dict[str, str] = {
+    "": "US",
+    ".DE": "XETRA",
+    ".F": "FRA", ".SG": "FRA", ".MU": "FRA", ".BE": "FRA", ".DU": "FRA", ".HM": "FRA", ".HA": "FRA",
+    ".L": "LSE", ".IL": "LSE",
+    ".PA": "EURONEXT", ".AS": "EURONEXT", ".BR": "EURONEXT", ".LS": "EURONEXT",
+    ".SW": "SIX",
+    ".MI": "MIL",
+    ".TO": "TSX", ".V": "TSX",
+    ".T": "JPX",
+    ".HK": "HKEX",
+}
+
+
+@lru_cache(maxsize=256)
+def _holiday_table(code: str, year: int) -> FrozenSet[dt.date]:
+    rule = EXCHANGES[code].holidays
+    return frozenset(rule(year)) if rule else frozenset()
+
+
+def exchange_for(ticker: str, overrides: Optional[Dict[str, str]] = None) -> Optional[Exchange]:
+    """
+    Map a Yahoo ticker to its venue.
+
+    Args:
+        ticker: e.g. "AAPL", "QDVX.DE", "WPY.F", "BTC-USD", "EURUSD=X".
+        overrides: Optional {ticker: exchange code} from config (case-insensitive).
+
+    Returns:
+        Exchange, or None if the venue is unknown (indices "^...", unknown suffixes).
+    """
+    t = ticker.upper()
+    if overrides:
+        code = {k.upper(): v for k, v in overrides.items()}.get(t)
+        if code:
+            return EXCHANGES.get(code.upper())
+    if t.endswith("=X"):
+        return EXCHANGES["FX"]
+    if t.endswith(("-USD", "-EUR")):
+        return EXCHANGES["CRYPTO"]
+    if t.startswith("^"):
+        return None
+    dot = t.rfind(".")
+    suffix = t[dot:] if dot > 0 else ""
+    code = SUFFIXES.get(suffix)
+    return EXCHANGES.get(code) if code else None
+
+
+def open_tickers(
+    tickers: Iterable[str],
+    *,
+    now: Optional[dt.datetime] = None,
+    overrides: Optional[Dict[str, str]] = None,
+    grace_min: float = 0.0,
+    unknown_open: Callable[[], bool] = lambda: True,
+) -> List[str]:
+    """
+    Tickers whose venue is open at `now` (order preserved).
+
+    Each venue is checked once per call; tickers with an unknown venue are
+    included if unknown_open() is true (callers pass the global market-hours
+    window as fallback).
+    """
+    now = now or dt.datetime.now(dt.timezone.utc)
+    grace = dt.timedelta(minutes=grace_min)
+    state: Dict[str, bool] = {}
+    fallback: Optional[bool] = None
+    out: List[str] = []
+    for tk in tickers:
+        ex = exchange_for(tk, overrides)
+        if ex is None:
+            if fallback is None:
+                fallback = bool(unknown_open())
+            if fallback:
+                out.append(tk)
+            continue
+        if ex.code not in state:
+            state[ex.code] = ex.is_open(now, grace)
+        if state[ex.code]:
+            out.append(tk)
+    return out
@@ -0,0 +1,203 @@
+#Austauschbare Kursquelle für run_once (Auswahl über config.json "market_data"):
+#  - yfinance: Live-Abruf über market.get_open_and_last_many (Standard)
+#  - record:   wie yfinance, schreibt aber jede Antwort in eine Kassette (JSON Lines)
+#  - replay:   spielt eine Kassette offline und deterministisch ab (Benchmarks, Regressionstests)
+
+from __future__ import annotations
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .bar_store import configure_bar_store
+
+logger = logging.getLogger("stock-alerts")
+
+Quotes = Dict[str, Tuple[float, float]]
+
+DEFAULT_MARKET_DATA_CFG: Dict[str, Any] = {
+    "provider": "yfinance",             # "yfinance" | "record" | "replay"
+    "cassette": "market_cassette.jsonl",  # Recording target / replay source
+    "chunk_size": 100,                  # Max. symbols per Yahoo request (yfinance/record)
+    "replay_loop": True,                # Replay: start over after the last frame (else repeat it)
+    "bar_store": {"enabled": False},    # Local 1m bar store for incremental fetches (see bar_store.py)
+}
+
+CASSETTE_VERSION = 1
+
+
+class MarketDataProvider:
+    """
+    Source of (open, last) quotes for a cycle.
+
+    Subclasses implement get_open_and_last_many(); run_once only talks to
+    this interface, so the source can be swapped via config.json.
+    """
+
+    name = "base"
+
+    def get_open_and_last_many(self, tickers: Iterable[str]) -> Quotes:
+        """
+        Return today's open and latest price for many tickers.
+
+        Returns:
+            Mapping {TICKER (upper-case): (open, last)}; tickers without data are missing.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources (files, sessions)."""
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live quotes from Yahoo Finance (batched multi-symbol downloads)."""
+
+    name = "yfinance"
+
+    def __init__(self, chunk_size: int = 100) -> None:
+        self.chunk_size = int(chunk_size)
+
+    def get_open_and_last_many(self, tickers: Iterable[str]) -> Quotes:
+        from .bar_store import get_bar_store
+        from .market import get_open_and_last_many
+        return get_open_and_last_many(tickers, chunk_size=self.chunk_size, store=get_bar_store())
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Wrap another provider and append every response to a cassette file.
+
+    Cassette format (JSON Lines, one frame per call):
+        {"v": 1, "ts": 1760000000.0, "quotes": {"AAPL": [230.1, 232.4], ...}}
+    """
+
+    name = "record"
+
+    def __init__(self, inner: MarketDataProvider, path: str | Path) -> None:
+        self.inner = inner
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    def get_open_and_last_many(self, tickers: Iterable[str]) -> Quotes:
+        quotes = self.inner.get_open_and_last_many(tickers)
+        frame = {"v": CASSETTE_VERSION, "ts": round(time.time(), 3),
+                 "quotes": {tk: [o, last] for tk, (o, last) in quotes.items()}}
+        with self._lock:
+            self._fh.write(json.dumps(frame, separators=(",", ":")) + "\n")
+            self._fh.flush()  # Frame sofort auf Platte: Abbruch verliert höchstens den laufenden Zyklus
+        return quotes
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+        self.inner.close()
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serve recorded frames from memory: call n returns frame n (filtered to
+    the requested tickers). After the last frame, replay starts over
+    (loop=True) or keeps returning the last frame.
+    """
+
+    name = "replay"
+
+    def __init__(self, path: str | Path, loop: bool = True) -> None:
+        self.path = Path(path)
+        self.loop = loop
+        self.frames: List[Quotes] = load_cassette(self.path)
+        if not self.frames:
+            raise RuntimeError(f"Cassette {self.path} contains no frames")
+        self._pos = 0
+        self._lock = threading.Lock()
+
+    def get_open_and_last_many(self, tickers: Iterable[str]) -> Quotes:
+        with self._lock:
+            frame = self.frames[self._pos]
+            if self._pos + 1 < len(self.frames):
+                self._pos += 1
+            elif self.loop:
+                self._pos = 0
+        out: Quotes = {}
+        for tk in dict.fromkeys(t.upper() for t in tickers):
+            q = frame.get(tk)
+            if q is not None:
+                out[tk] = q
+        return out
+
+
+def load_cassette(path: str | Path) -> List[Quotes]:
+    """
+    Read a cassette into memory; broken lines are skipped with a warning.
+
+    Returns:
+        List of frames {TICKER: (open, last)} in recording order.
+    """
+    frames: List[Quotes] = []
+    with Path(path).open("r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)["quotes"]
+                frames.append({tk: (float(q[0]), float(q[1])) for tk, q in raw.items()})
+            except Exception as e:
+                logger.warning("Cassette %s line %d skipped: %s", path, n, e)
+    return frames
+
+
+def _make_yfinance(c: Dict[str, Any]) -> MarketDataProvider:
+    return YFinanceProvider(chunk_size=c["chunk_size"])
+
+
+def _make_record(c: Dict[str, Any]) -> MarketDataProvider:
+    return RecordingProvider(YFinanceProvider(chunk_size=c["chunk_size"]), c["cassette"])
+
+
+def _make_replay(c: Dict[str, Any]) -> MarketDataProvider:
+    return ReplayProvider(c["cassette"], loop=bool(c["replay_loop"]))
+
+
+PROVIDERS: Dict[str, Callable[[Dict[str, Any]], MarketDataProvider]] = {
+    "yfinance": _make_yfinance,
+    "record": _make_record,
+    "replay": _make_replay,
+}
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def configure_market_data(cfg: Optional[Dict[str, Any]] = None) -> MarketDataProvider:
+    """
+    (Re-)create the shared provider from the "market_data" section of config.json.
+
+    Raises:
+        RuntimeError: Unknown provider name or unusable cassette.
+    """
+    global _provider
+    c = {**DEFAULT_MARKET_DATA_CFG, **(cfg or {})}
+    configure_bar_store(c["bar_store"])
+    factory = PROVIDERS.get(str(c["provider"]).lower())
+    if factory is None:
+        raise RuntimeError(f"Unknown market_data.provider {c['provider']!r} (choose from {', '.join(PROVIDERS)})")
+    with _provider_lock:
+        if _provider is not None:
+            _provider.close()
+        _provider = factory(c)
+        logger.debug("Market data provider: %s", _provider.name)
+        return _provider
+
+
+def get_market_data() -> MarketDataProvider:
+    """Return the shared provider (yfinance with defaults if not configured)."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = _make_yfinance(DEFAULT_MARKET_DATA_CFG)
+        return _provider
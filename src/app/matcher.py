@@ -0,0 +1,96 @@
+#Schlagzeilen → Ticker: vorkompilierter Token-Index statt Substring-Suche.
+#Keywords (auto_keywords) werden einmal pro Zyklus in Token-Phrasen zerlegt;
+#ein Durchlauf über die Tokens eines Titels liefert alle passenden Ticker.
+#Treffer nur an Wortgrenzen ("O" trifft nicht mehr jedes "o" im Titel).
+
+import re
+from typing import Container, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Wort-Tokens inkl. Apostroph im Wort (O'Reilly); Possessiv-'s wird abgeschnitten (Apple's → apple)
+_TOKEN = re.compile(r"\w+(?:['’]\w+)*")
+_POSSESSIVE = ("'s", "’s")
+
+# Kurze Symbole (≤ 2 Zeichen, z. B. "O", "F", "GE") nur in exakter Schreibweise
+SHORT_KEYWORD_LEN = 2
+
+STRONG, WEAK = 0, 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Word tokens of `text` in original case (possessive 's removed)."""
+    out = []
+    for tok in _TOKEN.findall(text):
+        if tok.endswith(_POSSESSIVE) and len(tok) > 2:
+            tok = tok[:-2]
+        out.append(tok)
+    return out
+
+
+class KeywordMatcher:
+    """
+    Word-boundary keyword matcher for many tickers at once.
+
+    Every keyword becomes a token phrase ("Deutsche Telekom" → deutsche,
+    telekom; "SAP.DE" → sap, de) indexed by its first token, so matching a
+    title costs one pass over its tokens plus the few phrases starting with
+    each token — independent of the number of tickers and keywords.
+    Keywords are case-insensitive, except short symbols (≤ 2 characters),
+    which must appear exactly as written ("O" matches "O" but not "o").
+
+    Tiers as in news.route_items: the full name or a ticker symbol is STRONG,
+    a single word of the name is WEAK. match() and filter() accept both
+    tiers; assign() routes only on STRONG hits.
+
+    Example:
+        >>> m = KeywordMatcher({"O": ("Realty Income", ["Realty Income", "Realty", "Income", "O"])})
+        >>> m.match("Realty Income raises its dividend")
+        {'O': 0}
+        >>> m.match("Oil prices go up")
+        {}
+    """
+
+    def __init__(self, companies: Mapping[str, Tuple[str, Iterable[str]]]) -> None:
+        # erstes Token → [(restliche Tokens, Ticker, Tier)]
+        self._index: Dict[str, List[Tuple[Tuple[str, ...], str, int]]] = {}
+        self._exact: Dict[str, List[Tuple[Tuple[str, ...], str, int]]] = {}
+        self.tickers: List[str] = list(companies)
+        for tk, (name, keywords) in companies.items():
+            words = {w.lower() for w in (name or "").split()}
+            symbols = {tk, tk.split(".")[0]}  # Symbol bleibt STRONG, auch wenn es ein Namenswort ist (META)
+            for kw in keywords:
+                kw = (kw or "").strip()
+                if not kw:
+                    continue
+                strong = kw in symbols or kw.lower() == (name or "").lower() or kw.lower() not in words
+                tier = STRONG if strong else WEAK
+                exact = len(kw) <= SHORT_KEYWORD_LEN
+                toks = tokenize(kw) if exact else [t.lower() for t in tokenize(kw)]
+                if toks:
+                    index = self._exact if exact else self._index
+                    index.setdefault(toks[0], []).append((tuple(toks[1:]), tk, tier))
+
+    def match(self, title: str) -> Dict[str, int]:
+        """{ticker: best tier} of all tickers with a keyword in `title`."""
+        raw = tokenize(title or "")
+        low = [t.lower() for t in raw]
+        found: Dict[str, int] = {}
+        for tokens, index in ((low, self._index), (raw, self._exact)):
+            if not index:
+                continue
+            for i, tok in enumerate(tokens):
+                for rest, tk, tier in index.get(tok, ()):
+                    if rest and tuple(tokens[i + 1:i + 1 + len(rest)]) != rest:
+                        continue
+                    if tier < found.get(tk, WEAK + 1):
+                        found[tk] = tier
+        return found
+
+    def assign(self, title: str, among: Optional[Container[str]] = None) -> List[str]:
+        """Tickers with a STRONG hit in `title` (see news.route_items), optionally only `among`."""
+        found = self.match(title)
+        # Nur ein Namensbestandteil ("Deutsche") reicht nicht für eine Zuordnung
+        return [tk for tk, tier in found.items() if tier == STRONG and (among is None or tk in among)]
+
+    def filter(self, items: Sequence[Dict[str, str]], ticker: str) -> List[Dict[str, str]]:
+        """Items whose title matches any keyword of `ticker` (word-boundary filter_titles)."""
+        return [it for it in items if ticker in self.match(it.get("title") or "")]
@@ -0,0 +1,202 @@
+#Laufzeit-Metriken pro Zyklus: Spans/Histogramme pro Stufe (und Ticker),
+#HTTP-Aufrufe/Retries pro Upstream; Export als Prometheus-Textfile + JSON-Summary.
+#Abgeschaltet kostet ein Span nur einen Attribut-Check (geteilter No-op-Kontext).
+
+from __future__ import annotations
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .utils import atomic_write_json
+
+logger = logging.getLogger("stock-alerts")
+
+DEFAULT_METRICS_CFG: Dict[str, Any] = {
+    "enabled": False,
+    "prom_file": "metrics/stock_alerts.prom",   # node_exporter textfile collector format
+    "summary_file": "metrics/last_run.json",    # JSON summary of the last cycle
+}
+
+# Histogram-Grenzen in Sekunden (Prometheus "le"-Buckets)
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_NOOP = nullcontext()
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed BUCKETS (plus sum/count/max)."""
+
+    __slots__ = ("counts", "sum", "count", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+        for i, le in enumerate(BUCKETS):
+            if value <= le:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[int]:
+        out, acc = [], 0
+        for c in self.counts:
+            acc += c
+            out.append(acc)
+        return out
+
+
+class Metrics:
+    """
+    Collects spans and counters for one cycle.
+
+    Example:
+        >>> m = Metrics(enabled=True)
+        >>> with m.span("fetch_headlines", "AAPL"):
+        ...     pass
+        >>> m.count_http("news.google.com", retries=1)
+        >>> m.export()   # writes prom_file + summary_file, then resets
+
+    With enabled=False, span() returns a shared no-op context manager and
+    all other methods return immediately.
+    """
+
+    def __init__(self, enabled: bool = False, prom_file: Optional[str] = None,
+                 summary_file: Optional[str] = None) -> None:
+        self.enabled = bool(enabled)
+        self.prom_file = Path(prom_file) if prom_file else None
+        self.summary_file = Path(summary_file) if summary_file else None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new cycle (counters are per cycle; Prometheus sees gauges of the last run)."""
+        with self._lock:
+            self.stages: Dict[str, Histogram] = defaultdict(Histogram)
+            self.tickers: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+            self.http: Dict[str, Dict[str, int]] = defaultdict(lambda: {"calls": 0, "retries": 0, "errors": 0})
+            self.started = time.time()
+
+    def span(self, stage: str, ticker: Optional[str] = None):
+        """Context manager timing one stage (optionally attributed to a ticker)."""
+        if not self.enabled:
+            return _NOOP
+        return self._span(stage, ticker)
+
+    @contextmanager
+    def _span(self, stage: str, ticker: Optional[str]) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t0, ticker)
+
+    def observe(self, stage: str, seconds: float, ticker: Optional[str] = None) -> None:
+        """Record a duration measured elsewhere."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.stages[stage].observe(seconds)
+            if ticker:
+                self.tickers[ticker][stage] += seconds
+
+    def count_http(self, upstream: str, *, calls: int = 1, retries: int = 0, error: bool = False) -> None:
+        """Count outbound calls (and urllib3 retries / failed calls) per upstream host."""
+        if not self.enabled:
+            return
+        with self._lock:
+            c = self.http[upstream]
+            c["calls"] += calls
+            c["retries"] += retries
+            c["errors"] += int(error)
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly view of the current cycle."""
+        with self._lock:
+            return {
+                "started": self.started,
+                "duration_sec": round(time.time() - self.started, 4),
+                "stages": {
+                    s: {"count": h.count, "sum_sec": round(h.sum, 6), "max_sec": round(h.max, 6),
+                        "avg_sec": round(h.sum / h.count, 6) if h.count else 0.0}
+                    for s, h in sorted(self.stages.items())
+                },
+                "tickers": {tk: {s: round(v, 6) for s, v in st.items()} for tk, st in sorted(self.tickers.items())},
+                "http": {u: dict(c) for u, c in sorted(self.http.items())},
+            }
+
+    def prometheus(self) -> str:
+        """Render stage histograms and HTTP counters in Prometheus text format.
+
+        Per-ticker timings are only in the JSON summary (label cardinality).
+        """
+        lines = [
+            "# HELP stock_alerts_stage_seconds Duration of run_once stages in the last cycle.",
+            "# TYPE stock_alerts_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self.stages.items()):
+                for le, c in zip(BUCKETS, h.cumulative()):
+                    lines.append(f'stock_alerts_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {c}')
+                lines.append(f'stock_alerts_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'stock_alerts_stage_seconds_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'stock_alerts_stage_seconds_count{{stage="{stage}"}} {h.count}')
+            lines += ["# HELP stock_alerts_http_requests Outbound HTTP calls per upstream in the last cycle.",
+                      "# TYPE stock_alerts_http_requests gauge"]
+            for up, c in sorted(self.http.items()):
+                lines.append(f'stock_alerts_http_requests{{upstream="{up}"}} {c["calls"]}')
+            lines += ["# HELP stock_alerts_http_retries Retries (urllib3) per upstream in the last cycle.",
+                      "# TYPE stock_alerts_http_retries gauge"]
+            for up, c in sorted(self.http.items()):
+                lines.append(f'stock_alerts_http_retries{{upstream="{up}"}} {c["retries"]}')
+            lines += ["# HELP stock_alerts_http_errors Failed HTTP calls per upstream in the last cycle.",
+                      "# TYPE stock_alerts_http_errors gauge"]
+            for up, c in sorted(self.http.items()):
+                lines.append(f'stock_alerts_http_errors{{upstream="{up}"}} {c["errors"]}')
+            lines += ["# HELP stock_alerts_last_run_timestamp_seconds Start of the last cycle.",
+                      "# TYPE stock_alerts_last_run_timestamp_seconds gauge",
+                      f"stock_alerts_last_run_timestamp_seconds {self.started:.3f}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> None:
+        """Write the Prometheus textfile and JSON summary (atomically), then reset."""
+        if not self.enabled:
+            return
+        try:
+            if self.summary_file:
+                atomic_write_json(self.summary_file, self.summary())
+            if self.prom_file:
+                # Textfile-Collector liest nur *.prom → über Temp-Datei + rename schreiben
+                self.prom_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.prom_file.with_name(self.prom_file.name + ".tmp")
+                tmp.write_text(self.prometheus(), encoding="utf-8")
+                tmp.replace(self.prom_file)
+        except Exception as e:
+            logger.warning("Failed to export metrics: %s", e)
+        self.reset()
+
+
+_metrics = Metrics(enabled=False)
+
+
+def configure_metrics(cfg: Optional[Dict[str, Any]] = None) -> Metrics:
+    """(Re-)create the shared collector from the "metrics" section of config.json."""
+    global _metrics
+    c = {**DEFAULT_METRICS_CFG, **(cfg or {})}
+    _metrics = Metrics(enabled=c["enabled"], prom_file=c["prom_file"], summary_file=c["summary_file"])
+    return _metrics
+
+
+def get_metrics() -> Metrics:
+    """Return the shared collector (disabled unless configured)."""
+    return _metrics
@@ -1,8 +1,16 @@
 from __future__ import annotations
 import datetime as dt
-from typing import List, Dict, Iterable
+import logging
+from typing import Any, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 from urllib.parse import quote_plus
-import feedparser
+
+from .cache import get_feed_cache
+from .http_client import get_http
+from .matcher import KeywordMatcher
+
+logger = logging.getLogger("stock-alerts")
+
+FINANCE_TERMS = ["stock", "shares", "earnings", "analyst", "forecast", "upgrade", "downgrade"]
 
 
 def build_query(name: str, ticker: str) -> str:
@@ -11,9 +19,8 @@ def build_query(name: str, ticker: str) -> str:
     Beispiel: "Microsoft MSFT stock OR shares OR earnings OR analyst"
     """
     # TODO: Return a query combining company name, ticker, and finance keywords
-    base_terms = ["stock", "shares", "earnings", "analyst", "forecast", "upgrade", "downgrade"]
     # Name + Ticker + einige Finanz-Schlüsselwörter, mit OR verknüpft
-    kw = " OR ".join(base_terms)
+    kw = " OR ".join(FINANCE_TERMS)
     # etwas „noise“ vermeiden: bevorzugt Finanzkontext
     return f'{name} {ticker} ({kw})'
 
@@ -21,19 +28,136 @@ def build_query(name: str, ticker: str) -> str:
 def filter_titles(items: List[Dict[str, str]], required_keywords: Iterable[str] = ()) -> List[Dict[str, str]]:
     """
     Filter news items so that only those containing required keywords
-    in their title are kept (case-insensitive). If no keywords given, return as-is.
+    in their title are kept (case-insensitive, whole words; short symbols
+    like "O" only in exact case, see matcher.KeywordMatcher). If no keywords
+    given, return as-is.
     """
     # TODO: If no required keywords, return items unchanged
     # TODO: Otherwise, keep only items whose title contains any keyword (case-insensitive)
-    req = [k.strip().lower() for k in required_keywords or [] if k.strip()]
+    req = [k.strip() for k in required_keywords or [] if k.strip()]
     if not req:
         return items
+    return KeywordMatcher({"": ("", req)}).filter(items, "")
+
+
+def build_group_query(companies: Sequence[Tuple[str, str]]) -> str:
+    """
+    Build one Google News query for several companies (OR over the per-company terms).
+    Beispiel: "(Microsoft MSFT) OR (Apple AAPL) (stock OR shares OR ...)"
+    """
+    # Klammern im Namen würden die Gruppierung brechen
+    parts = [f"({' '.join(name.replace('(', ' ').replace(')', ' ').split())} {ticker})" for name, ticker in companies]
+    return f'{" OR ".join(parts)} ({" OR ".join(FINANCE_TERMS)})'
+
+
+def group_companies(
+    companies: Sequence[Tuple[str, str]],
+    max_size: int = 8,
+    max_url_len: int = 1800,
+    lang: str = "de",
+    country: str = "DE",
+) -> List[List[Tuple[str, str]]]:
+    """
+    Pack (name, ticker) pairs greedily into groups for build_group_query.
+
+    A group is closed when it holds max_size companies or one more would push
+    the RSS URL beyond max_url_len characters; a single company always forms
+    a group of its own, however long its URL.
+    """
+    groups: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    for company in companies:
+        candidate = current + [company]
+        url = _google_news_rss_url(build_group_query(candidate), lang=lang, country=country)
+        if current and (len(candidate) > max_size or len(url) > max_url_len):
+            groups.append(current)
+            candidate = [company]
+        current = candidate
+    if current:
+        groups.append(current)
+    return groups
 
-    out: List[Dict[str, str]] = []
+
+def route_items(
+    items: List[Dict[str, str]],
+    companies: Dict[str, Tuple[str, List[str]]],
+    limit: int = 2,
+    matcher: Optional[KeywordMatcher] = None,
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Assign the entries of a grouped feed back to tickers via their keywords.
+
+    Matching works on whole words like filter_titles, in two tiers: only
+    the full name or a ticker symbol routes an entry, a single word of a
+    name does not, so "Deutsche Telekom …" goes to DTE.DE only, not to
+    DBK.DE via "Deutsche". An entry goes to every ticker with such a hit;
+    each ticker keeps its first `limit` entries in feed order.
+
+    Args:
+        items: Entries as returned by fetch_headlines (title/link/source/published).
+        companies: {ticker: (display name, required keywords)} (see company.auto_keywords).
+        limit: Max. entries per ticker.
+        matcher: Prebuilt matcher covering (at least) these companies; built here if None.
+    """
+    matcher = matcher or KeywordMatcher(companies)
+    out: Dict[str, List[Dict[str, str]]] = {tk: [] for tk in companies}
     for it in items:
-        title = (it.get("title") or "").lower()
-        if any(k in title for k in req):
-            out.append(it)
+        for tk in matcher.assign(it.get("title") or "", among=out):
+            if len(out[tk]) < limit:
+                out[tk].append(it)
+    return out
+
+
+def fetch_headlines_grouped(
+    companies: Dict[str, Tuple[str, List[str]]],
+    limit: int = 2,
+    lookback_hours: int = 12,
+    lang: str = "de",
+    country: str = "DE",
+    max_size: int = 8,
+    max_url_len: int = 1800,
+    workers: int = 1,
+    matcher: Optional[KeywordMatcher] = None,
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Fetch headlines for many tickers with one RSS request per group of companies.
+
+    Companies are packed into OR-queries (group_companies), every feed is
+    downloaded once and its entries are routed back via route_items; the
+    result per ticker is already keyword-filtered (like filter_titles on the
+    per-ticker path).
+
+    Args:
+        companies: {ticker: (display name, required keywords)} (see company.auto_keywords).
+        workers: Groups fetched concurrently (pooled HTTP client).
+        matcher: Matcher built once per cycle from all companies (built here if None).
+
+    Returns:
+        {ticker: [items]} for all tickers (empty list if nothing matched).
+    """
+    # Feste Reihenfolge → gleiche Gruppen/URLs in Folgezyklen (Feed-Cache-Treffer)
+    pairs = sorted((name, tk) for tk, (name, _) in companies.items())
+    groups = group_companies([(name, tk) for name, tk in pairs], max_size=max_size,
+                             max_url_len=max_url_len, lang=lang, country=country)
+    matcher = matcher or KeywordMatcher(companies)
+
+    def _one(group: List[Tuple[str, str]]) -> Dict[str, List[Dict[str, str]]]:
+        members = {tk: companies[tk] for _, tk in group}
+        query = build_query(*group[0]) if len(group) == 1 else build_group_query(group)
+        # limit=None: alle Einträge des Feeds, das Limit gilt pro Ticker
+        items = fetch_headlines(query, limit=None, lookback_hours=lookback_hours, lang=lang, country=country)
+        return route_items(items, members, limit=limit, matcher=matcher)
+
+    out: Dict[str, List[Dict[str, str]]] = {}
+    if workers > 1 and len(groups) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(workers, len(groups)), thread_name_prefix="news") as pool:
+            for part in pool.map(_one, groups):
+                out.update(part)
+    else:
+        for group in groups:
+            out.update(_one(group))
+    logger.debug("Grouped news: %d ticker(s) in %d request(s).", len(companies), len(groups))
     return out
 
 
@@ -54,9 +178,177 @@ def _google_news_rss_url(query: str, lang: str = "de", country: str = "DE") -> s
     
 
 
+def _download_feed(url: str) -> bytes:
+    """
+    Download a feed body, served from the on-disk feed cache when possible.
+
+    - Fresh cache entry (within ttl_sec): no request at all
+    - Stale entry: conditional GET (If-None-Match / If-Modified-Since); 304 → cached body
+    - Otherwise: full download, stored in the cache
+
+    Raises:
+        requests.RequestException on network/HTTP errors without a cached fallback.
+    """
+    cache = get_feed_cache()
+    cached = cache.get(url) if cache else None
+    if cached is not None and cached.is_fresh(cache.ttl_sec):
+        return cached.body
+
+    headers: Dict[str, str] = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    resp = get_http().get(url, headers=headers)
+    if resp.status_code == 304 and cached is not None:
+        cache.touch(url)
+        return cached.body
+    resp.raise_for_status()
+    if cache is not None:
+        cache.put(url, resp.content, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    return resp.content
+
+
+FEED_CHUNK_SIZE = 16 * 1024
+
+
+class _FeedBody:
+    """
+    Feed bytes handed to the parser chunk by chunk.
+
+    Either a complete body (feed cache, which needs the whole body for its
+    ETag/conditional-GET entry anyway) or a streamed response: if the
+    parser stops early, the rest is never read and close() drops the
+    connection. body() returns everything (reading the rest) for the
+    feedparser fallback.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], response: Any = None) -> None:
+        self._rest: Iterator[bytes] = iter(chunks)
+        self._read: List[bytes] = []
+        self._response = response
+        self.bytes_read = 0
+
+    def chunks(self) -> Iterator[bytes]:
+        for chunk in self._rest:
+            self._read.append(chunk)
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    def body(self) -> bytes:
+        for _ in self.chunks():
+            pass
+        return b"".join(self._read)
+
+    def close(self) -> None:
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+
+def _open_feed(url: str) -> _FeedBody:
+    """
+    Open a feed: from the feed cache (see _download_feed) or, with caching
+    disabled, as a streamed response that is only read as far as parsed.
+
+    Raises:
+        requests.RequestException on network/HTTP errors.
+    """
+    if get_feed_cache() is not None:
+        body = _download_feed(url)
+        return _FeedBody(body[i:i + FEED_CHUNK_SIZE] for i in range(0, len(body), FEED_CHUNK_SIZE))
+    resp = get_http().get(url, stream=True)
+    try:
+        resp.raise_for_status()
+    except Exception:
+        resp.close()
+        raise
+    return _FeedBody(resp.iter_content(FEED_CHUNK_SIZE), resp)
+
+
+def _parse_rss(chunks: Iterable[bytes], lookback_hours: int, limit: Optional[int]) -> List[Dict[str, str]]:
+    """
+    Incremental RSS 2.0 parser: only title/link/source/pubDate of each <item>.
+
+    Items are dropped from the tree as soon as they are read, and parsing
+    stops (without reading further chunks) once `limit` items within
+    `lookback_hours` are found. Items without a parsable pubDate are kept,
+    as in the feedparser path.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: Malformed XML.
+        ValueError: The document is not RSS 2.0 (e.g. Atom).
+    """
+    from email.utils import parsedate_to_datetime
+    from xml.etree.ElementTree import XMLPullParser
+
+    parser = XMLPullParser(events=("start", "end"))
+    now = dt.datetime.now(dt.timezone.utc)
+    horizon = dt.timedelta(hours=lookback_hours)
+    results: List[Dict[str, str]] = []
+    root = channel = None
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                    if elem.tag != "rss":
+                        raise ValueError(f"not an RSS 2.0 feed (root <{elem.tag}>)")
+                elif elem.tag == "channel" and channel is None:
+                    channel = elem
+                continue
+            if elem.tag != "item":
+                continue
+
+            published = (elem.findtext("pubDate") or "").strip()
+            item = {
+                "title": (elem.findtext("title") or "").strip(),
+                "link": (elem.findtext("link") or "").strip(),
+                "source": (elem.findtext("source") or "").strip(),
+                "published": published,
+            }
+            # gelesene Items nicht im Baum behalten → Speicher konstant
+            elem.clear()
+            if channel is not None:
+                channel.remove(elem)
+
+            try:
+                published_dt = parsedate_to_datetime(published) if published else None
+            except (TypeError, ValueError):
+                published_dt = None
+            if published_dt is not None:
+                if published_dt.tzinfo is None:
+                    published_dt = published_dt.replace(tzinfo=dt.timezone.utc)
+                if now - published_dt > horizon:
+                    continue
+
+            results.append(item)
+            if limit is not None and len(results) >= limit:
+                return results  # Rest des Feeds wird nicht mehr gelesen
+    parser.close()
+    if root is None:
+        raise ValueError("empty feed")
+    return results
+
+
+def _parse_feed(feed: _FeedBody, lookback_hours: int, limit: Optional[int]) -> List[Dict[str, str]]:
+    """Streaming parse (_parse_rss); feedparser on the full body if the feed is malformed or not RSS 2.0."""
+    from xml.etree.ElementTree import ParseError
+
+    try:
+        return _parse_rss(feed.chunks(), lookback_hours, limit)
+    except (ParseError, ValueError) as e:
+        logger.debug("Streaming RSS parse failed (%s), falling back to feedparser", e)
+        return _parse_feedparser(feed.body(), lookback_hours, limit)
+
+
 def fetch_headlines(
     query: str,
-    limit: int = 2,
+    limit: Optional[int] = 2,
     lookback_hours: int = 12,
     lang: str = "de",
     country: str = "DE",
@@ -65,14 +357,34 @@ def fetch_headlines(
     Fetch latest headlines from Google News RSS for a given query.
     - serverseitige Einschränkung per 'when:12h' in der URL
     - zusätzlich clientseitiger Filter via lookback_hours
+    - limit=None liefert alle Einträge (gruppierte Abfragen, siehe fetch_headlines_grouped)
     """
     # TODO: Build the RSS URL via _google_news_rss_url and parse it with feedparser
     # TODO: Filter entries by publication time (lookback_hours) and collect title/source/link
     # TODO: Stop after collecting 'limit' items
+    import requests
+
     url = _google_news_rss_url(query, lang=lang, country=country)
     #print(f"url={url}")
     #=> https://news.google.com/rss/search?q=Microsoft+MSFT+%28stock+OR+shares+OR+earnings+OR+analyst+OR+forecast+OR+upgrade+OR+downgrade%29+when%3A12h&hl=de&gl=DE&ceid=DE:de
-    feed = feedparser.parse(url)
+    # Download über den gepoolten Client (Keep-Alive) bzw. aus dem Feed-Cache;
+    # geparst wird inkrementell (_parse_rss), feedparser nur noch als Fallback
+    try:
+        feed = _open_feed(url)
+        try:
+            return _parse_feed(feed, lookback_hours, limit)
+        finally:
+            feed.close()
+    except requests.RequestException as e:
+        logger.warning("News feed request failed (%s): %s", query, e)
+        return []
+
+
+def _parse_feedparser(body: bytes, lookback_hours: int, limit: Optional[int]) -> List[Dict[str, str]]:
+    """Parse a feed body with feedparser (fallback for feeds _parse_rss rejects)."""
+    import feedparser  # lazy: nur für kaputte/fremde Feeds
+
+    feed = feedparser.parse(body)
     #{'bozo': False, 
     # 'entries': [{'title': 'Microsoft-Aktie hält sich in der Nähe von $505, da die Einführung von KI die Geduld der Anleger auf die Probe stellt - Traders Union', 
     # 'title_detail': {
@@ -142,38 +454,38 @@ def fetch_headlines(
             }
         )
 
-        if len(results) >= limit:
+        if limit is not None and len(results) >= limit:
             break
 
     return results
 
 
 ############ So nutzt du das Modul ############
-#if __name__ == "__main__":
-name = "Microsoft"
-ticker = "MSFT"
-
-q = build_query(name, ticker) #query
-#print(f" q = build_query(name, ticker) = {q}")
-#=>
-# Microsoft MSFT (
-#   stock OR 
-#   shares OR 
-#   earnings OR 
-#   analyst OR 
-#   forecast OR 
-#   upgrade OR 
-#   downgrade)
-headlines = fetch_headlines(q, limit=3, lookback_hours=12, lang="de", country="DE")
-#print(f"headlines = {headlines}")#=> WEB Side
-#[{'title': 'Microsoft-Aktie hält sich in der Nähe von $505, da die Einführung von KI die Geduld der Anleger auf die Probe stellt - Traders Union', 
-#  'link': 'https://news.google.com/rss/articles/CBMisAFBVV95cUxOOHZVeEowTHRaVW8yeGV6YkJqbjNZNWlRTEhNOUV4NDBhVTU0YjUyUU1rUXcyUUNITUIwOTBrbGhDWXJWX2FlSXpSeENDZHNLX2pWZzE1VWFUQmg1bENhU3VxZGJCRklBbmZodWIweXB1cEhJWW96WG9OdzBIRTE1MHNZMGRVY1ZxS3ZVRklSakJNTHNwd2huRG1NMGNUVlE4eGlVeEZJS2lzQmk2WkNkSg?oc=5', 
-#  'source': 'Traders Union', 
-#  'published': 'Wed, 03 Sep 2025 08:45:46 GMT'}]
-
-# Optional Titel-Filter, z. B. nur Earnings/Analyst
-headlines = filter_titles(headlines, required_keywords=["earnings", "analyst", "downgrade", "upgrade", "stock", "shares", "forecast"])
-#print(f"headlines = {headlines}") #headlines = []
-
-for h in headlines:
-    print(f"- {h['title']} ({h['source']})\n  {h['link']}\n  {h['published']}\n")
\ No newline at end of file
+if __name__ == "__main__":
+    name = "Microsoft"
+    ticker = "MSFT"
+
+    q = build_query(name, ticker) #query
+    #print(f" q = build_query(name, ticker) = {q}")
+    #=>
+    # Microsoft MSFT (
+    #   stock OR 
+    #   shares OR 
+    #   earnings OR 
+    #   analyst OR 
+    #   forecast OR 
+    #   upgrade OR 
+    #   downgrade)
+    headlines = fetch_headlines(q, limit=3, lookback_hours=12, lang="de", country="DE")
+    #print(f"headlines = {headlines}")#=> WEB Side
+    #[{'title': 'Microsoft-Aktie hält sich in der Nähe von $505, da die Einführung von KI die Geduld der Anleger auf die Probe stellt - Traders Union', 
+    #  'link': 'https://news.google.com/rss/articles/CBMisAFBVV95cUxOOHZVeEowTHRaVW8yeGV6YkJqbjNZNWlRTEhNOUV4NDBhVTU0YjUyUU1rUXcyUUNITUIwOTBrbGhDWXJWX2FlSXpSeENDZHNLX2pWZzE1VWFUQmg1bENhU3VxZGJCRklBbmZodWIweXB1cEhJWW96WG9OdzBIRTE1MHNZMGRVY1ZxS3ZVRklSakJNTHNwd2huRG1NMGNUVlE4eGlVeEZJS2lzQmk2WkNkSg?oc=5', 
+    #  'source': 'Traders Union', 
+    #  'published': 'Wed, 03 Sep 2025 08:45:46 GMT'}]
+
+    # Optional Titel-Filter, z. B. nur Earnings/Analyst
+    headlines = filter_titles(headlines, required_keywords=["earnings", "analyst", "downgrade", "upgrade", "stock", "shares", "forecast"])
+    #print(f"headlines = {headlines}") #headlines = []
+
+    for h in headlines:
+        print(f"- {h['title']} ({h['source']})\n  {h['link']}\n  {h['published']}\n")
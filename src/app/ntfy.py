@@ -1,5 +1,5 @@
-import requests
 import logging
+from src.app.http_client import get_http
 from src.app.utils import mask_secret
 #from app.utils import mask_secret
 
@@ -56,28 +56,16 @@ def notify_ntfy(
             server, mask_secret(topic), title, message)
         return
 
+    import requests  # lazy: requests/urllib3 erst beim ersten Senden laden
+
     # TODO: Construct the topic URL and prepare request headers
     url = f"{server.rstrip('/')}/{topic}"
-    print(f"URL={url}")
     headers = {
         "Title": title,
         "Priority": "high",
-        #optional :
-        # Markdown und 
-        # Click
     }
     if not isinstance(message, str):
         message = str(message)
-    print(f"message ={message }")
-    print(f"message-encode ={message.encode("utf-8") }")
-    print(f"url ={url}")
-    try:
-        r=requests.post(url,data=message.encode("utf-8"), headers=headers, timeout=20)
-        print(f"R={r}")
-    except Exception as e:
-        print(f"Fehler:{e}")
-
-   
 
     # TODO: If markdown is enabled, set the appropriate header
     if markdown:
@@ -89,7 +77,7 @@ def notify_ntfy(
 
     # TODO: Perform the POST request inside a try/except block and handle errors
     try:
-        r = requests.post(url, data=message.encode("utf-8"), headers=headers, timeout=20)
+        r = get_http().post(url, data=message.encode("utf-8"), headers=headers)
         r.raise_for_status()
         logger.debug(
             "ntfy success: %s topic=%s title=%r",
@@ -104,19 +92,6 @@ def notify_ntfy(
 
 
 
-   ################       Beispielaufruf          ###################
-#if __name__ == "__main__":
-logging.basicConfig(level=logging.DEBUG)
-notify_ntfy(
-        "https://ntfy.sh", #server
-        "mein-geheimes-topic-123", #topic
-        "Stock Alert",           #title
-        "AAPL ist um 5% gestiegen 📈",# message
-        markdown=True,                  #markdown
-        click_url="https://finance.yahoo.com/quote/AAPL" #click_url
-    )
-
-
 def send_ntfy(server: str, topic: str, title: str, message: str, tags: list[str] | None = None) -> None:
     url = f"{server.rstrip('/')}/{topic}"
     headers = {
@@ -126,5 +101,18 @@ def send_ntfy(server: str, topic: str, title: str, message: str, tags: list[str]
     if tags:
         headers["Tags"] = ",".join(tags)
 
-    resp = requests.post(url, data=message.encode("utf-8"), headers=headers, timeout=15)
+    resp = get_http().post(url, data=message.encode("utf-8"), headers=headers)
     resp.raise_for_status()
+
+
+################       Beispielaufruf          ###################
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    notify_ntfy(
+        "https://ntfy.sh", #server
+        "mein-geheimes-topic-123", #topic
+        "Stock Alert",           #title
+        "AAPL ist um 5% gestiegen 📈",# message
+        markdown=True,                  #markdown
+        click_url="https://finance.yahoo.com/quote/AAPL" #click_url
+    )
@@ -0,0 +1,86 @@
+#Gestufte Zyklus-Pipeline für alarmierende Ticker:
+#  Anreicherung (Firmenname, News, Link-Auflösung) → Versand,
+#verbunden über begrenzte Queues (Backpressure statt unbegrenzt vieler Jobs).
+#Reihenfolge der Eingabe = Startreihenfolge (run_once: |Δ%| absteigend);
+#ein fertiger Alert geht sofort raus, ohne auf langsamere Ticker zu warten.
+
+import logging
+import threading
+from queue import Queue
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("stock-alerts")
+
+_DONE = object()
+
+
+def run_pipeline(
+    items: Sequence[Any],
+    enrich: Callable[[Any, Callable[[Any], None]], Any],
+    send: Callable[[Any], None],
+    *,
+    workers: int = 4,
+    senders: int = 1,
+    queue_size: Optional[int] = None,
+) -> List[Tuple[Any, Optional[BaseException]]]:
+    """
+    Run `enrich` for all items on `workers` threads and `send` every emitted
+    message on `senders` threads while enrichment is still going on.
+
+    Args:
+        items: Work items in priority order (started in this order).
+        enrich: enrich(item, emit) -> result; calls emit(message) for each
+                message to send (e.g. Alert) as soon as it is ready.
+        send: Called once per emitted message on a sender thread.
+        workers: Enrichment threads.
+        senders: Sender threads.
+        queue_size: Bound of both queues (default 2 × threads of the consuming stage).
+
+    Returns:
+        [(result, error)] in item order; error is the exception raised by
+        enrich (result None) or None. Send errors are logged, not raised.
+    """
+    workers = max(1, min(int(workers), len(items) or 1))
+    senders = max(1, int(senders))
+    enrich_q: Queue = Queue(maxsize=queue_size or 2 * workers)
+    send_q: Queue = Queue(maxsize=queue_size or 2 * senders)
+    out: List[Tuple[Any, Optional[BaseException]]] = [(None, None)] * len(items)
+
+    def _enricher() -> None:
+        while True:
+            job = enrich_q.get()
+            if job is _DONE:
+                return
+            i, item = job
+            try:
+                out[i] = (enrich(item, send_q.put), None)
+            except Exception as e:
+                out[i] = (None, e)
+
+    def _sender() -> None:
+        while True:
+            msg = send_q.get()
+            if msg is _DONE:
+                return
+            try:
+                send(msg)
+            except Exception as e:
+                logger.error("Failed to send %s: %s", getattr(msg, "ticker", "message"), e)
+
+    enrichers = [threading.Thread(target=_enricher, name=f"enrich-{i}", daemon=True) for i in range(workers)]
+    sender_threads = [threading.Thread(target=_sender, name=f"send-{i}", daemon=True) for i in range(senders)]
+    for t in enrichers + sender_threads:
+        t.start()
+
+    # Aufrufer-Thread füttert die Queue; blockiert, solange alle Worker beschäftigt sind
+    for i, item in enumerate(items):
+        enrich_q.put((i, item))
+    for _ in enrichers:
+        enrich_q.put(_DONE)
+    for t in enrichers:
+        t.join()
+    for _ in sender_threads:
+        send_q.put(_DONE)
+    for t in sender_threads:
+        t.join()
+    return out
@@ -0,0 +1,144 @@
+#Adaptiver Poll-Scheduler für den Daemon: jeder Ticker bekommt seinen eigenen
+#nächsten Abfragezeitpunkt. Nahe an der Schwelle (oder sehr volatil) → jede Minute,
+#ruhige Ticker → alle 15–30 Minuten; ein globales Budget begrenzt Abfragen pro Minute.
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+logger = logging.getLogger("stock-alerts")
+
+DEFAULT_SCHEDULER_CFG: Dict[str, Any] = {
+    "enabled": False,
+    "min_interval_sec": 60,       # Tickers close to a crossing
+    "max_interval_sec": 1800,     # Quiet tickers
+    "budget_per_min": 120,        # Max. ticker quotes per minute (Yahoo requests)
+    "sigmas": 3.0,                # Poll before a move of this many σ could reach the threshold
+    "vol_halflife_sec": 900,      # EWMA half-life of the volatility estimate
+    "vol_floor_pct_per_min": 0.02,  # Lower bound of σ (%-points per √minute)
+}
+
+
+@dataclass
+class TickerSchedule:
+    """
+    Scheduling state of one ticker.
+
+    Attributes:
+        next_due (float): time.time() of the next poll (0 = poll at once).
+        pct (Optional[float]): Last Δ% vs. open.
+        polled_at (float): time.time() of the last poll with data.
+        var (Optional[float]): EWMA of (ΔΔ%)² per minute (variance rate, %-points²).
+    """
+    next_due: float = 0.0
+    pct: Optional[float] = None
+    polled_at: float = 0.0
+    var: Optional[float] = None
+
+
+class PollScheduler:
+    """
+    Per-ticker poll times from distance to threshold and recent volatility.
+
+    Δ% is treated as a random walk: within t minutes it moves about σ·√t,
+    with σ estimated (EWMA) from the changes seen between polls. The next poll
+    comes after t = (distance / (sigmas · σ))² minutes, i.e. before a
+    `sigmas`-σ move could cover the gap between |Δ%| and the threshold (works
+    for breakouts and for the way back into the corridor), clamped to
+    [min_interval_sec, max_interval_sec].
+
+    Example:
+        >>> s = PollScheduler(["AAPL", "SAP.DE"], threshold_pct=3.0)
+        >>> due = s.due()                 # both at first
+        >>> s.record({"AAPL": 2.8, "SAP.DE": 0.2})
+        >>> s.interval("AAPL") < s.interval("SAP.DE")
+        True
+    """
+
+    def __init__(
+        self,
+        tickers: Iterable[str],
+        threshold_pct: float,
+        thresholds: Optional[Mapping[str, float]] = None,
+        cfg: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        c = {**DEFAULT_SCHEDULER_CFG, **(cfg or {})}
+        self.min_interval = max(1.0, float(c["min_interval_sec"]))
+        self.max_interval = max(self.min_interval, float(c["max_interval_sec"]))
+        self.budget = max(1, int(c["budget_per_min"]))
+        self.sigmas = max(0.1, float(c["sigmas"]))
+        self.halflife = max(1.0, float(c["vol_halflife_sec"]))
+        self.vol_floor = max(1e-6, float(c["vol_floor_pct_per_min"]))
+        self.threshold_pct = float(threshold_pct)
+        self.thresholds = {k.upper(): float(v) for k, v in (thresholds or {}).items()}
+        self.state: Dict[str, TickerSchedule] = {tk: TickerSchedule() for tk in tickers}
+        # Token-Bucket (Ticker-Abfragen), volle Minute als Burst
+        self._tokens = float(self.budget)
+        self._refilled = time.time()
+
+    def _threshold(self, tk: str) -> float:
+        return self.thresholds.get(tk.upper(), self.threshold_pct)
+
+    def interval(self, tk: str) -> float:
+        """Seconds until the next poll of `tk` given its current state."""
+        st = self.state[tk]
+        if st.pct is None or math.isnan(st.pct):
+            return self.max_interval if st.polled_at else self.min_interval
+        distance = abs(abs(st.pct) - self._threshold(tk))
+        sigma = max(self.vol_floor, math.sqrt(st.var or 0.0))
+        eta_sec = (distance / (self.sigmas * sigma)) ** 2 * 60.0
+        return min(self.max_interval, max(self.min_interval, eta_sec))
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.budget), self._tokens + (now - self._refilled) * self.budget / 60.0)
+        self._refilled = now
+
+    def due(self, now: Optional[float] = None, candidates: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Tickers to poll now, most overdue first, capped by the per-minute budget.
+
+        Args:
+            now: time.time() (default: now).
+            candidates: Restrict to these tickers (e.g. open venues); order-insensitive.
+
+        Returns:
+            Tickers (configured spelling). Over-budget tickers stay due and
+            come first in a later call.
+        """
+        now = time.time() if now is None else now
+        self._refill(now)
+        pool = self.state if candidates is None else {tk: self.state[tk] for tk in candidates if tk in self.state}
+        ready = sorted((st.next_due, tk) for tk, st in pool.items() if st.next_due <= now)
+        n = min(len(ready), int(self._tokens))
+        if n < len(ready):
+            logger.debug("Scheduler: budget allows %d of %d due ticker(s).", n, len(ready))
+        self._tokens -= n
+        return [tk for _, tk in ready[:n]]
+
+    def record(self, pcts: Mapping[str, Optional[float]], now: Optional[float] = None) -> None:
+        """
+        Feed the Δ% observed for polled tickers (None/NaN = no data) and schedule their next poll.
+        """
+        now = time.time() if now is None else now
+        for tk, pct in pcts.items():
+            st = self.state.get(tk)
+            if st is None:
+                continue
+            if pct is not None and not math.isnan(pct):
+                if st.pct is not None and st.polled_at:
+                    minutes = max(1e-3, (now - st.polled_at) / 60.0)
+                    rate = (pct - st.pct) ** 2 / minutes
+                    # EWMA mit zeitabhängigem Gewicht (unregelmäßige Abstände)
+                    w = 1.0 - 0.5 ** ((now - st.polled_at) / self.halflife)
+                    st.var = rate if st.var is None else st.var + w * (rate - st.var)
+                st.pct = pct
+            else:
+                st.pct = None
+            st.polled_at = now
+            st.next_due = now + self.interval(tk)
+
+    def next_wake(self) -> float:
+        """time.time() of the earliest due ticker (inf if none)."""
+        return min((st.next_due for st in self.state.values()), default=math.inf)
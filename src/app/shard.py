@@ -0,0 +1,118 @@
+#Sharding: Watchlist per stabilem Hash auf N Prozesse/Hosts verteilen (--shard i/N).
+#Jeder Shard schreibt nur sein eigenes State-Segment (alert_state.shard-i-of-N.json),
+#gelesen wird über alle Segmente gemergt → kein gegenseitiges Überschreiben,
+#auch nicht nach einem Wechsel von N.
+
+import logging
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .state import STATE_VERSION, StateStore, read_raw
+
+logger = logging.getLogger("stock-alerts")
+
+Shard = Tuple[int, int]  # (index, count), 0 <= index < count
+
+
+def parse_shard(spec: str) -> Shard:
+    """
+    Parse "i/N" (0-based index i of N shards).
+
+    Raises:
+        ValueError: If the spec is malformed or i is out of range.
+    """
+    try:
+        i, n = (int(x) for x in spec.split("/", 1))
+    except ValueError:
+        raise ValueError(f"invalid shard {spec!r}, expected i/N (e.g. 0/4)") from None
+    if n < 1 or not 0 <= i < n:
+        raise ValueError(f"invalid shard {spec!r}: need 0 <= i < N")
+    return i, n
+
+
+def shard_of(ticker: str, count: int) -> int:
+    """Shard index of a ticker (stable across processes, hosts and Python versions)."""
+    return zlib.crc32(ticker.upper().encode("utf-8")) % count
+
+
+def shard_tickers(tickers: Iterable[str], shard: Optional[Shard]) -> List[str]:
+    """Tickers owned by `shard` (all tickers if shard is None), in input order."""
+    if shard is None or shard[1] == 1:
+        return list(tickers)
+    i, n = shard
+    return [tk for tk in tickers if shard_of(tk, n) == i]
+
+
+def shard_path(path: Path, shard: Optional[Shard]) -> Path:
+    """Per-shard variant of a file path: x.json → x.shard-i-of-N.json (unchanged without sharding)."""
+    path = Path(path)
+    if shard is None or shard[1] == 1:
+        return path
+    return path.with_name(f"{path.stem}.shard-{shard[0]}-of-{shard[1]}{path.suffix}")
+
+
+class ShardStateStore(StateStore):
+    """
+    StateStore of one shard: merged read, owned-only write.
+
+    reload() merges the base state file and every shard segment next to it;
+    if a ticker appears in several files, the most recently saved file wins
+    (after a change of N the new owner's segment is the newer one). commit()
+    writes only the tickers this shard owns to its own segment, so shards
+    never overwrite each other and every ticker's state has exactly one writer.
+
+    Without sharding (shard None or N = 1) the segment is the base file itself.
+
+    Example:
+        >>> store = ShardStateStore(Path("alert_state.json"), (1, 4))
+        >>> store.path
+        PosixPath('alert_state.shard-1-of-4.json')
+    """
+
+    def __init__(self, path: Path, shard: Optional[Shard] = None) -> None:
+        self.base = Path(path)
+        self.shard = shard
+        super().__init__(shard_path(self.base, shard))
+
+    def _segments(self) -> List[Path]:
+        pattern = f"{self.base.stem}.shard-*-of-*{self.base.suffix}"
+        return [self.base, *sorted(self.base.parent.glob(pattern))]
+
+    def reload(self) -> None:
+        """Merge all segments (newest file wins per ticker)."""
+        loaded = []
+        for seg in self._segments():
+            raw = read_raw(seg) if seg.exists() else {}
+            if raw:
+                loaded.append((float(raw.get("saved_at") or 0.0), seg, raw))
+        merged: Dict[str, Dict[str, Any]] = {}
+        meta: Dict[str, Any] = {}
+        for _, seg, raw in sorted(loaded, key=lambda x: x[0]):
+            if raw.get("version") == STATE_VERSION and isinstance(raw.get("tickers"), dict):
+                entries = raw["tickers"]
+                if seg == self.path:
+                    meta = dict(raw.get("meta") or {})
+            else:
+                entries = raw
+            for tk, entry in entries.items():
+                if isinstance(entry, str):
+                    merged[tk] = {"direction": entry}
+                elif isinstance(entry, dict):
+                    merged[tk] = dict(entry)
+        self._tickers = merged
+        self.meta = meta
+        self._dirty = False
+        logger.debug(f"Loaded state from {len(loaded)} segment(s) of {self.base}: {len(merged)} ticker(s)")
+
+    def commit(self) -> bool:
+        """Write the owned tickers to this shard's segment (see StateStore.commit)."""
+        if self.shard is None or self.shard[1] == 1:
+            return super().commit()
+        everything = self._tickers
+        i, n = self.shard
+        self._tickers = {tk: e for tk, e in everything.items() if shard_of(tk, n) == i}
+        try:
+            return super().commit()
+        finally:
+            self._tickers = everything
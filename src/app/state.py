@@ -1,24 +1,27 @@
 import json
 import logging
+import time
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Optional
+
+from .utils import atomic_write_json
 
 logger = logging.getLogger("stock-alerts")
 
+# Dateiformat v2: {"version": 2, "tickers": {"AAPL": {"direction": "up", ...}}, "meta": {...}}
+# Alte Dateien ({"AAPL": "up"}) werden beim Laden automatisch übernommen.
+STATE_VERSION = 2
 
-def load_state(path: Path) -> Dict[str, str]:
+
+def read_raw(path: Path) -> Dict[str, Any]:
     """
-    Load the last alert "state" from a JSON file.
+    Read a state file (or shard segment) as a raw dict; missing or broken files yield {}.
 
-    The state keeps track of which direction (up/down/none) a stock
-    has already triggered an alert for. This prevents sending duplicate
-    notifications every run.
+    Used by StateStore and shard.ShardStateStore, which merges several files.
     """
     # TODO: Prüfen, ob die Datei existiert und deren Inhalt als JSON laden
     # TODO: Bei Erfolg den geladenen Zustand zurückgeben und einen Debug-Log schreiben
     # TODO: Bei Fehlern eine Warnung loggen und ein leeres Dict zurückgeben
-    # pass
-
     if not path.exists():
         logger.debug(f"State file {path} does not exist. Returning empty dict.")
         return {}
@@ -29,42 +32,156 @@ def load_state(path: Path) -> Dict[str, str]:
         if not isinstance(state, dict): # Sicherstellen, dass der Inhalt ein dict ist (falls jemand die Datei manuell kaputt gemacht hat
             logger.warning(f"State file {path} does not contain a dict. Resetting.")
             return {}
-        logger.debug(f"Loaded state from {path}: {state}")
         return state
     except Exception as e:
         logger.warning(f"Failed to load state from {path}: {e}")
         return {}
 
 
+class StateStore:
+    """
+    Alert state for all tickers, loaded once and committed once per cycle.
+
+    Per-ticker entries are dicts with at least "direction" ("up"/"down"/"none")
+    plus optional extra fields (e.g. "last_alert_ts", "last_price", "last_pct").
+    Updates are O(1) in memory; commit() writes the whole file atomically and
+    only if something changed.
+
+    Example:
+        >>> store = StateStore(Path("alert_state.json"))
+        >>> store.direction("AAPL")
+        'none'
+        >>> store.set("AAPL", direction="up", last_price=231.5)
+        >>> store.commit()
+        True
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._tickers: Dict[str, Dict[str, Any]] = {}
+        self.meta: Dict[str, Any] = {}
+        self._dirty = False
+        self.reload()
+
+    def reload(self) -> None:
+        """(Re-)read the file; accepts both the v2 layout and the legacy {ticker: direction} map."""
+        raw = read_raw(self.path)
+        if raw.get("version") == STATE_VERSION and isinstance(raw.get("tickers"), dict):
+            tickers = raw["tickers"]
+            self.meta = dict(raw.get("meta") or {})
+        else:
+            tickers = raw
+            self.meta = {}
+        self._tickers = {}
+        for tk, entry in tickers.items():
+            if isinstance(entry, str):
+                self._tickers[tk] = {"direction": entry}
+            elif isinstance(entry, dict):
+                self._tickers[tk] = dict(entry)
+        self._dirty = False
+        logger.debug(f"Loaded state from {self.path}: {len(self._tickers)} ticker(s)")
+
+    def direction(self, ticker: str) -> str:
+        """Last alerted direction of a ticker ("none" if unknown)."""
+        return self._tickers.get(ticker, {}).get("direction", "none")
+
+    def get(self, ticker: str) -> Dict[str, Any]:
+        """Copy of the full entry of a ticker (empty dict if unknown)."""
+        return dict(self._tickers.get(ticker, {}))
+
+    def set(self, ticker: str, direction: Optional[str] = None, **fields: Any) -> None:
+        """
+        Update one ticker in memory (O(1)); written on the next commit().
+
+        Args:
+            ticker: Ticker symbol.
+            direction: New direction, or None to keep the current one.
+            **fields: Extra fields to store (e.g. last_price=231.5).
+        """
+        entry = self._tickers.setdefault(ticker, {"direction": "none"})
+        if direction is not None and entry.get("direction") != direction:
+            entry["direction"] = direction
+            self._dirty = True
+        for k, v in fields.items():
+            if entry.get(k) != v:
+                entry[k] = v
+                self._dirty = True
+
+    def set_meta(self, key: str, value: Any) -> None:
+        """Store store-wide bookkeeping (not tied to a ticker)."""
+        if self.meta.get(key) != value:
+            self.meta[key] = value
+            self._dirty = True
+
+    def directions(self) -> Dict[str, str]:
+        """Legacy view: {ticker: direction}."""
+        return {tk: e.get("direction", "none") for tk, e in self._tickers.items()}
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def commit(self) -> bool:
+        """
+        Atomically write all pending changes in one go.
+
+        Returns:
+            True if the file was written, False if there was nothing to write
+            or writing failed (logged as error; in-memory state is kept).
+        """
+        if not self._dirty:
+            return False
+        data = {"version": STATE_VERSION, "tickers": self._tickers, "meta": self.meta, "saved_at": time.time()}
+        try:
+            atomic_write_json(self.path, data)
+        except Exception as e:
+            logger.error(f"Failed to save state to {self.path}: {e}")
+            return False
+        self._dirty = False
+        logger.debug(f"Saved state to {self.path}: {len(self._tickers)} ticker(s)")
+        return True
+
+
+def load_state(path: Path) -> Dict[str, str]:
+    """
+    Load the last alert "state" from a JSON file.
+
+    The state keeps track of which direction (up/down/none) a stock
+    has already triggered an alert for. This prevents sending duplicate
+    notifications every run.
+
+    Compatibility shim around StateStore: returns {ticker: direction}.
+    """
+    state = StateStore(path).directions()
+    logger.debug(f"Loaded state from {path}: {state}")
+    return state
 
 
 def save_state(path: Path, state: Dict[str, str]) -> None:
     """
     Save the current alert state to disk.
+
+    Compatibility shim around StateStore: merges {ticker: direction} into the
+    file (extra per-ticker fields are kept) and writes it atomically.
     """
-    # TODO: Den Zustand als JSON (UTF-8) in die Datei schreiben
-    # TODO: Einen Debug-Log mit dem gespeicherten Zustand ausgeben
-    #pass
-    try:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+    store = StateStore(path)
+    for tk, direction in state.items():
+        store.set(tk, direction=direction)
+    if store.commit():
         logger.debug(f"Saved state to {path}: {state}")
-    except Exception as e:
-        logger.error(f"Failed to save state to {path}: {e}")
 
 
 ####### Beispielverwendung #######
+if __name__ == "__main__":
+    state_path = Path("alert_state.json")
 
+    # Laden
+    state = load_state(state_path)
+    print("Aktueller State:", state)
 
-state_path = Path("config.json")
-
-# Laden
-state = load_state(state_path)
-print("Aktueller State:", state)
-
-# Ändern
-#state["AAPL"] = "down"
-#state["TSLA"] = "down"
+    # Ändern
+    #state["AAPL"] = "down"
+    #state["TSLA"] = "down"
 
-# Speichern
-#save_state(state_path, state)
\ No newline at end of file
+    # Speichern
+    #save_state(state_path, state)
@@ -0,0 +1,351 @@
+#Streaming-Modus: Live-Kurse per WebSocket (Yahoo-Streamer) statt Polling.
+#Open pro Ticker bleibt im Speicher, jeder Tick läuft durch dieselbe Korridor-Logik
+#(evaluate.py); Alerts gehen sofort raus. Nach (Re-)Connect füllt ein
+#einmaliger Bulk-Abruf die Lücke (Ticks während der Trennung).
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .company import flush_company_cache
+from .core import (
+    _TickerLog, _followup_cfg, _forced_pct, _news_followup, _process_ticker, active_tickers, now_tz,
+)
+from .daemon import _install_stop_handlers
+from .dispatch import NtfyDispatcher
+from .evaluate import TickerEval, evaluate_watchlist
+from .market_data import get_market_data
+from .shard import ShardStateStore
+
+logger = logging.getLogger("stock-alerts")
+
+DEFAULT_STREAM_CFG: Dict[str, Any] = {
+    "url": "wss://streamer.finance.yahoo.com/?version=2",
+    "heartbeat_sec": 15,        # Re-send the subscription (Yahoo drops idle subscriptions)
+    "reconnect_min_sec": 1,     # First reconnect delay (doubles per failed attempt)
+    "reconnect_max_sec": 60,    # Upper bound for the reconnect delay
+    "open_timeout_sec": 10,     # Timeout of the WebSocket handshake
+}
+
+# Marktzeiten/Tageswechsel nicht bei jedem Tick neu berechnen
+_CLOCK_CHECK_SEC = 30.0
+
+
+def decode_pricing(raw: str) -> Optional[Tuple[str, float, int, float]]:
+    """
+    Decode one streamer frame.
+
+    Frames are JSON {"type": "pricing", "message": <base64 PricingData protobuf>}.
+
+    Returns:
+        (symbol, price, time_ms, open_price) or None for other frames.
+        open_price is 0.0 if the streamer did not send one.
+    """
+    import base64
+    from yfinance.pricing_pb2 import PricingData  # protobuf schema shipped with yfinance
+
+    try:
+        frame = json.loads(raw)
+    except ValueError:
+        return None
+    data = frame.get("message") if isinstance(frame, dict) else None
+    if not data:
+        return None
+    msg = PricingData()
+    msg.ParseFromString(base64.b64decode(data))
+    if not msg.id or not msg.price:
+        return None
+    return msg.id.upper(), float(msg.price), int(msg.time), float(msg.open_price)
+
+
+class StreamMonitor:
+    """
+    Event-driven alerting on live price ticks.
+
+    Keeps today's open per ticker in memory and runs the up/down/none
+    corridor logic on every tick. Alerts (incl. optional news) are built and
+    sent on a small worker pool so the socket reader never blocks; the alert
+    state is updated before the alert is sent, so further ticks of the same
+    breakout do not queue duplicates.
+
+    Example:
+        >>> m = StreamMonitor(run_kwargs, {"url": "ws://127.0.0.1:8766"})
+        >>> m.run()   # until stop.set() / SIGTERM
+    """
+
+    def __init__(
+        self,
+        run_kwargs: Dict[str, Any],
+        stream_cfg: Optional[Dict[str, Any]] = None,
+        *,
+        stop: Optional[threading.Event] = None,
+        dispatcher: Optional[NtfyDispatcher] = None,
+    ) -> None:
+        c = {**DEFAULT_STREAM_CFG, **(stream_cfg or {})}
+        self.url = c["url"]
+        self.heartbeat = max(1.0, float(c["heartbeat_sec"]))
+        self.reconnect_min = max(0.1, float(c["reconnect_min_sec"]))
+        self.reconnect_max = max(self.reconnect_min, float(c["reconnect_max_sec"]))
+        self.open_timeout = float(c["open_timeout_sec"])
+
+        self.tickers: List[str] = list(run_kwargs["tickers"])
+        self.by_symbol = {tk.upper(): tk for tk in self.tickers}
+        self.threshold_pct = float(run_kwargs["threshold_pct"])
+        self.thresholds = run_kwargs.get("thresholds") or {}
+        self.market_hours_cfg = run_kwargs["market_hours_cfg"]
+        self.test_cfg = run_kwargs.get("test_cfg") or {}
+        self.news_cfg = run_kwargs.get("news_cfg") or {}
+        self.forced = _forced_pct(self.test_cfg)
+        self.bypass = bool(self.test_cfg.get("enabled") and self.test_cfg.get("bypass_market_hours"))
+
+        self.stop = stop or threading.Event()
+        self.store = ShardStateStore(run_kwargs["state_file"], run_kwargs.get("shard"))
+        self.dispatcher = dispatcher or run_kwargs.get("dispatcher") or NtfyDispatcher.from_config(
+            run_kwargs["ntfy_server"], run_kwargs["ntfy_topic"], run_kwargs.get("ntfy_cfg"),
+            dry_run=self.test_cfg.get("dry_run", False),
+        )
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(run_kwargs.get("max_workers", 1))),
+                                        thread_name_prefix="alert")
+        self._lock = threading.Lock()
+
+        self.opens: Dict[str, float] = {}   # TICKER (upper) → today's open
+        self._open: set = set()             # Ticker mit gerade offener Börse
+        self._day: Optional[str] = None
+        self._fetching: set = set()         # Ticker mit laufendem Einzel-Back-fill
+        self._clock_checked = 0.0
+        self.stats = {"ticks": 0, "alerts": 0, "resets": 0, "connects": 0, "backfills": 0}
+
+    # ----------------------------------------------------------------- evaluation
+
+    def _check_clock(self) -> None:
+        """
+        Refresh the set of tickers with an open venue. A new trading day drops
+        yesterday's opens; tickers whose venue just opened get fresh opens.
+        """
+        now = time.monotonic()
+        if now - self._clock_checked < _CLOCK_CHECK_SEC:
+            return
+        self._clock_checked = now
+        day = now_tz(self.market_hours_cfg["tz"]).strftime("%Y-%m-%d")
+        new_day = self._day is not None and day != self._day
+        self._day = day
+        if new_day:
+            # Vor jedem frühen Return: nachts ist keine Börse offen, der Back-fill
+            # unten kehrt dann sofort zurück → sonst gälte morgen das Open von gestern
+            self._new_day(day)
+            self.backfill()
+            return
+        now_open = set(self._active())
+        opened = now_open - self._open
+        self._open = now_open
+        if opened:
+            # Börse im Tagesverlauf geöffnet (z. B. NYSE nach XETRA): Opens dieser Ticker neu holen
+            tickers = [tk for tk in self.tickers if tk in opened]
+            logger.info("Venue opened for %d ticker(s) — back-filling their opens.", len(tickers))
+            for tk in tickers:
+                self.opens.pop(tk.upper(), None)
+            self.backfill(tickers)
+
+    def _new_day(self, day: str) -> None:
+        """Forget yesterday's opens and alert directions (Δ% and breakouts are per trading day)."""
+        logger.info("New trading day %s — dropping yesterday's opens and alert states.", day)
+        self.opens.clear()
+        with self._lock:
+            for tk in self.tickers:
+                if self.store.direction(tk) != "none":
+                    self.store.set(tk, direction="none")
+            self.store.commit()
+
+    def _handle(self, ev: TickerEval, quote: Tuple[float, float]) -> None:
+        tk = ev.ticker
+        if ev.alert:
+            with self._lock:
+                # State sofort setzen → weitere Ticks desselben Ausbruchs lösen nichts mehr aus
+                self.store.set(tk, direction=ev.direction, last_price=round(ev.last, 6),
+                               last_pct=round(ev.pct, 4), last_alert_ts=time.time())
+                self.store.commit()
+                self.stats["alerts"] += 1
+            self._pool.submit(self._send_alert, ev, quote)
+        elif ev.reset:
+            logger.info("Back in corridor (%s): reset state %s → none", tk, ev.prev)
+            with self._lock:
+                self.store.set(tk, direction="none", last_price=round(ev.last, 6), last_pct=round(ev.pct, 4))
+                self.store.commit()
+                self.stats["resets"] += 1
+
+    def _send_alert(self, ev: TickerEval, quote: Tuple[float, float]) -> None:
+        log = _TickerLog()
+        followup = _followup_cfg(self.news_cfg)
+        try:
+            _process_ticker(ev, quote, self.dispatcher.submit, self.forced, self.news_cfg, log,
+                            with_news=followup is None)
+            self.dispatcher.flush()
+            if followup is not None:
+                # Kurs-Alert ist raus; News folgen als eigene Nachricht (oder verfallen)
+                alert = _news_followup(ev, self.news_cfg, time.monotonic() + followup, log)
+                if alert is not None:
+                    self.dispatcher.send(alert)
+        except Exception as e:
+            log.error("Error while alerting %s: %s", ev.ticker, e)
+        log.flush()
+
+    def on_tick(self, symbol: str, price: float, open_price: float = 0.0) -> None:
+        """Evaluate one live price (symbol upper-case) against the corridor."""
+        tk = self.by_symbol.get(symbol)
+        if tk is None:
+            return
+        self.stats["ticks"] += 1
+        self._check_clock()
+        if tk not in self._open:
+            return
+        open_px = self.opens.get(symbol)
+        if open_px is None:
+            if open_price <= 0:
+                self._request_open(tk)  # Open unbekannt → gezielt nachladen, Tick verwerfen
+                return
+            open_px = self.opens[symbol] = open_price
+        quote = (open_px, price)
+        with self._lock:
+            prev = {tk: self.store.direction(tk)}
+        ev = evaluate_watchlist([tk], {symbol: quote}, prev, self.threshold_pct,
+                                self.thresholds, self.forced).row(0)
+        self._handle(ev, quote)
+
+    def _active(self) -> List[str]:
+        return list(self.tickers) if self.bypass else active_tickers(self.tickers, self.market_hours_cfg)
+
+    def _request_open(self, tk: str) -> None:
+        """Back-fill one ticker whose open is unknown on the worker pool (once until it is done)."""
+        with self._lock:
+            if tk in self._fetching:
+                return
+            self._fetching.add(tk)
+
+        def _fetch() -> None:
+            try:
+                self.backfill([tk])
+            except Exception as e:
+                logger.warning("Back-fill of %s failed: %s", tk, e)
+            finally:
+                with self._lock:
+                    self._fetching.discard(tk)
+
+        self._pool.submit(_fetch)
+
+    def backfill(self, tickers: Optional[List[str]] = None) -> int:
+        """
+        One-shot bulk fetch of open/last for all tickers with an open venue
+        (start-up, reconnect, new day), or only for `tickers` (open unknown).
+
+        Refreshes the cached opens and evaluates the fetched tickers once, so
+        breakouts that happened while disconnected still alert.
+
+        Returns:
+            Number of alerts triggered.
+        """
+        active = self._active()
+        if tickers is None:
+            self._open = set(active)
+        else:
+            wanted = set(tickers)
+            active = [tk for tk in active if tk in wanted]
+        if not active:
+            logger.debug("Back-fill skipped (outside market hours).")
+            return 0
+        prices = get_market_data().get_open_and_last_many(active)
+        self.opens.update({sym: q[0] for sym, q in prices.items()})
+        self.stats["backfills"] += 1
+        with self._lock:
+            prev = self.store.directions()
+        ev = evaluate_watchlist(active, prices, prev, self.threshold_pct, self.thresholds, self.forced)
+        before = self.stats["alerts"]
+        for i in range(len(ev)):
+            if ev.alert[i] or ev.reset[i]:
+                row = ev.row(i)
+                self._handle(row, prices[row.ticker.upper()])
+        alerts = self.stats["alerts"] - before
+        logger.info("Back-fill: %d quote(s), %d alert(s).", len(prices), alerts)
+        return alerts
+
+    # ----------------------------------------------------------------- connection
+
+    def _subscribe(self, ws: Any) -> None:
+        ws.send(json.dumps({"subscribe": list(self.by_symbol)}))
+
+    def _listen(self, ws: Any) -> None:
+        last_sub = time.monotonic()
+        while not self.stop.is_set():
+            try:
+                raw = ws.recv(timeout=1.0)
+            except TimeoutError:
+                raw = None
+            if raw is not None:
+                tick = decode_pricing(raw)
+                if tick is not None:
+                    self.on_tick(tick[0], tick[1], tick[3])
+            if time.monotonic() - last_sub >= self.heartbeat:
+                self._subscribe(ws)
+                last_sub = time.monotonic()
+
+    def run(self) -> None:
+        """Connect, subscribe, back-fill and process ticks until stopped; reconnects with backoff."""
+        from websockets.sync.client import connect
+
+        delay = self.reconnect_min
+        logger.info("Streaming %d ticker(s) from %s", len(self.tickers), self.url)
+        try:
+            while not self.stop.is_set():
+                try:
+                    with connect(self.url, open_timeout=self.open_timeout, close_timeout=2) as ws:
+                        self.stats["connects"] += 1
+                        self._subscribe(ws)
+                        # Erst abonnieren, dann Lücke füllen → kein Tick geht zwischen beiden verloren
+                        self._clock_checked = time.monotonic()
+                        self._day = now_tz(self.market_hours_cfg["tz"]).strftime("%Y-%m-%d")
+                        self.backfill()
+                        delay = self.reconnect_min
+                        self._listen(ws)
+                except Exception as e:
+                    if self.stop.is_set():
+                        break
+                    logger.warning("Stream disconnected (%s) — reconnecting in %.1fs", e, delay)
+                    self.stop.wait(delay)
+                    delay = min(self.reconnect_max, delay * 2)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Wait for pending alerts, send what is queued and persist state/caches."""
+        self._pool.shutdown(wait=True)
+        self.dispatcher.flush()
+        with self._lock:
+            self.store.commit()
+        flush_company_cache()
+        logger.info("Stream stopped: %s", self.stats)
+
+
+def run_stream(
+    run_kwargs: Dict[str, Any],
+    stream_cfg: Optional[Dict[str, Any]] = None,
+    *,
+    stop: Optional[threading.Event] = None,
+) -> StreamMonitor:
+    """
+    Run the streaming mode until SIGINT/SIGTERM (or `stop` is set).
+
+    Args:
+        run_kwargs: Same keyword arguments as run_once (tickers, thresholds, ntfy, news, ...).
+        stream_cfg: "stream" section of config.json (see DEFAULT_STREAM_CFG).
+        stop: Optional event to stop from outside.
+
+    Returns:
+        The monitor (for its stats).
+    """
+    stop = stop or threading.Event()
+    _install_stop_handlers(stop)
+    monitor = StreamMonitor(run_kwargs, stream_cfg, stop=stop)
+    monitor.run()
+    return monitor
@@ -1,3 +1,10 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
 def mask_secret(s: str, keep: int = 1) -> str:
     """Maskiert sensible Strings für Logging-Ausgaben.
     Args:
@@ -22,19 +29,45 @@ def mask_secret(s: str, keep: int = 1) -> str:
     else:
         # Mini-Strings (1 oder 2 Zeichen) → ganz maskieren
         return "***"
-   
 
 
-#########       Beispiele     ###################
 
-print(mask_secret("supergeheimespasswort", keep=2))
-# su...rt
+def atomic_write_json(path: Path, data: Any) -> None:
+    """Schreibt JSON atomar: Temp-Datei im selben Ordner, fsync, dann os.replace.
+
+    Ein Absturz hinterlässt entweder die alte oder die neue Datei, nie eine halbe.
+
+    Args:
+        path (Path): Zieldatei.
+        data (Any): JSON-serialisierbare Daten (kompakt geschrieben).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+#########       Beispiele     ###################
+if __name__ == "__main__":
+    print(mask_secret("supergeheimespasswort", keep=2))
+    # su...rt
 
-print(mask_secret("abc", keep=2))
-# a...c
+    print(mask_secret("abc", keep=2))
+    # a...c
 
-print(mask_secret("x", keep=1))
-# ***
+    print(mask_secret("x", keep=1))
+    # ***
 
-print(mask_secret("", keep=1))
-# (unset)
\ No newline at end of file
+    print(mask_secret("", keep=1))
+    # (unset)
@@ -0,0 +1,94 @@
+from src.app.budget import PROBE_BATCH, RESUME_META_KEY, CycleBudget, prioritize
+from src.app.state import StateStore
+
+
+def test_prioritize_per_ticker_threshold_is_case_insensitive(tmp_path):
+    store = StateStore(tmp_path / "state.json")
+    for tk, pct in (("AAPL", 0.1), ("Sap.De", 1.2), ("O", 2.0)):
+        store.set(tk, last_pct=pct)
+    # Sap.De ist nur mit der eigenen Schwelle (2 %) "hot" und muss dann vor dem größeren Ausschlag von O kommen
+    for key in ("SAP.DE", "sap.de", "Sap.De"):
+        assert prioritize(["AAPL", "Sap.De", "O"], store, 5.0, {key: 2.0}, hot_ratio=0.5) == ["Sap.De", "O", "AAPL"]
+
+
+def test_prioritize_resumes_deferred_tickers_in_cursor_order(tmp_path):
+    store = StateStore(tmp_path / "state.json")
+    store.set("HOT", direction="up")
+    store.set_meta(RESUME_META_KEY, ["C", "B"])
+    assert prioritize(["A", "B", "C", "HOT"], store, 3.0) == ["HOT", "C", "B", "A"]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cycle_budget_sizes_batches_to_the_deadline():
+    clock = FakeClock()
+    budget = CycleBudget(60, reserve_sec=10, clock=clock)
+    assert budget.size(100) == PROBE_BATCH  # noch keine Messung → Probe
+    clock.now += 5.0
+    budget.record(PROBE_BATCH, 5.0)        # 0,5 s pro Ticker, 45 s übrig
+    assert budget.size(100) == 90
+    clock.now = 49.0
+    assert budget.size(100) == 2
+    clock.now = 50.0
+    assert budget.size(100) == 0
+
+
+def test_cycle_budget_first_batch_uses_previous_cost():
+    clock = FakeClock()
+    budget = CycleBudget(20, clock=clock)
+    budget.seed(1.0)
+    assert budget.size(100) == 20
+    budget.seed("broken")
+    assert budget.per_ticker == 1.0
+    assert CycleBudget(None).size(500) == 500
+
+
+class FakeMarket:
+    """Open 100 for every ticker; tickers starting with "UP" are at +5 %."""
+
+    def get_open_and_last_many(self, tickers):
+        return {tk.upper(): (100.0, 105.0 if tk.startswith("UP") else 100.5) for tk in tickers}
+
+
+def test_budgeted_cycle_decides_digest_once(tmp_path, monkeypatch):
+    from src.app import core, dispatch
+
+    sent = []
+    monkeypatch.setattr(core, "get_market_data", lambda: FakeMarket())
+    monkeypatch.setattr(dispatch, "notify_ntfy", lambda server, topic, title, *a, **kw: sent.append(title))
+    # 4 Batches à 5 Ticker, 2 Alerts pro Batch: erst in Summe (8) über der Digest-Schwelle von 5
+    tickers = [f"{'UP' if i % 5 < 2 else 'FLAT'}{i}" for i in range(20)]
+    results = core.run_once(
+        tickers, 3.0, "https://ntfy.invalid", "topic", tmp_path / "state.json",
+        {"tz": "UTC"}, {"enabled": True, "bypass_market_hours": True}, {"enabled": False},
+        ntfy_cfg={"digest_threshold": 5, "burst": 100}, cycle_cfg={"budget_sec": 60, "batch_size": 5},
+    )
+    assert len(results) == 20
+    assert sent == ["Stock Alerts: 8 Ticker"]
+
+
+def test_budgeted_followups_share_the_cycle_digest(tmp_path, monkeypatch):
+    from src.app import core, dispatch
+    from src.app.dispatch import Alert
+
+    sent = []
+    monkeypatch.setattr(core, "get_market_data", lambda: FakeMarket())
+    monkeypatch.setattr(core, "get_company_meta_many", lambda tickers: {})
+    monkeypatch.setattr(core, "_news_followup", lambda ev, cfg, deadline, log, items=None: Alert(
+        ev.ticker, f"News: {ev.ticker}", "…", summary=f"📰 {ev.ticker}", deadline=deadline))
+    monkeypatch.setattr(dispatch, "notify_ntfy", lambda server, topic, title, message, **kw: sent.append((title, message[:2])))
+    tickers = [f"{'UP' if i % 5 < 2 else 'FLAT'}{i}" for i in range(20)]
+    core.run_once(
+        tickers, 3.0, "https://ntfy.invalid", "topic", tmp_path / "state.json",
+        {"tz": "UTC"}, {"enabled": True, "bypass_market_hours": True},
+        {"enabled": True, "followup": {"enabled": True, "deadline_sec": 0.0}},
+        ntfy_cfg={"digest_threshold": 5, "burst": 100}, cycle_cfg={"budget_sec": 60, "batch_size": 5},
+    )
+    # Kurs-Alerts und News je als ein Digest, in dieser Reihenfolge (News-Deadline gilt nur fürs Abrufen)
+    assert sent == [("Stock Alerts: 8 Ticker", "📈 "), ("Stock Alerts: 8 Ticker", "📰 ")]
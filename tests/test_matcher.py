@@ -0,0 +1,43 @@
+from src.app.matcher import STRONG, WEAK, KeywordMatcher
+from src.app.news import route_items
+
+COMPANIES = {
+    "O": ("Realty Income", ["Realty Income", "Realty", "Income", "O"]),
+    "GE": ("General Electric", ["General Electric", "General", "Electric", "GE"]),
+    "DBK.DE": ("Deutsche Bank", ["Deutsche Bank", "Deutsche", "Bank", "DBK", "DBK.DE"]),
+    "DTE.DE": ("Deutsche Telekom", ["Deutsche Telekom", "Deutsche", "Telekom", "DTE", "DTE.DE"]),
+    "META": ("Meta Platforms", ["Meta Platforms", "Meta", "Platforms", "META"]),
+}
+
+
+def test_short_symbols_do_not_match_inside_words():
+    m = KeywordMatcher(COMPANIES)
+    for title in ("Oil prices go up", "o-ring maker beats", "O'Reilly raises guidance",
+                  "Gears and generators: George says get going", "ge-hypte Aktie", "Orders surge"):
+        assert m.match(title) == {}, title
+    assert m.match("O and GE lead the Dow") == {"O": STRONG, "GE": STRONG}
+    assert m.match("Why o and ge lag") == {}
+
+
+def test_multi_token_names_match_across_punctuation():
+    m = KeywordMatcher(COMPANIES)
+    for title in ("Deutsche-Telekom-Aktie steigt", "Deutsche Telekom's outlook", "DEUTSCHE TELEKOM: Zahlen",
+                  "Kursziel für DTE.DE angehoben", "Deutsche Telekom legt zu"):
+        assert m.match(title).get("DTE.DE") == STRONG, title
+    assert m.assign("Deutsche Post und Telekommunikation") == []  # nur "Deutsche", kein "Telekom"-Token
+    assert m.match("Realty-Income-Aktie: Dividende") == {"O": STRONG}
+
+
+def test_weak_only_hit_does_not_route():
+    m = KeywordMatcher(COMPANIES)
+    assert m.match("Deutsche Börse hebt Prognose") == {"DBK.DE": WEAK, "DTE.DE": WEAK}
+    assert m.assign("Deutsche Börse hebt Prognose") == []
+    assert m.assign("Deutsche Telekom vor Deutsche Bank") == ["DBK.DE", "DTE.DE"]
+    assert m.assign("Deutsche Telekom: Bank-Partnerschaft") == ["DTE.DE"]
+    assert m.assign("META jumps on AI spending") == ["META"]  # Symbol gleich Namenswort bleibt STRONG
+
+    items = [{"title": "Deutsche Börse hebt Prognose"}, {"title": "Telekom-Tarife steigen"},
+             {"title": "Deutsche Telekom erhöht Dividende"}]
+    out = route_items(items, COMPANIES)
+    assert out["DTE.DE"] == items[2:]
+    assert out["DBK.DE"] == []
@@ -0,0 +1,73 @@
+import itertools
+import json
+
+import pytest
+
+from src.app import state
+from src.app.shard import ShardStateStore, shard_of, shard_path
+
+TICKERS = [f"T{i:03d}" for i in range(40)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing saved_at per commit (no ties on a coarse system clock)."""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(state.time, "time", lambda: float(next(ticks)))
+
+
+def write_segment(path, saved_at, tickers):
+    path.write_text(json.dumps({"version": state.STATE_VERSION, "tickers": tickers, "meta": {},
+                                "saved_at": saved_at}), encoding="utf-8")
+
+
+def test_newer_segment_wins(tmp_path):
+    base = tmp_path / "alert_state.json"
+    write_segment(shard_path(base, (0, 2)), 200.0, {"AAPL": {"direction": "none"}})
+    write_segment(shard_path(base, (1, 2)), 100.0, {"AAPL": {"direction": "up"}, "SAP.DE": {"direction": "down"}})
+    store = ShardStateStore(base, (0, 2))
+    assert store.direction("AAPL") == "none"
+    assert store.direction("SAP.DE") == "down"
+
+    write_segment(shard_path(base, (1, 2)), 300.0, {"AAPL": {"direction": "up"}})
+    store.reload()
+    assert store.direction("AAPL") == "up"
+
+
+def test_resharding_4_to_3_keeps_every_direction(tmp_path, clock):
+    base = tmp_path / "alert_state.json"
+    expected = {tk: ("up", "down", "none")[i % 3] for i, tk in enumerate(TICKERS)}
+    for i in range(4):
+        store = ShardStateStore(base, (i, 4))
+        for tk in TICKERS:
+            if shard_of(tk, 4) == i:
+                store.set(tk, direction=expected[tk])
+        store.commit()
+
+    # Neue Aufteilung: jeder Shard sieht alle Richtungen, ändert einen eigenen Ticker und schreibt
+    changed = {}
+    for i in range(3):
+        store = ShardStateStore(base, (i, 3))
+        assert store.directions() == {**expected, **changed}
+        tk = next(tk for tk in TICKERS if shard_of(tk, 3) == i and expected[tk] != "none")
+        changed[tk] = "none"
+        store.set(tk, direction="none")
+        assert store.commit()
+
+    # Die neuen Segmente sind jünger als die alten 4er-Segmente → die Änderungen gewinnen
+    for i in range(3):
+        assert ShardStateStore(base, (i, 3)).directions() == {**expected, **changed}
+
+
+def test_missing_or_corrupt_segment_is_skipped(tmp_path):
+    base = tmp_path / "alert_state.json"
+    write_segment(shard_path(base, (0, 3)), 100.0, {"AAPL": {"direction": "up"}})
+    shard_path(base, (1, 3)).write_text('{"version": 2, "tickers": {"SAP', encoding="utf-8")
+    # Segment 2 fehlt ganz (Shard noch nie gelaufen)
+    store = ShardStateStore(base, (shard_of("SAP.DE", 3), 3))
+    assert store.directions() == {"AAPL": "up"}
+
+    # Der betroffene Shard schreibt sein Segment danach wieder sauber
+    store.set("SAP.DE", direction="down")
+    assert store.commit()
+    assert ShardStateStore(base, (2, 3)).directions() == {"AAPL": "up", "SAP.DE": "down"}
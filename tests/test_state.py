@@ -0,0 +1,57 @@
+import json
+
+from src.app.state import STATE_VERSION, StateStore, load_state, save_state
+
+
+def test_legacy_file_is_migrated_to_v2(tmp_path):
+    path = tmp_path / "alert_state.json"
+    path.write_text(json.dumps({"AAPL": "up", "SAP.DE": "none"}), encoding="utf-8")
+
+    store = StateStore(path)
+    assert store.direction("AAPL") == "up"
+    assert store.get("SAP.DE") == {"direction": "none"}
+    assert store.meta == {}
+    assert load_state(path) == {"AAPL": "up", "SAP.DE": "none"}
+
+    # Erstes Schreiben hebt die Datei auf v2, die alten Richtungen bleiben erhalten
+    store.set("AAPL", last_pct=4.2)
+    assert store.commit()
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    assert raw["version"] == STATE_VERSION
+    assert raw["tickers"] == {"AAPL": {"direction": "up", "last_pct": 4.2}, "SAP.DE": {"direction": "none"}}
+
+
+def test_commit_round_trip(tmp_path):
+    path = tmp_path / "alert_state.json"
+    store = StateStore(path)
+    assert not store.commit()  # nichts geändert → nichts geschrieben
+    assert not path.exists()
+
+    store.set("AAPL", direction="down", last_price=231.5, last_alert_ts=1.0)
+    store.set_meta("resume", ["MSFT", "O"])
+    assert store.commit()
+    assert not store.dirty
+    assert not store.commit()
+
+    again = StateStore(path)
+    assert again.get("AAPL") == {"direction": "down", "last_price": 231.5, "last_alert_ts": 1.0}
+    assert again.meta == {"resume": ["MSFT", "O"]}
+
+    # Shim: Richtung ändern, Zusatzfelder bleiben
+    save_state(path, {"AAPL": "none"})
+    assert StateStore(path).get("AAPL") == {"direction": "none", "last_price": 231.5, "last_alert_ts": 1.0}
+
+
+def test_corrupted_file_falls_back_to_empty_state(tmp_path):
+    path = tmp_path / "alert_state.json"
+    for broken in ('{"version": 2, "tickers": {"AAPL": "u', "[1, 2, 3]", ""):
+        path.write_text(broken, encoding="utf-8")
+        store = StateStore(path)
+        assert store.directions() == {}
+        assert store.meta == {}
+        assert store.direction("AAPL") == "none"
+
+    # Danach wieder normal beschreibbar
+    store.set("AAPL", direction="up")
+    assert store.commit()
+    assert StateStore(path).direction("AAPL") == "up"
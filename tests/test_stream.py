@@ -0,0 +1,138 @@
+import datetime as dt
+from typing import Dict, List, Tuple
+
+import pytest
+
+from src.app import stream
+from src.app.stream import StreamMonitor
+
+
+class FakeDispatcher:
+    """Collects alerts instead of posting them to ntfy."""
+
+    def __init__(self) -> None:
+        self.alerts: List = []
+
+    def submit(self, alert) -> None:
+        self.alerts.append(alert)
+
+    send = submit
+
+    def flush(self) -> None:
+        pass
+
+
+class FakeMarket:
+    """Quote source with settable (open, last) per symbol; records the requested tickers."""
+
+    def __init__(self) -> None:
+        self.quotes: Dict[str, Tuple[float, float]] = {}
+        self.calls: List[List[str]] = []
+
+    def get_open_and_last_many(self, tickers):
+        self.calls.append(list(tickers))
+        return {tk.upper(): self.quotes[tk.upper()] for tk in tickers if tk.upper() in self.quotes}
+
+
+class Clock:
+    """Trading day and set of tickers with an open venue, as seen by the monitor."""
+
+    def __init__(self, day: str, open_tickers) -> None:
+        self.now = dt.datetime.fromisoformat(f"{day}T10:00:00+00:00")
+        self.open = set(open_tickers)
+
+    def next_day(self, hour: int = 0) -> None:
+        self.now = (self.now + dt.timedelta(days=1)).replace(hour=hour)
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    market, clock = FakeMarket(), Clock("2026-03-02", [])
+    monkeypatch.setattr(stream, "_CLOCK_CHECK_SEC", 0.0)
+    monkeypatch.setattr(stream, "get_market_data", lambda: market)
+    monkeypatch.setattr(stream, "now_tz", lambda tz: clock.now)
+    monkeypatch.setattr(stream, "active_tickers", lambda tickers, cfg: [tk for tk in tickers if tk in clock.open])
+    m = StreamMonitor(
+        {"tickers": ["AAPL", "SAP.DE"], "threshold_pct": 3.0, "state_file": tmp_path / "state.json",
+         "market_hours_cfg": {"tz": "UTC"}, "news_cfg": {"enabled": False}, "max_workers": 1},
+        dispatcher=FakeDispatcher(),
+    )
+    m.market, m.clock = market, clock
+    m._day = clock.now.strftime("%Y-%m-%d")
+    yield m
+    m._pool.shutdown(wait=True)
+
+
+def settle(m: StreamMonitor) -> None:
+    """Wait until the (single) alert worker has finished everything queued."""
+    m._pool.submit(lambda: None).result()
+
+
+def test_day_change_while_closed_drops_stale_open(monitor):
+    monitor.clock.open = {"AAPL"}
+    monitor.market.quotes["AAPL"] = (100.0, 100.5)
+    monitor.backfill()
+    monitor.on_tick("AAPL", 101.0)
+    assert monitor.opens["AAPL"] == 100.0
+
+    # Mitternacht: Börse zu, Back-fill kehrt früh zurück – das alte Open darf trotzdem nicht bleiben
+    monitor.clock.open = set()
+    monitor.clock.next_day(hour=0)
+    monitor.on_tick("AAPL", 101.0)
+    assert "AAPL" not in monitor.opens
+
+    # Wiedereröffnung: +0,9 % gegenüber dem neuen Open, kein Alert gegen gestern (+11 %)
+    monitor.clock.open = {"AAPL"}
+    monitor.clock.now = monitor.clock.now.replace(hour=15)
+    monitor.market.quotes["AAPL"] = (110.0, 110.0)
+    monitor.on_tick("AAPL", 111.0)
+    settle(monitor)
+    monitor.on_tick("AAPL", 111.0)
+    settle(monitor)
+    assert monitor.opens["AAPL"] == 110.0
+    assert monitor.dispatcher.alerts == []
+
+
+def test_day_change_forgets_alert_direction(monitor):
+    monitor.store.set("AAPL", direction="up")
+    monitor.clock.next_day(hour=0)
+    monitor.on_tick("AAPL", 101.0)
+    assert monitor.store.direction("AAPL") == "none"
+
+
+def test_unknown_open_uses_streamer_open(monitor):
+    monitor.clock.open = monitor._open = {"AAPL"}  # Börse schon offen, kein Eröffnungs-Back-fill
+    monitor.on_tick("AAPL", 104.0, open_price=100.0)
+    settle(monitor)
+    assert monitor.opens["AAPL"] == 100.0
+    assert [a.ticker for a in monitor.dispatcher.alerts] == ["AAPL"]
+    assert monitor.market.calls == []
+
+
+def test_unknown_open_is_backfilled_on_demand(monitor):
+    monitor.clock.open = monitor._open = {"AAPL"}  # Börse schon offen, kein Eröffnungs-Back-fill
+    monitor.market.quotes["AAPL"] = (100.0, 104.0)
+    monitor.on_tick("AAPL", 104.0)
+    settle(monitor)
+    assert monitor.market.calls == [["AAPL"]]
+    assert monitor.opens["AAPL"] == 100.0
+    assert [a.ticker for a in monitor.dispatcher.alerts] == ["AAPL"]
+
+
+def test_venue_opening_mid_run_refreshes_opens(monitor):
+    monitor.clock.open = {"AAPL"}
+    monitor.market.quotes.update({"AAPL": (100.0, 100.2), "SAP.DE": (60.0, 60.3)})
+    monitor.backfill()
+    assert monitor.market.calls == [["AAPL"]]
+    monitor.opens["SAP.DE"] = 50.0  # veraltet (frühere Sitzung)
+
+    monitor.on_tick("SAP.DE", 60.3)
+    assert "SAP.DE" not in monitor._open
+
+    # Session von SAP.DE beginnt im laufenden Betrieb
+    monitor.clock.open = {"AAPL", "SAP.DE"}
+    monitor.on_tick("SAP.DE", 60.3)
+    settle(monitor)
+    assert monitor.market.calls[-1] == ["SAP.DE"]
+    assert monitor.opens["SAP.DE"] == 60.0
+    assert monitor.dispatcher.alerts == []